@@ -0,0 +1,58 @@
+"""Add composite indexes for keyset pagination of orders and journal entries
+
+Revision ID: 003_add_pagination_indexes
+Revises: 002_add_is_superuser
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003_add_pagination_indexes"
+down_revision: Union[str, None] = "002_add_is_superuser"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_journal_table() -> bool:
+    # journal_entries is created by init_db() (metadata.create_all), not by 001.
+    # Tables created that way already have the indexes, hence if_not_exists.
+    return sa.inspect(op.get_bind()).has_table("journal_entries")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_orders_portfolio_created",
+        "orders",
+        ["portfolio_id", "created_at", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_orders_portfolio_status_created",
+        "orders",
+        ["portfolio_id", "status", "created_at", "id"],
+        if_not_exists=True,
+    )
+    if _has_journal_table():
+        op.create_index(
+            "ix_journal_entries_portfolio_exit_time",
+            "journal_entries",
+            ["portfolio_id", "exit_time", "id"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if _has_journal_table():
+        op.drop_index(
+            "ix_journal_entries_portfolio_exit_time",
+            table_name="journal_entries",
+            if_exists=True,
+        )
+    op.drop_index("ix_orders_portfolio_status_created", table_name="orders")
+    op.drop_index("ix_orders_portfolio_created", table_name="orders")
@@ -0,0 +1,30 @@
+"""Add leverage to orders
+
+Revision ID: 004_add_order_leverage
+Revises: 003_add_pagination_indexes
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004_add_order_leverage"
+down_revision: Union[str, None] = "003_add_pagination_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "orders",
+        sa.Column("leverage", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("orders", "leverage")
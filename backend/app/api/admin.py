@@ -11,7 +11,14 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import require_auth, TokenData
+from app.core.security import (
+    TokenData,
+    UserAccess,
+    get_user_access,
+    invalidate_user_access,
+    require_auth,
+    revoke_user_tokens,
+)
 from app.models.user import User, UserTier
 from app.models.payment import Payment
 from app.models.order import Order
@@ -27,11 +34,9 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 async def get_current_admin(
     token_data: TokenData = Depends(require_auth),
     db: AsyncSession = Depends(get_db)
-) -> User:
-    """Dependency to get current admin user"""
-    stmt = select(User).where(User.id == uuid.UUID(token_data.user_id))
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+) -> UserAccess:
+    """Dependency to get current admin user (cached, see get_user_access())"""
+    user = await get_user_access(token_data.user_id, db)
     
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
@@ -76,7 +81,7 @@ async def list_users(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
-    admin: User = Depends(get_current_admin),
+    admin: UserAccess = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """List all users with pagination and search"""
@@ -104,7 +109,7 @@ async def list_users(
 @router.post("/users/{user_id}/ban")
 async def ban_user(
     user_id: uuid.UUID,
-    admin: User = Depends(get_current_admin),
+    admin: UserAccess = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Ban a user"""
@@ -121,6 +126,7 @@ async def ban_user(
     user.is_active = False
     db.add(user)
     await db.commit()
+    revoke_user_tokens(str(user.id))
     
     return {"status": "success", "message": f"User {user.email} banned"}
 
@@ -128,7 +134,7 @@ async def ban_user(
 @router.post("/users/{user_id}/unban")
 async def unban_user(
     user_id: uuid.UUID,
-    admin: User = Depends(get_current_admin),
+    admin: UserAccess = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Unban a user"""
@@ -142,13 +148,14 @@ async def unban_user(
     user.is_active = True
     db.add(user)
     await db.commit()
+    invalidate_user_access(str(user.id))
     
     return {"status": "success", "message": f"User {user.email} unbanned"}
 
 
 @router.get("/system/status", response_model=SystemStatus)
 async def get_system_status(
-    admin: User = Depends(get_current_admin),
+    admin: UserAccess = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Get system health status"""
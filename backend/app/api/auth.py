@@ -4,7 +4,7 @@ Authentication API routes for Terminal Zero
 Endpoints:
 - POST /api/auth/register - Create new user account
 - POST /api/auth/login - Login and get JWT token
-- POST /api/auth/logout - Logout (client-side token disposal)
+- POST /api/auth/logout - Logout (revokes the token)
 - GET /api/auth/me - Get current user profile
 - POST /api/auth/demo - Get demo account token
 """
@@ -14,6 +14,7 @@ import os
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,10 +28,12 @@ from app.core.security import (
     create_password_reset_token,
     create_access_token,
     decode_password_reset_token,
-    hash_password,
+    hash_password_async,
     require_auth,
+    revoke_user_tokens,
     sha256_hex,
-    verify_password,
+    token_cache,
+    verify_password_async,
 )
 from app.models.user import User, UserTier
 
@@ -120,7 +123,7 @@ async def register(
     user = User(
         id=uuid.uuid4(),
         email=request.email,
-        hashed_password=hash_password(request.password),
+        hashed_password=await hash_password_async(request.password),
         tier=UserTier.FREE,
         is_active=True,
     )
@@ -164,7 +167,9 @@ async def login(
     )
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(request.password, user.hashed_password):
+    if not user or not await verify_password_async(
+        request.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -197,15 +202,17 @@ async def login(
 
 
 @router.post("/logout")
-async def logout(token_data: TokenData = Depends(require_auth)):
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+    token_data: TokenData = Depends(require_auth),
+):
     """
     Logout endpoint.
     
-    Note: JWT tokens are stateless - actual logout happens client-side
-    by discarding the token. This endpoint exists for API consistency.
-    
-    Future: Could implement token blacklisting in Redis.
+    The token is revoked in this process until it expires; clients should
+    still discard it.
     """
+    token_cache.revoke(credentials.credentials, token_data)
     return {"message": "Successfully logged out"}
 
 
@@ -260,7 +267,7 @@ async def get_demo_token(
         user = User(
             id=demo_user_id,
             email=demo_email,
-            hashed_password=hash_password("demo-password-not-for-login"),
+            hashed_password=await hash_password_async("demo-password-not-for-login"),
             tier=UserTier.FREE,
             is_active=True,
         )
@@ -359,8 +366,9 @@ async def reset_password(
             detail="Reset token is no longer valid",
         )
 
-    user.hashed_password = hash_password(request.new_password)
+    user.hashed_password = await hash_password_async(request.new_password)
     session.add(user)
     await session.commit()
+    revoke_user_tokens(str(user.id))
 
     return ResetPasswordResponse(message="Password updated successfully")
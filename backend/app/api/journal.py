@@ -5,14 +5,15 @@ Journal API Routes
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.trading import portfolio_id_of
 from app.core.database import get_session
+from app.core.pagination import before_cursor, set_next_cursor
 from app.models.journal import JournalEntry
-from app.models.portfolio import Portfolio
 
 router = APIRouter(prefix="/api/journal", tags=["journal"])
 
@@ -33,36 +34,67 @@ class JournalEntryResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Only the columns of JournalEntryResponse (not the screenshot/psychology fields)
+JOURNAL_ENTRY_COLUMNS = (
+    JournalEntry.id,
+    JournalEntry.symbol,
+    JournalEntry.side,
+    JournalEntry.entry_price,
+    JournalEntry.exit_price,
+    JournalEntry.qty,
+    JournalEntry.pnl,
+    JournalEntry.pnl_percent,
+    JournalEntry.entry_time,
+    JournalEntry.exit_time,
+    JournalEntry.notes,
+    JournalEntry.tags,
+)
+
 # Temporary user_id helper
 def get_demo_user_id() -> uuid.UUID:
     return uuid.UUID("00000000-0000-0000-0000-000000000001")
 
 @router.get("/entries", response_model=List[JournalEntryResponse])
 async def get_journal_entries(
+    response: Response,
     user_id: Optional[str] = Query(None),
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the last page"),
     db: AsyncSession = Depends(get_session)
 ):
-    """Get journal entries for a user"""
+    """Get journal entries for a user, newest first"""
     try:
         uid = uuid.UUID(user_id) if user_id else get_demo_user_id()
     except ValueError as err:
         raise HTTPException(status_code=400, detail="Invalid user_id") from err
 
-    # Get portfolio
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == uid))
-    portfolio = result.scalars().first()
-    
-    if not portfolio:
-        return []
-        
-    query = select(JournalEntry).where(
-        JournalEntry.portfolio_id == portfolio.id
-    ).order_by(desc(JournalEntry.exit_time)).limit(limit)
-    
-    result = await db.execute(query)
-    entries = result.scalars().all()
-    
-    # Convert decimals to floats for Pydantic
-    # (Pydantic v2 handles Decimal to float, but explicit conversion is safe)
-    return entries
+    query = select(*JOURNAL_ENTRY_COLUMNS).where(
+        JournalEntry.portfolio_id == portfolio_id_of(uid)
+    )
+    after = before_cursor(JournalEntry.exit_time, JournalEntry.id, cursor)
+    if after is not None:
+        query = query.where(after)
+    query = query.order_by(
+        desc(JournalEntry.exit_time), desc(JournalEntry.id)
+    ).limit(limit)
+
+    rows = (await db.execute(query)).all()
+    set_next_cursor(response, rows, limit, lambda row: row.exit_time)
+
+    return [
+        JournalEntryResponse(
+            id=row.id,
+            symbol=row.symbol,
+            side=row.side,
+            entry_price=row.entry_price,
+            exit_price=row.exit_price,
+            qty=row.qty,
+            pnl=row.pnl,
+            pnl_percent=row.pnl_percent,
+            entry_time=row.entry_time.isoformat(),
+            exit_time=row.exit_time.isoformat(),
+            notes=row.notes,
+            tags=row.tags,
+        )
+        for row in rows
+    ]
@@ -17,7 +17,7 @@ from sqlalchemy import select
 from pydantic import BaseModel
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, invalidate_user_access
 from app.core.config import TIER_PRICES, UserTier
 from app.models.user import User
 from app.models.payment import Payment, PaymentStatus
@@ -214,6 +214,7 @@ async def paystack_webhook(
         
         db.add(payment)
         await db.commit()
+        invalidate_user_access(str(payment.user_id))
         
         return {"status": "success"}
         
@@ -9,10 +9,11 @@ REST endpoints for trading operations:
 """
 
 import uuid
+from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -26,6 +27,7 @@ from app.core.config import (
     OrderType,
 )
 from app.core.database import get_session
+from app.core.pagination import before_cursor, set_next_cursor
 from app.models.order import Order, OrderStatus
 from app.models.portfolio import Portfolio
 from jesse_custom.engine import get_portfolio_manager
@@ -66,6 +68,73 @@ class UpdateLeverageRequest(BaseModel):
     leverage: int = Field(..., ge=1, le=100)
 
 
+class OrderSummaryResponse(BaseModel):
+    """Order fields shown in the order lists"""
+    id: uuid.UUID
+    symbol: str
+    side: OrderSide
+    order_type: OrderType
+    status: OrderStatus
+    qty: float
+    price: Optional[float]
+    filled_qty: float
+    avg_fill_price: Optional[float]
+    reduce_only: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+ORDER_SUMMARY_COLUMNS = (
+    Order.id,
+    Order.symbol,
+    Order.side,
+    Order.order_type,
+    Order.status,
+    Order.qty,
+    Order.price,
+    Order.filled_qty,
+    Order.avg_fill_price,
+    Order.reduce_only,
+    Order.created_at,
+)
+
+
+def portfolio_id_of(uid: uuid.UUID):
+    """The user's portfolio id as a subquery, to look it up in the same query"""
+    return (
+        select(Portfolio.id)
+        .where(Portfolio.user_id == uid)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+async def _list_orders(
+    db: AsyncSession,
+    response: Response,
+    uid: uuid.UUID,
+    limit: int,
+    cursor: Optional[str],
+    status: Optional[OrderStatus] = None,
+) -> list:
+    """A page of the user's orders, newest first (keyset-paginated)"""
+    query = select(*ORDER_SUMMARY_COLUMNS).where(
+        Order.portfolio_id == portfolio_id_of(uid)
+    )
+    if status is not None:
+        query = query.where(Order.status == status)
+    after = before_cursor(Order.created_at, Order.id, cursor)
+    if after is not None:
+        query = query.where(after)
+    query = query.order_by(desc(Order.created_at), desc(Order.id)).limit(limit)
+
+    rows = (await db.execute(query)).all()
+    set_next_cursor(response, rows, limit, lambda row: row.created_at)
+    return rows
+
+
 class PortfolioResponse(BaseModel):
     """Portfolio state response"""
     class Config:
@@ -182,7 +251,7 @@ async def get_portfolio(user_id: Optional[str] = Query(None)):
     manager = get_portfolio_manager()
     portfolio = await manager.get_or_create_portfolio(uid)
     
-    return portfolio.to_dict()
+    return portfolio.snapshot()
 
 
 @router.get("/position/{symbol}")
@@ -288,64 +357,35 @@ async def reset_portfolio(user_id: Optional[str] = Query(None)):
     }
 
 
-@router.get("/orders/history")
+@router.get("/orders/history", response_model=List[OrderSummaryResponse])
 async def get_order_history(
+    response: Response,
     user_id: Optional[str] = Query(None),
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the last page"),
     db: AsyncSession = Depends(get_session)
 ):
-    """Get order history"""
+    """Get order history, newest first"""
     try:
         uid = uuid.UUID(user_id) if user_id else get_demo_user_id()
     except ValueError as err:
         raise HTTPException(status_code=400, detail="Invalid user_id") from err
 
-    # Get portfolio from DB
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == uid))
-    db_portfolio = result.scalars().first()
-    
-    if not db_portfolio:
-        return []
-        
-    query = select(Order).where(
-        Order.portfolio_id == db_portfolio.id
-    ).order_by(desc(Order.created_at)).limit(limit)
-    
-    result = await db.execute(query)
-    orders = result.scalars().all()
-    return orders
+    return await _list_orders(db, response, uid, limit, cursor)
 
 
-@router.get("/orders/open")
+@router.get("/orders/open", response_model=List[OrderSummaryResponse])
 async def get_open_orders(
+    response: Response,
     user_id: Optional[str] = Query(None),
+    limit: int = Query(200, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the last page"),
     db: AsyncSession = Depends(get_session)
 ):
-    """Get open orders"""
+    """Get open orders, newest first"""
     try:
         uid = uuid.UUID(user_id) if user_id else get_demo_user_id()
     except ValueError as err:
         raise HTTPException(status_code=400, detail="Invalid user_id") from err
 
-    # Get portfolio from DB
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == uid))
-    db_portfolio = result.scalars().first()
-    
-    if not db_portfolio:
-        return []
-        
-    query = select(Order).where(
-        Order.portfolio_id == db_portfolio.id,
-        # Assuming OrderStatus enum is available and matches DB
-        # If OrderStatus is not imported or different, this might fail.
-        # I imported OrderStatus earlier.
-    ).order_by(desc(Order.created_at))
-    
-    # Filter for OPEN status in python if needed, or use where clause if enum works
-    # Let's use the where clause but be careful about the enum
-    from app.core.config import OrderStatus
-    query = query.where(Order.status == OrderStatus.OPEN)
-    
-    result = await db.execute(query)
-    orders = result.scalars().all()
-    return orders
+    return await _list_orders(db, response, uid, limit, cursor, OrderStatus.OPEN)
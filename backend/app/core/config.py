@@ -16,6 +16,12 @@ FEE_RATE = Decimal("0.0006")  # 0.06% like Bybit
 # Supported trading pairs
 SUPPORTED_SYMBOLS = ["BTC-USDT", "ETH-USDT"]
 
+# Exchange metadata (Bybit linear perpetuals): price tick and quantity lot sizes
+SYMBOL_SPECS = {
+    "BTC-USDT": {"tick_size": Decimal("0.10"), "lot_size": Decimal("0.001")},
+    "ETH-USDT": {"tick_size": Decimal("0.01"), "lot_size": Decimal("0.01")},
+}
+
 # Payment Configuration (NGN)
 TIER_PRICES = {
     "PRO": Decimal("5000.00"),
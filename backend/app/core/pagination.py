@@ -0,0 +1,55 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is the sort key of the last row of a page: its timestamp plus its id
+to break ties. The next page is everything strictly before it, which the
+composite (portfolio_id, ..., timestamp, id) indexes serve with an index range
+scan no matter how deep the page is, unlike OFFSET.
+"""
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, uuid.UUID]]:
+    """Parse a cursor from a query parameter; 400 if it's malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        timestamp, row_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from err
+
+
+def before_cursor(timestamp_column, id_column, cursor: Optional[str]):
+    """WHERE clause for the rows after the cursor in (timestamp, id) DESC order"""
+    position = decode_cursor(cursor)
+    if position is None:
+        return None
+    return tuple_(timestamp_column, id_column) < tuple_(*position)
+
+
+def set_next_cursor(response: Response, rows: list, limit: int, timestamp_of) -> None:
+    """Expose the cursor of the next page in a header, if there may be one.
+
+    The body stays a plain list so existing clients keep working.
+    """
+    if len(rows) == limit and rows:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            timestamp_of(last), last.id
+        )
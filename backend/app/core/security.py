@@ -2,16 +2,22 @@
 Security module for Terminal Zero
 
 Handles:
-- Password hashing with bcrypt
+- Password hashing with bcrypt (off the event loop)
 - JWT token generation and validation
+- Verified-token and user-access caches (with revocation)
 - User authentication dependencies
 """
 
+import asyncio
 import os
+import threading
+import time
 import uuid
 import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple, TypeVar
 
 import bcrypt
 from fastapi import Depends, HTTPException, status
@@ -24,6 +30,15 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secret-key-change-in-production
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
+# Password hashing pool: bcrypt takes ~100-300 ms of CPU per call
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# Verified-token cache: skips re-verifying the signature of recently seen tokens
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+USER_ACCESS_CACHE_TTL_SECONDS = int(os.getenv("USER_ACCESS_CACHE_TTL_SECONDS", "60"))
+
 # Bearer token security
 security = HTTPBearer(auto_error=False)
 
@@ -33,6 +48,7 @@ class TokenData(BaseModel):
     user_id: str
     email: Optional[str] = None
     exp: Optional[datetime] = None
+    iat: Optional[datetime] = None
 
 
 class Token(BaseModel):
@@ -61,6 +77,97 @@ def hash_password(password: str) -> str:
     return hashed.decode("utf-8")
 
 
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so the market stream, WebSocket pushes
+    and order placement keep running during a login burst. The number of queued
+    and running calls is capped; past the cap, callers get a 503 right away
+    instead of piling up behind each other.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+        submitted_at = time.perf_counter()
+
+        def timed():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    # released here rather than in the caller: a cancelled request
+                    # still occupies the pool until bcrypt returns
+                    self.pending -= 1
+                    self.total_wait_seconds += started_at - submitted_at
+                    self.total_run_seconds += finished_at - started_at
+                    self.completed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, timed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "peak_pending": self.peak_pending,
+                "completed": completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": (
+                    round(self.total_wait_seconds / completed * 1000, 2)
+                    if completed else 0.0
+                ),
+                "avg_run_ms": (
+                    round(self.total_run_seconds / completed * 1000, 2)
+                    if completed else 0.0
+                ),
+            }
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() on the password hashing pool"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the password hashing pool"""
+    return await password_hasher.run(hash_password, password)
+
+
 def _bcrypt_input(password: str) -> bytes:
     """Prepare password bytes for bcrypt.
 
@@ -167,15 +274,170 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         user_id: str = payload.get("sub")
         email: str = payload.get("email")
         exp: datetime = datetime.fromtimestamp(payload.get("exp"))
+        iat = payload.get("iat")
         
         if user_id is None:
             return None
         
-        return TokenData(user_id=user_id, email=email, exp=exp)
+        return TokenData(
+            user_id=user_id,
+            email=email,
+            exp=exp,
+            iat=datetime.fromtimestamp(iat) if iat is not None else None,
+        )
     except JWTError:
         return None
 
 
+class VerifiedTokenCache:
+    """Small LRU of verified access-token claims, keyed by the token's SHA-256.
+
+    Entries live for TOKEN_CACHE_TTL_SECONDS or until the token expires, whichever
+    comes first. Since JWTs are otherwise valid until they expire, the cache also
+    keeps what's needed to reject tokens early:
+
+    - revoked tokens (logout), by hash, until they would have expired anyway
+    - a per-user "not before" time (ban, password reset): tokens issued earlier
+      are rejected
+
+    State is per process, like the rest of the in-memory trading state.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[TokenData, float]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._not_before: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[TokenData]:
+        """Return the claims of a valid token, verifying it only on a cache miss"""
+        key = sha256_hex(token)
+        if key in self._revoked:
+            return None
+
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            del self._entries[key]
+
+        self.misses += 1
+        token_data = decode_access_token(token)
+        if token_data is None or not self._issued_after_not_before(token_data):
+            return None
+
+        expires_at = now + self.ttl_seconds
+        if token_data.exp is not None:
+            expires_at = min(expires_at, token_data.exp.timestamp())
+        self._entries[key] = (token_data, expires_at)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return token_data
+
+    def revoke(self, token: str, token_data: TokenData) -> None:
+        """Reject this token from now on (logout)"""
+        now = time.time()
+        key = sha256_hex(token)
+        self._entries.pop(key, None)
+        self._revoked = {k: exp for k, exp in self._revoked.items() if exp > now}
+        if token_data.exp is not None:
+            self._revoked[key] = token_data.exp.timestamp()
+        else:
+            self._revoked[key] = now + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    def revoke_user(self, user_id: str) -> None:
+        """Reject every token of a user issued until now (ban, password reset)"""
+        now = time.time()
+        # past a token lifetime, every token issued before the cutoff has expired
+        lifetime = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        self._not_before = {
+            u: t for u, t in self._not_before.items() if t + lifetime > now
+        }
+        # whole seconds, like the "iat" claim: a token issued right after still passes
+        self._not_before[user_id] = float(int(now))
+        stale = [k for k, (data, _) in self._entries.items() if data.user_id == user_id]
+        for key in stale:
+            del self._entries[key]
+
+    def _issued_after_not_before(self, token_data: TokenData) -> bool:
+        not_before = self._not_before.get(token_data.user_id)
+        if not_before is None:
+            return True
+        return token_data.iat is not None and token_data.iat.timestamp() >= not_before
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "revoked_tokens": len(self._revoked),
+            "revoked_users": len(self._not_before),
+        }
+
+
+token_cache = VerifiedTokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
+
+
+class UserAccess(BaseModel):
+    """The parts of a user row that authorization checks need"""
+    user_id: str
+    tier: str
+    is_active: bool
+    is_superuser: bool
+
+
+_user_access_cache: Dict[str, Tuple[UserAccess, float]] = {}
+
+
+async def get_user_access(user_id: str, session) -> Optional[UserAccess]:
+    """Tier and flags of a user, cached for USER_ACCESS_CACHE_TTL_SECONDS.
+
+    Call invalidate_user_access() after changing any of them.
+    """
+    entry = _user_access_cache.get(user_id)
+    if entry is not None and entry[1] > time.time():
+        return entry[0]
+
+    # imported here: the models import app.core
+    from sqlalchemy import select
+    from app.models.user import User
+
+    result = await session.execute(select(User).where(User.id == uuid.UUID(user_id)))
+    user = result.scalar_one_or_none()
+    if user is None:
+        _user_access_cache.pop(user_id, None)
+        return None
+
+    access = UserAccess(
+        user_id=user_id,
+        tier=user.tier.value,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser,
+    )
+    _user_access_cache[user_id] = (access, time.time() + USER_ACCESS_CACHE_TTL_SECONDS)
+    return access
+
+
+def invalidate_user_access(user_id: str) -> None:
+    _user_access_cache.pop(str(user_id), None)
+
+
+def revoke_user_tokens(user_id: str) -> None:
+    """Log a user out everywhere and drop their cached access (ban, password reset)"""
+    token_cache.revoke_user(str(user_id))
+    invalidate_user_access(user_id)
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Optional[TokenData]:
@@ -188,7 +450,7 @@ async def get_current_user(
     if credentials is None:
         return None
     
-    token_data = decode_access_token(credentials.credentials)
+    token_data = token_cache.get(credentials.credentials)
     
     if token_data is None:
         return None
@@ -210,7 +472,7 @@ async def require_auth(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token_data = decode_access_token(credentials.credentials)
+    token_data = token_cache.get(credentials.credentials)
     
     if token_data is None:
         raise credentials_exception
@@ -1,11 +1,22 @@
-import asyncio
+"""
+24h PnL leaderboard kept in Redis sorted sets
+
+Every realized PnL is added, when its journal entry is written, to the sorted set
+of the 5-minute bucket it falls in (member: user id, score: summed PnL). The
+rolling 24h board is the ZUNIONSTORE of the buckets in the window, so refreshing
+it costs O(buckets + members) in Redis and never scans the journal table.
+Buckets expire on their own once they leave the window.
+"""
+
 import json
+import time
+import uuid
 from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import List, Optional, Union
 
 from loguru import logger
 from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 import redis.asyncio as redis
 from app.core.config import REDIS_URL
@@ -14,45 +25,159 @@ from app.models.journal import JournalEntry
 from app.models.portfolio import Portfolio
 from app.models.user import User
 
-async def update_leaderboard():
-    """
-    Calculate 24h PnL for all users and update Redis leaderboard.
+BUCKET_SECONDS = 5 * 60
+WINDOW_SECONDS = 24 * 60 * 60
+LEADERBOARD_SIZE = 100
+# how often the scheduler rebuilds the board from the buckets
+REFRESH_SECONDS = 60
+
+BUCKET_KEY_PREFIX = "leaderboard:pnl:"
+SCORES_KEY = "leaderboard:24h:scores"
+NAMES_KEY = "leaderboard:names"
+SEEDED_KEY = "leaderboard:seeded"
+LEADERBOARD_KEY = "leaderboard:24h"
+
+_redis: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Shared client; its connection pool is reused across calls"""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(
+            REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
+
+
+def bucket_key(timestamp: float) -> str:
+    return f"{BUCKET_KEY_PREFIX}{int(timestamp // BUCKET_SECONDS) * BUCKET_SECONDS}"
+
+
+def window_bucket_keys(now: float) -> List[str]:
+    """Keys of the buckets overlapping the last 24h, oldest first"""
+    newest = int(now // BUCKET_SECONDS) * BUCKET_SECONDS
+    count = WINDOW_SECONDS // BUCKET_SECONDS
+    return [
+        f"{BUCKET_KEY_PREFIX}{newest - i * BUCKET_SECONDS}"
+        for i in range(count - 1, -1, -1)
+    ]
+
+
+async def record_realized_pnl(
+    user_id: Union[uuid.UUID, str],
+    pnl: Decimal,
+    timestamp: Optional[float] = None,
+) -> None:
+    """Add a realized PnL to its bucket. Never raises: the trade is already saved."""
+    if timestamp is None:
+        timestamp = time.time()
+    key = bucket_key(timestamp)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.zincrby(key, float(pnl), str(user_id))
+        pipe.expire(key, WINDOW_SECONDS + BUCKET_SECONDS)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record PnL on the leaderboard: {e}")
+
+
+async def _seed_buckets(r: redis.Redis) -> None:
+    """Fill the buckets from the journal once, e.g. after Redis lost its data.
+
+    The marker key goes away with the rest of the data, which triggers a new seed.
     """
-    logger.info("🏆 Updating leaderboard...")
-    
+    if not await r.set(SEEDED_KEY, "1", nx=True):
+        return
+
+    since = datetime.utcnow() - timedelta(seconds=WINDOW_SECONDS)
+    bucket = func.floor(
+        func.extract("epoch", JournalEntry.exit_time) / BUCKET_SECONDS
+    )
+    query = (
+        select(
+            Portfolio.user_id,
+            bucket.label("bucket"),
+            func.sum(JournalEntry.pnl).label("pnl"),
+        )
+        .join(Portfolio, Portfolio.id == JournalEntry.portfolio_id)
+        .where(JournalEntry.exit_time >= since)
+        .group_by(Portfolio.user_id, bucket)
+    )
     try:
         async with async_session_maker() as db:
-            # Calculate 24h PnL
-            last_24h = datetime.utcnow() - timedelta(hours=24)
-            
-            # Query: Sum PnL by User for entries in last 24h
-            query = (
-                select(
-                    User.email,
-                    func.sum(JournalEntry.pnl).label("total_pnl")
+            rows = (await db.execute(query)).all()
+    except Exception:
+        await r.delete(SEEDED_KEY)
+        raise
+
+    pipe = r.pipeline(transaction=False)
+    for user_id, bucket_index, pnl in rows:
+        key = bucket_key(int(bucket_index) * BUCKET_SECONDS)
+        # set rather than add: trades recorded since the data loss are in the sums
+        pipe.zadd(key, {str(user_id): float(pnl)})
+        pipe.expire(key, WINDOW_SECONDS + BUCKET_SECONDS)
+    await pipe.execute()
+    logger.info(f"🏆 Seeded leaderboard buckets from {len(rows)} journal aggregates")
+
+
+async def _display_names(r: redis.Redis, user_ids: List[str]) -> dict:
+    """Display names by user id, from a Redis hash filled from the DB on a miss"""
+    if not user_ids:
+        return {}
+    cached = await r.hmget(NAMES_KEY, user_ids)
+    names = {
+        user_id: name.decode() if isinstance(name, bytes) else name
+        for user_id, name in zip(user_ids, cached)
+        if name is not None
+    }
+
+    missing = [user_id for user_id in user_ids if user_id not in names]
+    if missing:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(User.id, User.email).where(
+                    User.id.in_([uuid.UUID(u) for u in missing])
                 )
-                .join(Portfolio, Portfolio.id == JournalEntry.portfolio_id)
-                .join(User, User.id == Portfolio.user_id)
-                .where(JournalEntry.exit_time >= last_24h)
-                .group_by(User.id)
-                .order_by(func.sum(JournalEntry.pnl).desc())
-                .limit(100)
             )
-            
-            result = await db.execute(query)
-            rows = result.all()
-            
-            leaderboard = [
-                {"user": email.split("@")[0], "pnl": float(total_pnl)}
-                for email, total_pnl in rows
-            ]
-            
-            # Save to Redis
-            r = redis.from_url(REDIS_URL)
-            await r.set("leaderboard:24h", json.dumps(leaderboard))
-            await r.close()
-            
-            logger.info(f"✅ Leaderboard updated with {len(leaderboard)} users")
-            
+            fetched = {str(user_id): email.split("@")[0] for user_id, email in result}
+        if fetched:
+            await r.hset(NAMES_KEY, mapping=fetched)
+        names.update(fetched)
+
+    return names
+
+
+async def update_leaderboard():
+    """
+    Rebuild the 24h leaderboard from the PnL buckets and store it in Redis.
+    """
+    try:
+        r = get_redis()
+        await _seed_buckets(r)
+
+        await r.zunionstore(SCORES_KEY, window_bucket_keys(time.time()))
+        top = await r.zrevrange(SCORES_KEY, 0, LEADERBOARD_SIZE - 1, withscores=True)
+        user_ids = [
+            member.decode() if isinstance(member, bytes) else member
+            for member, _ in top
+        ]
+        names = await _display_names(r, user_ids)
+
+        leaderboard = [
+            {"user": names.get(user_id, user_id[:8]), "pnl": round(score, 8)}
+            for user_id, (_, score) in zip(user_ids, top)
+        ]
+        await r.set(LEADERBOARD_KEY, json.dumps(leaderboard))
+
+        logger.debug(f"Leaderboard updated with {len(leaderboard)} users")
+
     except Exception as e:
         logger.error(f"Failed to update leaderboard: {e}")
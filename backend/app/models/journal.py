@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +17,13 @@ if TYPE_CHECKING:
 class JournalEntry(Base):
     """Journal Entry model - Snapshot of a completed trade"""
     __tablename__ = "journal_entries"
+    __table_args__ = (
+        # keyset pagination, newest first (see app.core.pagination)
+        Index(
+            "ix_journal_entries_portfolio_exit_time",
+            "portfolio_id", "exit_time", "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Numeric, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, func
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -20,6 +20,14 @@ if TYPE_CHECKING:
 class Order(Base):
     """Order model for tracking all trading orders"""
     __tablename__ = "orders"
+    __table_args__ = (
+        # keyset pagination, newest first (see app.core.pagination)
+        Index("ix_orders_portfolio_created", "portfolio_id", "created_at", "id"),
+        Index(
+            "ix_orders_portfolio_status_created",
+            "portfolio_id", "status", "created_at", "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -60,6 +68,9 @@ class Order(Base):
     
     # Reduce only flag (for closing positions)
     reduce_only: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # Leverage the order was placed with (None: the portfolio's at fill time)
+    leverage: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
@@ -0,0 +1,371 @@
+"""
+Parity and speedup of the compiled indicator kernels against the pure-Python loop
+implementations they replaced.
+
+The reference implementations below are the previous code, kept so the outputs
+can be compared (_resistance and _support are folded into one function, and
+squeeze_momentum is compared end to end since its loops sit in the indicator
+body). Run from
+the backend directory:
+
+    python -m benchmarks.indicator_kernels [--candles 5000] [--repeat 5]
+
+Exits non-zero if any kernel's output differs from its reference.
+"""
+import argparse
+import importlib
+import sys
+import time
+
+import numpy as np
+
+
+# ----------------------------------------------------------------------------
+# Reference (pre-kernel) implementations
+# ----------------------------------------------------------------------------
+
+def _reference_pivot(source, left_bars, right_bars, is_high):
+    pivots = [None] * len(source)
+
+    for i in range(left_bars, len(source) - right_bars):
+        is_pivot = True
+
+        for j in range(1, left_bars + 1):
+            if (source[i] <= source[i - j]) if is_high else (source[i] >= source[i - j]):
+                is_pivot = False
+                break
+
+        if is_pivot:
+            for j in range(1, right_bars + 1):
+                if (source[i] <= source[i + j]) if is_high else (source[i] >= source[i + j]):
+                    is_pivot = False
+                    break
+
+        if is_pivot:
+            is_pivot = source[i]
+
+        pivots[i] = is_pivot
+
+    next_valid = None
+    first_value = None
+    for i in range(len(pivots)):
+        if pivots[i] is False:
+            pivots[i] = next_valid
+        elif pivots[i] is not None:
+            next_valid = pivots[i]
+            first_value = i if first_value is None else first_value
+
+    pivots[:first_value - 1] = [pivots[first_value]] * len(pivots[:first_value - 1])
+    pivots[-right_bars:] = [pivots[-right_bars - 1]] * len(pivots[-right_bars:])
+
+    return pivots[-1]
+
+
+def _reference_cksp_atr(high, low, close, timeperiod=10):
+    tr = np.empty_like(close)
+    tr[0] = high[0] - low[0]
+    tr[1:] = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - close[:-1]),
+        np.abs(low[1:] - close[:-1])
+    ])
+    atr_vals = np.empty_like(close)
+    if len(close) < timeperiod:
+        return np.full_like(close, np.nan)
+    atr_vals[:timeperiod-1] = np.nan
+    atr_vals[timeperiod-1] = np.mean(tr[:timeperiod])
+    for t in range(timeperiod, len(close)):
+        atr_vals[t] = (atr_vals[t-1]*(timeperiod-1) + tr[t]) / timeperiod
+    return atr_vals
+
+
+def _reference_kvo_cm(trend, dm):
+    cm = np.zeros_like(dm)
+    for i in range(1, len(trend)):
+        if trend[i] == trend[i-1]:
+            cm[i] = cm[i-1] + dm[i]
+        else:
+            cm[i] = dm[i] + dm[i-1]
+    return cm
+
+
+def _reference_damiani_atr(high, low, close, timeperiod):
+    tr = np.empty_like(high, dtype=float)
+    tr[0] = high[0] - low[0]
+    if high.shape[0] > 1:
+        diff1 = high[1:] - low[1:]
+        diff2 = np.abs(high[1:] - close[:-1])
+        diff3 = np.abs(low[1:] - close[:-1])
+        tr[1:] = np.maximum(diff1, np.maximum(diff2, diff3))
+    atr_array = np.full(high.shape, np.nan, dtype=float)
+    if high.shape[0] < timeperiod:
+        atr_array[-1] = np.mean(tr)
+        return atr_array
+    n = high.shape[0]
+    m = n - timeperiod + 1
+    alpha = 1.0 / timeperiod
+    initial = np.mean(tr[:timeperiod])
+    ema_vector = np.empty(m)
+    ema_vector[0] = initial
+    if m > 1:
+        k = np.arange(m)
+        initial_contrib = initial * (1 - alpha) ** k
+        exp_matrix = np.tril((1 - alpha) ** (np.subtract.outer(np.arange(m - 1), np.arange(m - 1))))
+        sum_vals = alpha * (exp_matrix @ tr[timeperiod:])
+        ema_vector[1:] = initial_contrib[1:] + sum_vals
+    atr_array[:timeperiod - 1] = np.nan
+    atr_array[timeperiod - 1:] = ema_vector
+    return atr_array
+
+
+def _reference_stiffness_count(close_prices, art_series, length):
+    ex_counts = []
+    for i in range(len(close_prices)):
+        if i < length:
+            ex_counts.append(0)
+            continue
+        count = 0
+        for j in range(i - length + 1, i + 1):
+            if close_prices[j] > art_series[j]:
+                count += 1
+        ex_counts.append(count)
+    return ex_counts
+
+
+def _reference_stc_ema(series, period):
+    alpha = 2 / (period + 1)
+    out = np.empty_like(series, dtype=float)
+    out[0] = series[0]
+    for i in range(1, len(series)):
+        out[i] = alpha * series[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+def _reference_stc_stoch(series, period):
+    result = np.full_like(series, np.nan, dtype=float)
+    for i in range(len(series)):
+        if i < period - 1:
+            result[i] = np.nan
+        else:
+            window = series[i - period + 1: i + 1]
+            low = np.min(window)
+            high = np.max(window)
+            if high == low:
+                result[i] = 0
+            else:
+                result[i] = 100 * ((series[i] - low) / (high - low))
+    return result
+
+
+def _reference_rolling(values, length, reduce):
+    out = np.full(values.shape, np.nan)
+    for i in range(length - 1, len(values)):
+        out[i] = reduce(values[i - length + 1:i + 1])
+    return out
+
+
+def _reference_squeeze_momentum(candles, length=20, mult_kc=1.5, length_kc=20):
+    from jesse.indicators.linearreg import linearreg
+    from jesse.indicators.sma import sma
+    from jesse.indicators.stddev import stddev
+    from jesse.indicators.trange import trange
+
+    basis = sma(candles, length, sequential=True)
+    dev = mult_kc * stddev(candles, length, sequential=True)
+    upper_bb = basis + dev
+    lower_bb = basis - dev
+    ma = sma(candles, length_kc, sequential=True)
+    range_ma = sma(trange(candles, sequential=True), period=length_kc, sequential=True)
+    upper_kc = ma + range_ma * mult_kc
+    lower_kc = ma - range_ma * mult_kc
+
+    sqz = []
+    for i in range(len(lower_bb)):
+        sqz_on = (lower_bb[i] > lower_kc[i]) and (upper_bb[i] < upper_kc[i])
+        sqz_off = (lower_bb[i] < lower_kc[i]) and (upper_bb[i] > upper_kc[i])
+        no_sqz = (sqz_on == False) and (sqz_off == False)
+        sqz.append(0 if no_sqz else (-1 if sqz_on else 1))
+
+    highs = np.nan_to_num(_reference_rolling(candles[:, 3], length_kc, np.max), 0)
+    lows = np.nan_to_num(_reference_rolling(candles[:, 4], length_kc, np.min), 0)
+    sma_arr = np.nan_to_num(sma(candles, period=length_kc, sequential=True))
+
+    momentum = []
+    for i in range(len(highs)):
+        momentum.append(candles[:, 2][i] - ((highs[i] + lows[i]) / 2 + sma_arr[i]) / 2)
+    momentum = linearreg(np.array(momentum), period=length_kc, sequential=True)
+
+    momentum_signal = []
+    for i in range(len(momentum) - 1):
+        if momentum[i + 1] > 0:
+            momentum_signal.append(1 if momentum[i + 1] > momentum[i] else 2)
+        else:
+            momentum_signal.append(-1 if momentum[i + 1] < momentum[i] else -2)
+
+    return sqz, momentum, momentum_signal
+
+
+def _reference_t3(source, k, w1, w2, w3, w4):
+    n = len(source)
+    e1, e2, e3, e4, e5, e6, t3 = (np.zeros(n) for _ in range(7))
+    e1[0] = e2[0] = e3[0] = e4[0] = e5[0] = e6[0] = source[0]
+    k_rev = 1 - k
+    for i in range(1, n):
+        e1[i] = k * source[i] + k_rev * e1[i-1]
+        e2[i] = k * e1[i] + k_rev * e2[i-1]
+        e3[i] = k * e2[i] + k_rev * e3[i-1]
+        e4[i] = k * e3[i] + k_rev * e4[i-1]
+        e5[i] = k * e4[i] + k_rev * e5[i-1]
+        e6[i] = k * e5[i] + k_rev * e6[i-1]
+        t3[i] = w1 * e6[i] + w2 * e5[i] + w3 * e4[i] + w4 * e3[i]
+    return t3
+
+
+def _reference_vwap(source, volume, group_indices):
+    vwap_values = np.zeros_like(source)
+    cum_vol = 0.0
+    cum_vol_price = 0.0
+    current_group = group_indices[0]
+    for i in range(len(source)):
+        if group_indices[i] != current_group:
+            cum_vol = 0.0
+            cum_vol_price = 0.0
+            current_group = group_indices[i]
+        cum_vol_price += volume[i] * source[i]
+        cum_vol += volume[i]
+        vwap_values[i] = cum_vol_price / cum_vol if cum_vol != 0 else np.nan
+    return vwap_values
+
+
+# ----------------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------------
+
+def make_candles(count: int, seed: int = 0) -> np.ndarray:
+    """Random-walk candles in Jesse's [timestamp, open, close, high, low, volume] layout"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) + rng.random(count)
+    low = np.minimum(open_, close) - rng.random(count)
+    volume = rng.random(count) * 1000 + 1
+    timestamps = 1_600_000_000_000 + np.arange(count) * 60_000
+    return np.column_stack((timestamps, open_, close, high, low, volume)).astype(np.float64)
+
+
+def _cases(candles: np.ndarray) -> list:
+    """(name, kernel call, reference call) for each ported kernel"""
+    srb = importlib.import_module('jesse.indicators.support_resistance_with_break')
+    cksp = importlib.import_module('jesse.indicators.cksp')
+    kvo = importlib.import_module('jesse.indicators.kvo')
+    damiani = importlib.import_module('jesse.indicators.damiani_volatmeter')
+    stiffness = importlib.import_module('jesse.indicators.stiffness')
+    stc = importlib.import_module('jesse.indicators.stc')
+    squeeze = importlib.import_module('jesse.indicators.squeeze_momentum')
+    t3 = importlib.import_module('jesse.indicators.t3')
+    vwap = importlib.import_module('jesse.indicators.vwap')
+
+    close, high, low = candles[:, 2], candles[:, 3], candles[:, 4]
+    hlc3 = (high + low + close) / 3
+    mom = np.diff(hlc3, prepend=hlc3[0])
+    trend = np.zeros_like(mom)
+    trend[1:] = np.where(mom[1:] > 0, 1, np.where(mom[1:] < 0, -1, trend[:-1]))
+    dm = high - low
+    # the reference builds an (n x n) matrix; keep it to a size that fits in memory
+    damiani_candles = candles[-2000:]
+    # a bound that's NaN for the first bars, like the SMA-based one stiffness uses
+    bound = np.concatenate((np.full(100, np.nan), close[:-100]))
+    macd = stc.ema(close, 23) - stc.ema(close, 50)
+    # T3 weights for vfactor 0.7
+    t3_k = 2 / (5 + 1)
+    t3_weights = (-0.7 ** 3, 3 * 0.7 ** 2 + 3 * 0.7 ** 3, -6 * 0.7 ** 2 - 3 * 0.7 - 3 * 0.7 ** 3,
+                  1 + 3 * 0.7 + 0.7 ** 3 + 3 * 0.7 ** 2)
+    # hourly anchors over the one-minute candles
+    groups = (candles[:, 0] // 3_600_000).astype(np.int64)
+
+    return [
+        ('support_resistance_with_breaks.resistance',
+         lambda: srb._resistance(high, 15, 15),
+         lambda: _reference_pivot(high, 15, 15, True)),
+        ('support_resistance_with_breaks.support',
+         lambda: srb._support(low, 15, 15),
+         lambda: _reference_pivot(low, 15, 15, False)),
+        ('cksp.atr',
+         lambda: cksp.atr(high, low, close, 10),
+         lambda: _reference_cksp_atr(high, low, close, 10)),
+        ('kvo.cumulative_measurement',
+         lambda: kvo._cumulative_measurement(trend, dm),
+         lambda: _reference_kvo_cm(trend, dm)),
+        ('damiani_volatmeter.atr',
+         lambda: damiani.atr(damiani_candles[:, 3], damiani_candles[:, 4], damiani_candles[:, 2], 40),
+         lambda: _reference_damiani_atr(damiani_candles[:, 3], damiani_candles[:, 4], damiani_candles[:, 2], 40)),
+        ('stiffness.count_price_exceed_series',
+         lambda: stiffness._count_price_exceed_series(close, bound, 60),
+         lambda: _reference_stiffness_count(close, bound, 60)),
+        ('stc.ema',
+         lambda: stc.ema(close, 23),
+         lambda: _reference_stc_ema(close, 23)),
+        ('stc.stoch',
+         lambda: stc.stoch(macd, 10),
+         lambda: _reference_stc_stoch(macd, 10)),
+        ('squeeze_momentum',
+         lambda: np.concatenate([np.asarray(v, dtype=float) for v in squeeze.squeeze_momentum(candles)]),
+         lambda: np.concatenate([np.asarray(v, dtype=float) for v in _reference_squeeze_momentum(candles)])),
+        ('t3',
+         lambda: t3._t3(close, t3_k, *t3_weights),
+         lambda: _reference_t3(close, t3_k, *t3_weights)),
+        ('vwap.calculate_vwap',
+         lambda: vwap._calculate_vwap(hlc3, candles[:, 5], groups),
+         lambda: _reference_vwap(hlc3, candles[:, 5], groups)),
+    ]
+
+
+def _best_time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(candle_count: int = 5000, repeat: int = 5) -> list:
+    """
+    Returns a row per kernel: name, parity (bool), reference and kernel time (s), speedup.
+    """
+    rows = []
+    for name, kernel, reference in _cases(make_candles(candle_count)):
+        # the first call compiles (or loads the cached machine code)
+        expected, actual = reference(), kernel()
+        parity = bool(np.allclose(actual, expected, rtol=1e-9, atol=1e-12, equal_nan=True))
+
+        reference_time = _best_time(reference, repeat)
+        kernel_time = _best_time(kernel, repeat)
+        rows.append({
+            'name': name,
+            'parity': parity,
+            'reference_s': reference_time,
+            'kernel_s': kernel_time,
+            'speedup': reference_time / kernel_time if kernel_time else float('inf'),
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candles', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rows = run(args.candles, args.repeat)
+    print(f"{'kernel':45} {'parity':>6} {'reference':>12} {'kernel':>12} {'speedup':>9}")
+    for row in rows:
+        print(
+            f"{row['name']:45} {'ok' if row['parity'] else 'FAIL':>6} "
+            f"{row['reference_s'] * 1e3:10.3f}ms {row['kernel_s'] * 1e3:10.3f}ms {row['speedup']:8.1f}x"
+        )
+    return 0 if all(row['parity'] for row in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Validation and speedup of the signal precompute mode of fast-mode backtests.
+
+Each case is a bundled test strategy (jesse.strategies.Test*) subclassed with a
+precompute_signals() equivalent to its should_long()/should_short(). Both versions
+are backtested on the same candles and their metrics, trades and daily balances
+must be identical. Run from the backend directory:
+
+    python -m benchmarks.signal_precompute [--minutes 100000] [--repeat 3]
+
+Exits non-zero if any case differs from the regular simulation.
+"""
+import argparse
+import importlib
+import sys
+import time
+
+import numpy as np
+
+TIMEFRAME = '5m'
+# 5m closes of the sawtooth below go 205, 210, ..., 400, 5, 10, ..., so the `price < 7`
+# and `price == 10` signals of the test strategies fire once every 400 minutes, and
+# the first candle is priced high enough for the ones entering on it
+SAWTOOTH = np.roll(np.arange(1, 401), -200)
+
+
+def _at_index(long: tuple = (), short: tuple = ()):
+    """signals of strategies firing on their n-th execution (self.index == n)"""
+    def signals(candles):
+        result = {'long': np.zeros(len(candles), dtype=bool), 'short': np.zeros(len(candles), dtype=bool)}
+        result['long'][list(long)] = True
+        result['short'][list(short)] = True
+        return result
+    return signals
+
+
+_BELOW_7 = lambda candles: {'long': candles[:, 2] < 7}
+_LONG_AT_10 = lambda candles: {'long': candles[:, 2] == 10}
+_SHORT_AT_10 = lambda candles: {'short': candles[:, 2] == 10}
+
+# strategy name => precompute_signals() equivalent to its rules (without warmup
+# candles, candle i is the one of the strategy's i-th execution)
+CASES = {
+    'Test01': _at_index(long=(0,)),
+    'Test02': _at_index(short=(0,)),
+    'Test04': _at_index(long=(0,)),
+    'Test09': lambda candles: {},
+    'Test10': _BELOW_7,
+    'Test11': _at_index(short=(0,)),
+    'Test12': _BELOW_7,
+    'Test13': _BELOW_7,
+    'Test14': _BELOW_7,
+    'Test15': _BELOW_7,
+    'Test16': _BELOW_7,
+    'Test17': _BELOW_7,
+    'Test18': _BELOW_7,
+    'Test20': _at_index(long=(1,)),
+    'Test22': _LONG_AT_10,
+    'Test24': _LONG_AT_10,
+    'Test26': _SHORT_AT_10,
+    'Test28': _LONG_AT_10,
+    'Test30': _LONG_AT_10,
+    'Test31': _at_index(long=(0,), short=(20,)),
+    'Test34': _at_index(long=(0,)),
+    'Test45': _at_index(long=(10,), short=(11,)),
+    'TestPositionWithLeverage2': _LONG_AT_10,
+    'TestReduceOnlyMarketOrders': _LONG_AT_10,
+    'TestStopLossPriceIsReplacedWithMarketOrderForBetterPriceLongPosition': _LONG_AT_10,
+    'TestTakeProfitPriceIsReplacedWithMarketOrderWhenMoreConvenientShortPosition': _SHORT_AT_10,
+}
+
+
+def _with_signals(strategy_class, signals):
+    class Precomputed(strategy_class):
+        def precompute_signals(self, candles):
+            return signals(candles)
+
+    Precomputed.__name__ = strategy_class.__name__
+    return Precomputed
+
+
+def _backtest(strategy_class, candles: dict, fast_mode: bool = True) -> dict:
+    from jesse.enums import exchanges
+    from jesse.research import backtest
+
+    config = {
+        'starting_balance': 10_000,
+        'fee': 0,
+        'type': 'futures',
+        'futures_leverage': 2,
+        'futures_leverage_mode': 'cross',
+        'exchange': exchanges.SANDBOX,
+        'warm_up_candles': 0,
+    }
+    routes = [{'exchange': exchanges.SANDBOX, 'strategy': strategy_class, 'symbol': 'BTC-USDT', 'timeframe': TIMEFRAME}]
+    return backtest(config, routes, [], candles, generate_equity_curve=True, fast_mode=fast_mode)
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, dict) and isinstance(b, dict):
+        # trades and orders get random ids
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a if k != 'id')
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float) and np.isnan(a) and np.isnan(b):
+        return True
+    return a == b
+
+
+def _candles(minutes: int) -> dict:
+    import jesse.helpers as jh
+    from jesse.enums import exchanges
+    from jesse.research.candles import candles_from_close_prices
+
+    prices = np.tile(SAWTOOTH, -(-minutes // len(SAWTOOTH)))[:minutes]
+    return {
+        jh.key(exchanges.SANDBOX, 'BTC-USDT'): {
+            'exchange': exchanges.SANDBOX,
+            'symbol': 'BTC-USDT',
+            'candles': candles_from_close_prices(prices),
+        }
+    }
+
+
+def _best_time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(minutes: int = 100_000, repeat: int = 3) -> list:
+    """
+    Returns a row per case: name, parity (bool), regular and precomputed time (s), speedup.
+    """
+    candles = _candles(minutes)
+    rows = []
+    for name, signals in CASES.items():
+        strategy_class = getattr(importlib.import_module(f'jesse.strategies.{name}'), name)
+        precomputed_class = _with_signals(strategy_class, signals)
+
+        expected, actual = _backtest(strategy_class, candles), _backtest(precomputed_class, candles)
+        keys = ('metrics', 'trades', 'equity_curve')
+        parity = all(_same(expected.get(k), actual.get(k)) for k in keys)
+
+        regular_time = _best_time(lambda: _backtest(strategy_class, candles), repeat)
+        precomputed_time = _best_time(lambda: _backtest(precomputed_class, candles), repeat)
+        rows.append({
+            'name': name,
+            'parity': parity,
+            'regular_s': regular_time,
+            'precomputed_s': precomputed_time,
+            'speedup': regular_time / precomputed_time if precomputed_time else float('inf'),
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--minutes', type=int, default=100_000, help='1m candles to backtest (a multiple of 5)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = run(args.minutes, args.repeat)
+    print(f"{'strategy':75} {'parity':>6} {'regular':>12} {'precomputed':>12} {'speedup':>9}")
+    for row in rows:
+        print(
+            f"{row['name']:75} {'ok' if row['parity'] else 'FAIL':>6} "
+            f"{row['regular_s'] * 1e3:10.1f}ms {row['precomputed_s'] * 1e3:10.1f}ms {row['speedup']:8.1f}x"
+        )
+    return 0 if all(row['parity'] for row in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Benchmark suite for the indicators and the backtest simulators, with JSON
+baselines to catch performance regressions (e.g. after upgrading numpy or numba).
+
+Run from the backend directory:
+
+    # time everything and save the results
+    python -m benchmarks run --output benchmarks/baselines/main.json
+
+    # time again and compare against a saved baseline
+    python -m benchmarks run --output /tmp/current.json
+    python -m benchmarks compare benchmarks/baselines/main.json /tmp/current.json --threshold 0.2
+
+`compare` exits non-zero if a benchmark got slower than the baseline by more than
+the threshold (a fraction: 0.2 = 20%). Baselines are only comparable when taken
+on the same machine.
+"""
+import argparse
+import fnmatch
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_SIZES = [1_000, 10_000]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2
+# strategies from jesse.strategies (the framework's own test strategies) that
+# cover a no-trade run, a single trade, multiple take-profits and a reduction
+SIMULATOR_STRATEGIES = ['Test09', 'Test01', 'Test10', 'Test18']
+SIMULATOR_CANDLES = 10_000
+SIMULATOR_TIMEFRAME = '15m'
+
+
+def _best_time(fn: Callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _indicator_benchmarks(sizes: List[int]) -> Dict[str, Callable]:
+    import jesse.indicators as ta
+    from jesse.research.candles import fake_range_candles
+
+    benchmarks = {}
+    for size in sizes:
+        candles = fake_range_candles(size)
+        for name in ta.__all__:
+            for sequential in (True, False):
+                key = f"indicators.{name}.{'sequential' if sequential else 'last'}.{size}"
+                benchmarks[key] = (
+                    lambda name=name, candles=candles, sequential=sequential:
+                    getattr(ta, name)(candles, sequential=sequential)
+                )
+    return benchmarks
+
+
+def _simulator_benchmarks() -> Dict[str, Callable]:
+    import jesse.helpers as jh
+    from jesse.enums import exchanges
+    from jesse.research import backtest
+    from jesse.research.candles import candles_from_close_prices
+
+    config = {
+        'starting_balance': 10_000,
+        'fee': 0,
+        'type': 'futures',
+        'futures_leverage': 1,
+        'futures_leverage_mode': 'cross',
+        'exchange': exchanges.SANDBOX,
+        'warm_up_candles': 0,
+    }
+    candles = {
+        jh.key(exchanges.SANDBOX, 'BTC-USDT'): {
+            'exchange': exchanges.SANDBOX,
+            'symbol': 'BTC-USDT',
+            'candles': candles_from_close_prices(range(1, SIMULATOR_CANDLES + 1)),
+        }
+    }
+
+    benchmarks = {}
+    for strategy_name in SIMULATOR_STRATEGIES:
+        # pass the class itself, so it doesn't have to be in ./strategies
+        strategy = getattr(
+            importlib.import_module(f'jesse.strategies.{strategy_name}'), strategy_name
+        )
+        routes = [{
+            'exchange': exchanges.SANDBOX,
+            'strategy': strategy,
+            'symbol': 'BTC-USDT',
+            'timeframe': SIMULATOR_TIMEFRAME,
+        }]
+        # fast_mode=False runs _step_simulator, fast_mode=True runs _skip_simulator
+        for simulator, fast_mode in (('step', False), ('skip', True)):
+            key = f'simulator.{simulator}.{strategy_name}.{SIMULATOR_CANDLES}'
+            benchmarks[key] = (
+                lambda routes=routes, fast_mode=fast_mode:
+                backtest(config, routes, [], candles, fast_mode=fast_mode)
+            )
+    return benchmarks
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+
+    versions = {'python': platform.python_version(), 'numpy': np.__version__}
+    for module in ('numba', 'pandas'):
+        try:
+            versions[module] = importlib.import_module(module).__version__
+        except Exception:
+            versions[module] = None
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'versions': versions,
+    }
+
+
+def run(
+        sizes: List[int] = None,
+        repeat: int = DEFAULT_REPEAT,
+        only: Optional[str] = None,
+        include_simulator: bool = True,
+) -> dict:
+    """
+    Times every benchmark (best of `repeat`, after a first call that compiles the
+    numba kernels) and returns {'meta': ..., 'results': {name: seconds}, 'errors': {name: message}}.
+    """
+    benchmarks = _indicator_benchmarks(sizes or DEFAULT_SIZES)
+    if include_simulator:
+        benchmarks.update(_simulator_benchmarks())
+    if only:
+        benchmarks = {k: v for k, v in benchmarks.items() if fnmatch.fnmatch(k, only)}
+
+    results, errors = {}, {}
+    for name, fn in benchmarks.items():
+        try:
+            fn()
+            results[name] = _best_time(fn, repeat)
+        except Exception as e:
+            # e.g. indicators with required arguments, or too few candles
+            errors[name] = f'{type(e).__name__}: {e}'
+
+    return {'meta': _metadata(), 'results': results, 'errors': errors}
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """
+    Returns the benchmarks that got slower than `threshold` (as {name: ratio}),
+    the ones that got faster by as much, and the ones missing on either side.
+    """
+    base_results, current_results = baseline['results'], current['results']
+    regressions, improvements = {}, {}
+    for name in sorted(set(base_results) & set(current_results)):
+        if not base_results[name]:
+            continue
+        ratio = current_results[name] / base_results[name]
+        if ratio > 1 + threshold:
+            regressions[name] = ratio
+        elif ratio < 1 / (1 + threshold):
+            improvements[name] = ratio
+
+    return {
+        'regressions': regressions,
+        'improvements': improvements,
+        'missing': sorted(set(base_results) - set(current_results)),
+        'new': sorted(set(current_results) - set(base_results)),
+    }
+
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the indicators and backtest simulators against JSON baselines.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='time the benchmarks and write the results as JSON')
+    run_parser.add_argument('--output', '-o', help='file to write (default: stdout)')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='candle counts for the indicators')
+    run_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument('--only', help="glob of benchmark names, e.g. 'indicators.rsi.*'")
+    run_parser.add_argument('--no-simulator', action='store_true', help='skip the backtest simulator benchmarks')
+
+    compare_parser = commands.add_parser('compare', help='flag slowdowns against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='allowed slowdown as a fraction (default: 0.2)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run(args.sizes, args.repeat, args.only, not args.no_simulator)
+        text = json.dumps(report, indent=2, sort_keys=True)
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, 'w') as f:
+                f.write(text + '\n')
+            print(f"Timed {len(report['results'])} benchmarks ({len(report['errors'])} skipped) -> {args.output}")
+        else:
+            print(text)
+        return 0
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    diff = compare(baseline, current, args.threshold)
+    for name, ratio in diff['regressions'].items():
+        print(f'SLOWER  {ratio:6.2f}x  {name}')
+    for name, ratio in diff['improvements'].items():
+        print(f'faster  {ratio:6.2f}x  {name}')
+    for name in diff['missing']:
+        print(f'missing           {name}')
+    print(
+        f"{len(diff['regressions'])} regression(s), {len(diff['improvements'])} improvement(s) "
+        f"beyond {args.threshold:.0%}"
+    )
+    return 1 if diff['regressions'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
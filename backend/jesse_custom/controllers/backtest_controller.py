@@ -3,7 +3,7 @@ from typing import Optional
 
 import jesse.helpers as jh
 from fastapi import APIRouter, Body, Header, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from jesse.models.BacktestSession import (
     delete_backtest_session,
     update_backtest_session_notes,
@@ -14,6 +14,8 @@ from jesse.models.BacktestSession import (
 )
 from jesse.models.BacktestSession import get_backtest_sessions as get_sessions
 from jesse.services import auth as authenticator
+from jesse.services import session_artifacts
+from jesse.services.candle import downsample_candles
 from jesse.services.multiprocessing import process_manager
 from jesse.services.transformers import (
     get_backtest_session,
@@ -22,7 +24,10 @@ from jesse.services.transformers import (
 from jesse.services.web import (
     BacktestRequestJson,
     CancelRequestJson,
+    GetBacktestSessionCandlesRequestJson,
+    GetBacktestSessionRequestJson,
     GetBacktestSessionsRequestJson,
+    GetBacktestSessionTradesRequestJson,
     UpdateBacktestSessionNotesRequestJson,
     UpdateBacktestSessionStateRequestJson,
 )
@@ -143,9 +148,9 @@ def get_backtest_sessions(request_json: GetBacktestSessionsRequestJson = Body(de
 
 
 @router.post("/sessions/{session_id}")
-def get_backtest_session_by_id(session_id: str, authorization: Optional[str] = Header(None)):
+def get_backtest_session_by_id(session_id: str, request_json: GetBacktestSessionRequestJson = Body(default=GetBacktestSessionRequestJson()), authorization: Optional[str] = Header(None)):
     """
-    Get a single backtest session by ID
+    Get a single backtest session by ID, with its trades (or one page of them) and (a range of) its equity curve
     """
     if not authenticator.is_valid_token(authorization):
         return authenticator.unauthorized_response()
@@ -159,7 +164,14 @@ def get_backtest_session_by_id(session_id: str, authorization: Optional[str] = H
         }, status_code=404)
 
     # Transform the session using the transformer
-    transformed_session = get_backtest_session_for_load_more(session)
+    transformed_session = get_backtest_session_for_load_more(
+        session,
+        trades_page=request_json.trades_page,
+        trades_per_page=request_json.trades_per_page,
+        equity_curve_start=request_json.equity_curve_start,
+        equity_curve_finish=request_json.equity_curve_finish,
+        equity_curve_max_points=request_json.equity_curve_max_points
+    )
     transformed_session = jh.clean_infinite_values(transformed_session)
 
     return JSONResponse({
@@ -266,13 +278,95 @@ def get_backtest_session_chart_data(session_id: str, authorization: Optional[str
             'error': f'Session with ID {session_id} not found'
         }, status_code=404)
 
-    chart_data = jh.clean_infinite_values(json.loads(session.chart_data)) if session.chart_data else None
+    if session_artifacts.has_artifacts(session_id):
+        chart_data = jh.clean_infinite_values(session_artifacts.load_chart_data(session_id))
+    else:
+        chart_data = jh.clean_infinite_values(json.loads(session.chart_data)) if session.chart_data else None
 
     return JSONResponse({
         'chart_data': chart_data
     })
 
 
+@router.post("/sessions/{session_id}/candles")
+def get_backtest_session_candles(session_id: str, request_json: GetBacktestSessionCandlesRequestJson = Body(default=GetBacktestSessionCandlesRequestJson()), authorization: Optional[str] = Header(None)):
+    """
+    Get the candles of a backtest session's chart, optionally only for one route and between two timestamps
+    """
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    if not session_artifacts.has_artifacts(session_id):
+        return JSONResponse({
+            'error': f'Candles for session with ID {session_id} not found'
+        }, status_code=404)
+
+    routes = session_artifacts.load_candles(
+        session_id,
+        exchange=request_json.exchange,
+        symbol=request_json.symbol,
+        timeframe=request_json.timeframe,
+        start=request_json.start,
+        finish=request_json.finish
+    )
+    for r in routes:
+        r['candles'] = downsample_candles(r['candles'], request_json.max_points)
+
+    if request_json.format == 'binary':
+        if len(routes) != 1:
+            return JSONResponse({
+                'error': 'The binary format requires exactly one route; pass exchange, symbol and timeframe'
+            }, status_code=400)
+        return Response(
+            content=session_artifacts.candles_to_bytes(routes[0]['candles']),
+            media_type='application/octet-stream',
+            headers={
+                'X-Candles-Count': str(len(routes[0]['candles'])),
+                'X-Candles-Columns': 'timestamp,open,close,high,low,volume',
+            }
+        )
+
+    for r in routes:
+        if request_json.format == 'columns':
+            r['candles'] = session_artifacts.candles_to_columns(r['candles'])
+        else:
+            r['candles'] = session_artifacts.candles_to_dicts(r['candles'])
+
+    return JSONResponse({
+        'candles_chart': routes
+    })
+
+
+@router.post("/sessions/{session_id}/trades")
+def get_backtest_session_trades(session_id: str, request_json: GetBacktestSessionTradesRequestJson = Body(default=GetBacktestSessionTradesRequestJson()), authorization: Optional[str] = Header(None)):
+    """
+    Get one page of the trades of a backtest session
+    """
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    session = get_backtest_session_by_id_from_db(session_id)
+
+    if not session:
+        return JSONResponse({
+            'error': f'Session with ID {session_id} not found'
+        }, status_code=404)
+
+    result = session_artifacts.load_trades(session_id, request_json.page, request_json.per_page)
+    if result is None:
+        # sessions stored before binary archives existed
+        trades = json.loads(session.trades) if session.trades else []
+        start = max(request_json.page - 1, 0) * request_json.per_page
+        result = {'trades': trades[start:start + request_json.per_page], 'total': len(trades)}
+
+    return JSONResponse({
+        'trades': jh.clean_infinite_values(result['trades']),
+        'total': result['total'],
+        'page': request_json.page,
+        'per_page': request_json.per_page
+    })
+
+
 @router.post("/sessions/{session_id}/strategy-code")
 def get_backtest_session_strategy_codes(session_id: str, authorization: Optional[str] = Header(None)):
     """
@@ -16,6 +16,7 @@ from jesse.models.OptimizationSession import (
 )
 from jesse.models.OptimizationSession import get_optimization_sessions as get_sessions
 from jesse.modes.optimize_mode import run as run_optimization
+from jesse.modes.optimize_mode import run_walk_forward
 from jesse.services import auth as authenticator
 from jesse.services.multiprocessing import process_manager
 from jesse.services.transformers import (
@@ -29,6 +30,7 @@ from jesse.services.web import (
     TerminateOptimizationRequestJson,
     UpdateOptimizationSessionNotesRequestJson,
     UpdateOptimizationSessionStateRequestJson,
+    WalkForwardOptimizationRequestJson,
 )
 
 router = APIRouter(prefix="/optimization", tags=["Optimization"])
@@ -71,6 +73,44 @@ async def optimization(request_json: OptimizationRequestJson, authorization: Opt
     return JSONResponse({'message': 'Started optimization...'}, status_code=202)
 
 
+@router.post("/walk-forward")
+async def walk_forward_optimization(request_json: WalkForwardOptimizationRequestJson, authorization: Optional[str] = Header(None)):
+    """
+    Start a walk-forward optimization process
+    """
+    if not authenticator.is_valid_token(authorization):
+        return authenticator.unauthorized_response()
+
+    jh.validate_cwd()
+
+    if jh.python_version() == (3, 13):
+        return JSONResponse({
+            'error': 'Optimization is not supported on Python 3.13',
+            'message': 'The Ray library used for optimization does not support Python 3.13 yet. Please use Python 3.12 or lower.'
+        }, status_code=500)
+
+    process_manager.add_task(
+        run_walk_forward,
+        request_json.id,
+        request_json.config,
+        request_json.exchange,
+        request_json.routes,
+        request_json.data_routes,
+        request_json.start_date,
+        request_json.finish_date,
+        request_json.folds,
+        request_json.training_ratio,
+        request_json.anchored,
+        request_json.trials_per_fold,
+        request_json.optimal_total,
+        request_json.fast_mode,
+        request_json.cpu_cores,
+        request_json.state,
+    )
+
+    return JSONResponse({'message': 'Started walk-forward optimization...'}, status_code=202)
+
+
 @router.post("/rerun")
 async def rerun_optimization(request_json: OptimizationRequestJson, authorization: Optional[str] = Header(None)):
     """
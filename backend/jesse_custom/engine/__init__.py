@@ -1,5 +1,6 @@
 """Engine module exports"""
 
+from .fixed_point import SymbolSpec, get_symbol_spec
 from .portfolio_manager import PortfolioManager, get_portfolio_manager
 from .user_portfolio import UserPortfolio
 from .user_position import UserPosition
@@ -9,4 +10,6 @@ __all__ = [
     "UserPortfolio",
     "PortfolioManager",
     "get_portfolio_manager",
+    "SymbolSpec",
+    "get_symbol_spec",
 ]
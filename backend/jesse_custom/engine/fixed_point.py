@@ -0,0 +1,116 @@
+"""
+Fixed-point helpers for the live position engine
+
+Inside the engine, prices are integers in units of 10^-price_decimals of the
+symbol (from its tick size), quantities are integers in units of
+10^-qty_decimals (from its lot size), and every USDT amount (balance, PnL,
+margin, fees) is an integer in units of 10^-QUOTE_DECIMALS. A price times a
+quantity times the symbol's quote_factor is an exact quote amount.
+
+Decimal only appears at the boundaries: orders coming in, prices from the
+market stream, database rows and API responses.
+"""
+
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, Decimal
+from typing import Dict, Optional
+
+from app.core.config import SYMBOL_SPECS
+
+# USDT amounts: same precision as the database's Numeric(18, 8) columns
+QUOTE_DECIMALS = 8
+
+_ZERO = Decimal("0")
+
+
+def _decimals(step: Decimal) -> int:
+    return max(0, -step.normalize().as_tuple().exponent)
+
+
+def div_round(numerator: int, denominator: int) -> int:
+    """Integer division rounded half to even, like Decimal's default"""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def to_units(value: Decimal, decimals: int) -> int:
+    """Decimal -> integer units of 10^-decimals (rounded half to even)"""
+    return int(Decimal(value).scaleb(decimals).to_integral_value(ROUND_HALF_EVEN))
+
+
+def from_units(units: int, decimals: int) -> Decimal:
+    """Integer units of 10^-decimals -> Decimal"""
+    return Decimal(units).scaleb(-decimals) if units else _ZERO
+
+
+def quote_units(value: Decimal) -> int:
+    return to_units(value, QUOTE_DECIMALS)
+
+
+def quote_decimal(units: int) -> Decimal:
+    return from_units(units, QUOTE_DECIMALS)
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    symbol: str
+    tick_size: Decimal
+    lot_size: Decimal
+    price_decimals: int
+    qty_decimals: int
+    # (price unit * qty unit) -> quote units
+    quote_factor: int
+
+    @classmethod
+    def from_metadata(cls, symbol: str, tick_size: Decimal, lot_size: Decimal):
+        price_decimals = _decimals(tick_size)
+        qty_decimals = _decimals(lot_size)
+        shift = QUOTE_DECIMALS - price_decimals - qty_decimals
+        if shift < 0:
+            raise ValueError(
+                f"{symbol}: tick and lot sizes are finer than {QUOTE_DECIMALS} "
+                "quote decimals"
+            )
+        return cls(
+            symbol=symbol,
+            tick_size=tick_size,
+            lot_size=lot_size,
+            price_decimals=price_decimals,
+            qty_decimals=qty_decimals,
+            quote_factor=10 ** shift,
+        )
+
+    def price_to_ticks(self, price: Decimal) -> int:
+        return to_units(price, self.price_decimals)
+
+    def ticks_to_price(self, ticks: int) -> Decimal:
+        return from_units(ticks, self.price_decimals)
+
+    def qty_to_lots(self, qty: Decimal) -> int:
+        return to_units(qty, self.qty_decimals)
+
+    def lots_to_qty(self, lots: int) -> Decimal:
+        return from_units(lots, self.qty_decimals)
+
+    def round_price(self, price: Decimal) -> Decimal:
+        """Nearest valid price (a multiple of the tick size)"""
+        steps = (Decimal(price) / self.tick_size).to_integral_value(ROUND_HALF_EVEN)
+        return steps * self.tick_size
+
+    def round_qty(self, qty: Decimal) -> Decimal:
+        """Largest valid quantity (a multiple of the lot size) not above qty"""
+        steps = (Decimal(qty) / self.lot_size).to_integral_value(ROUND_DOWN)
+        return steps * self.lot_size
+
+
+SYMBOL_SPECS_BY_NAME: Dict[str, SymbolSpec] = {
+    symbol: SymbolSpec.from_metadata(symbol, **meta)
+    for symbol, meta in SYMBOL_SPECS.items()
+}
+
+
+def get_symbol_spec(symbol: str) -> Optional[SymbolSpec]:
+    return SYMBOL_SPECS_BY_NAME.get(symbol)
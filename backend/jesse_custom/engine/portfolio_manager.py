@@ -8,10 +8,11 @@ This is the heart of the multi-user trading engine. It:
 """
 
 import asyncio
+import time
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from loguru import logger
 
@@ -21,6 +22,7 @@ from app.core.config import (
     SUPPORTED_SYMBOLS,
 )
 
+from .fixed_point import get_symbol_spec
 from .user_portfolio import UserPortfolio
 from .user_position import UserPosition
 
@@ -37,7 +39,9 @@ class PortfolioManager:
     """
     
     def __init__(self):
-        # In-memory portfolio cache: user_id -> UserPortfolio
+        # In-memory portfolio cache: user_id -> UserPortfolio. Copy-on-write:
+        # replaced rather than mutated when portfolios are added or removed, so
+        # price sweeps iterate a stable dict without holding any lock.
         self._portfolios: Dict[uuid.UUID, UserPortfolio] = {}
         
         # Current prices for each symbol
@@ -48,9 +52,19 @@ class PortfolioManager:
         # Subscribers for portfolio updates (for WebSocket notifications)
         self._update_subscribers: Dict[uuid.UUID, asyncio.Queue] = {}
         
-        # Lock for thread-safe operations
+        # Serializes adding/removing portfolios (short, never held by sweeps)
         self._lock = asyncio.Lock()
         
+        # One lock per account for multi-step operations such as order
+        # placement (see portfolio_lock()); dropped with the portfolio
+        self._portfolio_locks: Dict[uuid.UUID, asyncio.Lock] = {}
+        
+        # get_stats() counts, rebuilt by sweeps and after adds/removes
+        self._stats_snapshot: Optional[dict] = None
+        
+        # Database writes started by price sweeps (see _sync_in_background())
+        self._sync_tasks: set = set()
+        
         logger.info("📊 Portfolio Manager initialized")
     
     async def get_or_create_portfolio(
@@ -82,9 +96,10 @@ class PortfolioManager:
                 if price > 0:
                     position = portfolio.get_position(symbol)
                     if position:
-                        position.current_price = price
+                        position.update_price(price)
             
-            self._portfolios[user_id] = portfolio
+            self._portfolios = {**self._portfolios, user_id: portfolio}
+            self._stats_snapshot = None
             logger.info(
                 f"📈 Created portfolio for user {user_id} with ${starting_balance}"
             )
@@ -95,13 +110,37 @@ class PortfolioManager:
         """Get portfolio if it exists"""
         return self._portfolios.get(user_id)
     
+    def get_portfolio_snapshot(self, user_id: uuid.UUID) -> Optional[dict]:
+        """Read-only portfolio state, rebuilt only after the portfolio changed"""
+        portfolio = self._portfolios.get(user_id)
+        return portfolio.snapshot() if portfolio else None
+    
+    def portfolio_lock(self, user_id: uuid.UUID) -> asyncio.Lock:
+        """
+        Lock of one account. Hold it across multi-step changes that await in
+        between (margin check, fill, DB write) so two orders of the same user
+        don't interleave. Price sweeps don't take it: they change portfolios
+        synchronously, which the event loop never interrupts.
+        """
+        lock = self._portfolio_locks.get(user_id)
+        if lock is None:
+            lock = self._portfolio_locks[user_id] = asyncio.Lock()
+        return lock
+    
     async def remove_portfolio(self, user_id: uuid.UUID) -> bool:
         """Remove portfolio from cache (e.g., on user logout)"""
         async with self._lock:
             if user_id in self._portfolios:
-                del self._portfolios[user_id]
+                portfolios = dict(self._portfolios)
+                del portfolios[user_id]
+                self._portfolios = portfolios
+                self._stats_snapshot = None
                 if user_id in self._update_subscribers:
                     del self._update_subscribers[user_id]
+                # a held lock stays: its holder and waiters still rely on it
+                lock = self._portfolio_locks.get(user_id)
+                if lock is not None and not lock.locked():
+                    del self._portfolio_locks[user_id]
                 return True
             return False
     
@@ -116,30 +155,33 @@ class PortfolioManager:
             return []
         
         self._current_prices[symbol] = price
+        ticks = get_symbol_spec(symbol).price_to_ticks(price)
         liquidated_users = []
         
-        async with self._lock:
-            for user_id, portfolio in self._portfolios.items():
-                if not portfolio.is_active:
-                    continue
+        for user_id, portfolio in self._portfolios.items():
+            if not portfolio.is_active:
+                continue
+            
+            # Update the specific position
+            position = portfolio.get_position(symbol)
+            if position and position.is_open:
+                portfolio.set_position_price(symbol, ticks)
                 
-                # Update the specific position
-                position = portfolio.get_position(symbol)
-                if position and position.is_open:
-                    position.update_price(price)
-                    
-                    # Check for liquidation
-                    if position.check_liquidation():
-                        logger.warning(
-                            f"⚠️ Liquidation triggered for user {user_id} on {symbol}"
-                        )
-                        liquidated_symbols = portfolio.update_prices({symbol: price})
-                        if liquidated_symbols:
-                            liquidated_users.append(user_id)
-                    
-                    # Notify subscribers
-                    await self._notify_portfolio_update(user_id, portfolio)
+                # Check for liquidation
+                if position.check_liquidation():
+                    logger.warning(
+                        f"⚠️ Liquidation triggered for user {user_id} on {symbol}"
+                    )
+                    liquidated_symbols = portfolio.update_prices({symbol: price})
+                    if liquidated_symbols:
+                        liquidated_users.append(user_id)
+                
+                # Notify subscribers
+                await self._notify_portfolio_update(user_id, portfolio)
         
+        if liquidated_users:
+            self._stats_snapshot = None
+            self._sync_in_background(liquidated_users)
         return liquidated_users
     
     async def on_multi_price_update(
@@ -150,19 +192,22 @@ class PortfolioManager:
         
         More efficient for batch updates from the market stream.
         """
-        # Update current prices
+        # Update current prices; converted to ticks once for all portfolios
+        ticks_by_symbol = {}
         for symbol, price in prices.items():
             if symbol in SUPPORTED_SYMBOLS:
                 self._current_prices[symbol] = price
+                ticks_by_symbol[symbol] = get_symbol_spec(symbol).price_to_ticks(price)
         
         all_liquidated = []
+        active_count = 0
+        liquidated_count = 0
         
-        async with self._lock:
-            for user_id, portfolio in self._portfolios.items():
-                if not portfolio.is_active:
-                    continue
-                
-                liquidated_symbols = portfolio.update_prices(prices)
+        # the dict may be replaced while we await below; we keep iterating this one
+        portfolios = self._portfolios
+        for user_id, portfolio in portfolios.items():
+            if portfolio.is_active:
+                liquidated_symbols = portfolio.update_prices_ticks(ticks_by_symbol)
                 if liquidated_symbols:
                     all_liquidated.append(user_id)
                     logger.warning(
@@ -171,7 +216,18 @@ class PortfolioManager:
                 
                 # Notify subscribers
                 await self._notify_portfolio_update(user_id, portfolio)
+            
+            active_count += portfolio.is_active
+            liquidated_count += portfolio.is_liquidated
         
+        if portfolios is self._portfolios:
+            self._stats_snapshot = {
+                "total_portfolios": len(portfolios),
+                "active_portfolios": active_count,
+                "liquidated_portfolios": liquidated_count,
+            }
+        if all_liquidated:
+            self._sync_in_background(all_liquidated)
         return all_liquidated
     
     def get_current_price(self, symbol: str) -> Decimal:
@@ -201,20 +257,78 @@ class PortfolioManager:
             try:
                 await self._update_subscribers[user_id].put({
                     "type": "portfolio_update",
-                    "data": portfolio.to_dict(),
+                    "data": portfolio.snapshot(),
                     "timestamp": datetime.utcnow().isoformat()
                 })
             except Exception as e:
                 logger.error(f"Failed to notify portfolio update: {e}")
     
+    async def stage_portfolio(
+        self,
+        session,
+        portfolio: UserPortfolio,
+        symbols: Iterable[str] = (),
+    ) -> None:
+        """
+        Write the portfolio's row (balance, leverage, watermark, flags) and the
+        rows of its positions in `symbols` into the session, creating them if
+        needed. Doesn't commit: the caller commits them in the same transaction
+        as the change that caused them (e.g. the order that was filled).
+        """
+        from app.models import Portfolio as DBPortfolio
+        from app.models import Position as DBPosition
+        from sqlalchemy.orm import noload
+        
+        # the orders and positions relationships aren't needed here
+        db_portfolio = await session.get(
+            DBPortfolio, portfolio.id, options=[noload("*")]
+        )
+        if db_portfolio is None:
+            db_portfolio = DBPortfolio(
+                id=portfolio.id,
+                user_id=portfolio.user_id,
+                starting_balance=portfolio.starting_balance,
+            )
+            session.add(db_portfolio)
+        db_portfolio.balance = portfolio.balance
+        db_portfolio.leverage = portfolio.leverage
+        db_portfolio.max_drawdown_watermark = portfolio.max_equity_watermark
+        db_portfolio.is_liquidated = portfolio.is_liquidated
+        db_portfolio.is_active = portfolio.is_active
+        
+        for symbol in symbols:
+            position = portfolio.get_position(symbol)
+            if position is None:
+                continue
+            db_position = await session.get(
+                DBPosition, position.id, options=[noload("*")]
+            )
+            if db_position is None:
+                db_position = DBPosition(
+                    id=position.id, portfolio_id=portfolio.id, symbol=symbol
+                )
+                session.add(db_position)
+            elif db_position.is_open and not position.is_open:
+                db_position.closed_at = datetime.utcnow()
+            db_position.side = position.side
+            db_position.qty = position.qty
+            db_position.entry_price = position.entry_price
+            db_position.current_price = position.current_price
+            db_position.unrealized_pnl = position.unrealized_pnl
+            db_position.realized_pnl = position.realized_pnl
+            db_position.liquidation_price = position.liquidation_price
+            db_position.leverage = position.leverage
+            db_position.opened_at = position.opened_at
+            db_position.is_open = position.is_open
+    
     async def sync_to_database(self, user_id: uuid.UUID) -> None:
         """
-        Sync in-memory portfolio to database.
+        Write an in-memory portfolio and all its positions to the database.
         
-        Called periodically or after significant changes.
+        Fills are persisted with their order (see stage_portfolio()); this is
+        for changes made by price sweeps, such as liquidations.
         """
         from app.core.database import async_session_maker
-        from app.models import Portfolio as DBPortfolio
         
         portfolio = self._portfolios.get(user_id)
         if not portfolio:
@@ -222,29 +336,20 @@ class PortfolioManager:
         
         try:
             async with async_session_maker() as session:
-                # Check if portfolio exists in DB
-                from sqlalchemy import select
-                result = await session.execute(
-                    select(DBPortfolio).where(DBPortfolio.user_id == user_id)
-                )
-                db_portfolio = result.scalar_one_or_none()
-                
-                if db_portfolio:
-                    # Update existing
-                    db_portfolio.balance = portfolio.balance
-                    db_portfolio.leverage = portfolio.leverage
-                    db_portfolio.max_drawdown_watermark = portfolio.max_equity_watermark
-                    db_portfolio.is_liquidated = portfolio.is_liquidated
-                    db_portfolio.is_active = portfolio.is_active
-                else:
-                    # Create new (needs user to exist first)
-                    logger.debug(f"Portfolio for user {user_id} not in DB yet")
-                
+                await self.stage_portfolio(session, portfolio, list(portfolio.positions))
                 await session.commit()
                 logger.debug(f"Synced portfolio for user {user_id} to database")
         except Exception as e:
             logger.error(f"Failed to sync portfolio to database: {e}")
     
+    def _sync_in_background(self, user_ids: List[uuid.UUID]) -> None:
+        """Persist portfolios changed by a price sweep without blocking it"""
+        for user_id in user_ids:
+            task = asyncio.create_task(self.sync_to_database(user_id))
+            # the event loop only keeps weak references to tasks
+            self._sync_tasks.add(task)
+            task.add_done_callback(self._sync_tasks.discard)
+    
     async def load_from_database(self, user_id: uuid.UUID) -> Optional[UserPortfolio]:
         """
         Load portfolio from database into memory.
@@ -263,38 +368,21 @@ class PortfolioManager:
                     select(DBPortfolio)
                     .options(selectinload(DBPortfolio.positions))
                     .where(DBPortfolio.user_id == user_id)
+                    # a reset leaves the previous portfolio behind
+                    .order_by(DBPortfolio.created_at.desc())
+                    .limit(1)
                 )
                 db_portfolio = result.scalar_one_or_none()
                 
                 if db_portfolio:
-                    portfolio = UserPortfolio(
-                        id=db_portfolio.id,
-                        user_id=db_portfolio.user_id,
-                        balance=db_portfolio.balance,
-                        starting_balance=db_portfolio.starting_balance,
-                        leverage=db_portfolio.leverage,
-                        max_equity_watermark=db_portfolio.max_drawdown_watermark,
-                        is_liquidated=db_portfolio.is_liquidated,
-                        is_active=db_portfolio.is_active,
-                    )
-                    
-                    # Load positions
+                    portfolio = self._portfolio_from_row(db_portfolio)
                     for db_pos in db_portfolio.positions:
-                        portfolio.positions[db_pos.symbol] = UserPosition(
-                            id=db_pos.id,
-                            portfolio_id=db_pos.portfolio_id,
-                            symbol=db_pos.symbol,
-                            side=db_pos.side,
-                            qty=db_pos.qty,
-                            entry_price=db_pos.entry_price,
-                            current_price=db_pos.current_price,
-                            unrealized_pnl=db_pos.unrealized_pnl,
-                            realized_pnl=db_pos.realized_pnl,
-                            leverage=db_pos.leverage,
-                            liquidation_price=db_pos.liquidation_price,
-                        )
+                        if db_pos.symbol in SUPPORTED_SYMBOLS:
+                            portfolio.restore_position(self._position_from_row(db_pos))
                     
-                    self._portfolios[user_id] = portfolio
+                    async with self._lock:
+                        self._portfolios = {**self._portfolios, user_id: portfolio}
+                        self._stats_snapshot = None
                     logger.info(f"Loaded portfolio for user {user_id} from database")
                     return portfolio
                     
@@ -303,15 +391,110 @@ class PortfolioManager:
         
         return None
     
+    async def load_all_from_database(self) -> dict:
+        """
+        Load every portfolio and position from the database into memory.
+        
+        Called once on startup, before the market stream starts. Two bulk
+        queries (plain column rows, no ORM objects) instead of one
+        load_from_database() per user. Liquidated portfolios are loaded too,
+        so they stay blocked rather than being recreated fresh.
+        
+        Returns counts and the duration.
+        """
+        from sqlalchemy import select
+        
+        from app.core.database import async_session_maker
+        from app.models import Portfolio as DBPortfolio
+        from app.models import Position as DBPosition
+        
+        started_at = time.perf_counter()
+        
+        async with async_session_maker() as session:
+            portfolio_rows = (
+                await session.execute(
+                    select(*DBPortfolio.__table__.columns).order_by(
+                        DBPortfolio.created_at.desc()
+                    )
+                )
+            ).all()
+            position_rows = (
+                await session.execute(select(*DBPosition.__table__.columns))
+            ).all()
+        
+        loaded: Dict[uuid.UUID, UserPortfolio] = {}
+        by_portfolio_id: Dict[uuid.UUID, UserPortfolio] = {}
+        for row in portfolio_rows:
+            # the engine keeps one portfolio per user: keep the newest (a reset
+            # starts a new one)
+            if row.user_id in loaded:
+                continue
+            portfolio = self._portfolio_from_row(row)
+            loaded[row.user_id] = portfolio
+            by_portfolio_id[row.id] = portfolio
+        
+        positions_count = 0
+        for row in position_rows:
+            portfolio = by_portfolio_id.get(row.portfolio_id)
+            if portfolio is not None and row.symbol in SUPPORTED_SYMBOLS:
+                portfolio.restore_position(self._position_from_row(row))
+                positions_count += 1
+        
+        async with self._lock:
+            # never clobber a portfolio that's already live
+            self._portfolios = {**loaded, **self._portfolios}
+            self._stats_snapshot = None
+        
+        return {
+            "portfolios": len(loaded),
+            "positions": positions_count,
+            "duration_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        }
+    
+    @staticmethod
+    def _portfolio_from_row(row) -> UserPortfolio:
+        """UserPortfolio from a portfolios row (ORM object or column row)"""
+        return UserPortfolio(
+            id=row.id,
+            user_id=row.user_id,
+            balance=row.balance,
+            starting_balance=row.starting_balance,
+            leverage=row.leverage,
+            max_equity_watermark=row.max_drawdown_watermark,
+            is_liquidated=row.is_liquidated,
+            is_active=row.is_active,
+        )
+    
+    @staticmethod
+    def _position_from_row(row) -> UserPosition:
+        """UserPosition from a positions row (ORM object or column row)"""
+        return UserPosition(
+            id=row.id,
+            portfolio_id=row.portfolio_id,
+            symbol=row.symbol,
+            side=row.side,
+            qty=row.qty,
+            entry_price=row.entry_price or Decimal("0"),
+            current_price=row.current_price or Decimal("0"),
+            unrealized_pnl=row.unrealized_pnl,
+            realized_pnl=row.realized_pnl,
+            leverage=row.leverage,
+            liquidation_price=row.liquidation_price,
+            opened_at=row.opened_at,
+        )
+    
     def get_stats(self) -> dict:
-        """Get manager statistics"""
-        active_count = sum(1 for p in self._portfolios.values() if p.is_active)
-        liquidated_count = sum(1 for p in self._portfolios.values() if p.is_liquidated)
+        """Get manager statistics (counts as of the last sweep or add/remove)"""
+        if self._stats_snapshot is None:
+            portfolios = self._portfolios.values()
+            self._stats_snapshot = {
+                "total_portfolios": len(self._portfolios),
+                "active_portfolios": sum(1 for p in portfolios if p.is_active),
+                "liquidated_portfolios": sum(1 for p in portfolios if p.is_liquidated),
+            }
         
         return {
-            "total_portfolios": len(self._portfolios),
-            "active_portfolios": active_count,
-            "liquidated_portfolios": liquidated_count,
+            **self._stats_snapshot,
             "current_prices": {k: str(v) for k, v in self._current_prices.items()},
             "subscriber_count": len(self._update_subscribers),
         }
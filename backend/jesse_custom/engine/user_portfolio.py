@@ -3,10 +3,14 @@ User Portfolio - In-memory portfolio state for real-time trading
 
 Adapted from Jesse's FuturesExchange but designed for multi-user simulation.
 Each UserPortfolio manages one user's balance, margin, and positions.
+
+Amounts are fixed-point integers in quote units (see fixed_point.py). The sums
+over positions (unrealized PnL, margin, realized PnL) are kept up to date as
+positions change instead of being re-summed on every read; the Decimal
+properties only convert them.
 """
 
 import uuid
-from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, List, Optional
@@ -20,47 +24,72 @@ from app.core.config import (
     PositionSide,
 )
 
+from .fixed_point import div_round, get_symbol_spec, quote_decimal, quote_units
 from .user_position import UserPosition
 
 
-@dataclass
 class UserPortfolio:
     """
     In-memory representation of a user's trading portfolio.
-    
+
     This class handles:
     - Balance and margin calculations
     - Position management for multiple symbols
     - Fee deductions
     - Liquidation checking
     """
-    id: uuid.UUID = field(default_factory=uuid.uuid4)
-    user_id: uuid.UUID = None
-    
-    # Balance tracking
-    balance: Decimal = DEFAULT_STARTING_BALANCE
-    starting_balance: Decimal = DEFAULT_STARTING_BALANCE
-    
-    # Settings
-    leverage: int = DEFAULT_LEVERAGE
-    fee_rate: Decimal = FEE_RATE
-    
-    # State
-    is_liquidated: bool = False
-    is_active: bool = True
-    
-    # For Prop Mode - tracks highest equity
-    max_equity_watermark: Decimal = DEFAULT_STARTING_BALANCE
-    
-    # Positions by symbol
-    positions: Dict[str, UserPosition] = field(default_factory=dict)
-    
-    # Timestamps
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
-    
-    def __post_init__(self):
-        """Initialize positions for all supported symbols"""
+
+    def __init__(
+        self,
+        id: Optional[uuid.UUID] = None,
+        user_id: uuid.UUID = None,
+        balance: Decimal = DEFAULT_STARTING_BALANCE,
+        starting_balance: Decimal = DEFAULT_STARTING_BALANCE,
+        leverage: int = DEFAULT_LEVERAGE,
+        fee_rate: Decimal = FEE_RATE,
+        is_liquidated: bool = False,
+        is_active: bool = True,
+        max_equity_watermark: Decimal = DEFAULT_STARTING_BALANCE,
+        positions: Optional[Dict[str, UserPosition]] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+    ):
+        self.id = id or uuid.uuid4()
+        self.user_id = user_id
+
+        # Balance tracking (quote units)
+        self._balance = quote_units(balance)
+        self._starting_balance = quote_units(starting_balance)
+
+        # Settings
+        self.leverage = leverage
+        self.fee_rate = fee_rate
+        self._fee_numerator, self._fee_denominator = fee_rate.as_integer_ratio()
+
+        # State
+        self.is_liquidated = is_liquidated
+        self.is_active = is_active
+
+        # For Prop Mode - tracks highest equity (quote units)
+        self._watermark = quote_units(max_equity_watermark)
+
+        # Positions by symbol
+        self.positions: Dict[str, UserPosition] = positions or {}
+
+        # Timestamps
+        self.created_at = created_at or datetime.utcnow()
+        self.updated_at = updated_at or datetime.utcnow()
+
+        # Bumped on every change; snapshot() rebuilds its dict only when it moved
+        self.revision = 0
+        self._snapshot: Optional[tuple] = None
+
+        # Cached sums over positions (quote units), see _refresh_aggregates()
+        self._unrealized = 0
+        self._margin = 0
+        self._realized = 0
+
+        # Initialize positions for all supported symbols
         for symbol in SUPPORTED_SYMBOLS:
             if symbol not in self.positions:
                 self.positions[symbol] = UserPosition(
@@ -68,74 +97,117 @@ class UserPortfolio:
                     symbol=symbol,
                     leverage=self.leverage
                 )
-    
+        self._refresh_aggregates()
+
+    def __repr__(self) -> str:
+        return f"UserPortfolio(user_id={self.user_id}, balance={self.balance})"
+
+    def _refresh_aggregates(self) -> None:
+        """Re-sum the cached aggregates; after a position opened, changed or closed"""
+        unrealized = margin = realized = 0
+        for p in self.positions.values():
+            realized += p.realized_units
+            if p.is_open:
+                unrealized += p.unrealized_units
+                margin += p.margin_units
+        self._unrealized = unrealized
+        self._margin = margin
+        self._realized = realized
+
+    def _equity_units(self) -> int:
+        return self._balance + self._unrealized
+
+    def _fee_units(self, notional: int) -> int:
+        return div_round(notional * self._fee_numerator, self._fee_denominator)
+
+    @property
+    def balance(self) -> Decimal:
+        return quote_decimal(self._balance)
+
+    @property
+    def starting_balance(self) -> Decimal:
+        return quote_decimal(self._starting_balance)
+
+    @property
+    def max_equity_watermark(self) -> Decimal:
+        return quote_decimal(self._watermark)
+
     @property
     def equity(self) -> Decimal:
         """Calculate equity = balance + total unrealized PnL"""
-        total_unrealized = sum(
-            p.unrealized_pnl for p in self.positions.values() if p.is_open
-        )
-        return self.balance + total_unrealized
-    
+        return quote_decimal(self._equity_units())
+
     @property
     def total_margin_used(self) -> Decimal:
         """Total margin locked in open positions"""
-        return sum(
-            p.margin_used for p in self.positions.values() if p.is_open
-        )
-    
+        return quote_decimal(self._margin)
+
     @property
     def available_margin(self) -> Decimal:
         """Available margin for new positions"""
-        return self.equity - self.total_margin_used
-    
+        return quote_decimal(self._equity_units() - self._margin)
+
     @property
     def margin_ratio(self) -> Decimal:
         """Margin ratio (used margin / equity)"""
-        if self.equity <= 0:
+        equity = self._equity_units()
+        if equity <= 0:
             return Decimal("1")  # 100% margin used
-        return self.total_margin_used / self.equity
-    
+        return Decimal(self._margin) / equity
+
     @property
     def total_unrealized_pnl(self) -> Decimal:
         """Sum of all unrealized PnL across positions"""
-        return sum(p.unrealized_pnl for p in self.positions.values())
-    
+        return quote_decimal(self._unrealized)
+
     @property
     def total_realized_pnl(self) -> Decimal:
         """Sum of all realized PnL across positions"""
-        return sum(p.realized_pnl for p in self.positions.values())
-    
+        return quote_decimal(self._realized)
+
     @property
     def current_drawdown(self) -> Decimal:
         """Current drawdown from peak equity"""
-        if self.max_equity_watermark <= 0:
+        if self._watermark <= 0:
             return Decimal("0")
-        drawdown = (
-            (self.max_equity_watermark - self.equity)
-            / self.max_equity_watermark * 100
-        )
-        return drawdown
-    
+        drawdown = (self._watermark - self._equity_units()) * 100
+        return Decimal(drawdown) / self._watermark
+
     def get_position(self, symbol: str) -> Optional[UserPosition]:
         """Get position for a specific symbol"""
         return self.positions.get(symbol)
-    
+
+    def restore_position(self, position: UserPosition) -> None:
+        """Put a position loaded from the database in place"""
+        self.positions[position.symbol] = position
+        self._refresh_aggregates()
+        self.mark_changed()
+
     def update_leverage(self, new_leverage: int) -> None:
         """Update leverage for future positions"""
         self.leverage = new_leverage
         self.updated_at = datetime.utcnow()
-    
+        self.mark_changed()
+
+    def mark_changed(self) -> None:
+        """Invalidate the snapshot; call after changing state from outside"""
+        self.revision += 1
+
     def can_open_position(self, symbol: str, qty: Decimal, price: Decimal) -> bool:
         """Check if we have enough margin to open a position"""
         if self.is_liquidated:
             return False
-        
-        required_margin = (qty * price) / Decimal(self.leverage)
-        fee = qty * price * self.fee_rate
-        
-        return self.available_margin >= (required_margin + fee)
-    
+
+        spec = get_symbol_spec(symbol)
+        if spec is None:
+            return False
+        lots = spec.qty_to_lots(qty)
+        notional = spec.quote_factor * lots * spec.price_to_ticks(price)
+        required_margin = div_round(notional, self.leverage)
+        fee = self._fee_units(notional)
+
+        return self._equity_units() - self._margin >= required_margin + fee
+
     def open_position(
         self,
         symbol: str,
@@ -145,63 +217,68 @@ class UserPortfolio:
     ) -> tuple[bool, str, Optional[UserPosition]]:
         """
         Open a new position or add to existing position.
-        
+
         Returns: (success, message, position)
         """
         if self.is_liquidated:
             return False, "Portfolio is liquidated", None
-        
+
         position = self.positions.get(symbol)
         if not position:
             return False, f"Symbol {symbol} not supported", None
-        
+
         # Calculate margin and fees
-        required_margin = (qty * price) / Decimal(self.leverage)
-        fee = qty * price * self.fee_rate
+        lots = position.spec.qty_to_lots(qty)
+        ticks = position.spec.price_to_ticks(price)
+        notional = position.notional_units(lots, ticks)
+        required_margin = div_round(notional, self.leverage)
+        fee = self._fee_units(notional)
         total_cost = required_margin + fee
-        
-        if self.available_margin < total_cost:
+
+        available = self._equity_units() - self._margin
+        if available < total_cost:
             msg = (
-                f"Insufficient margin. Required: {total_cost}, "
-                f"Available: {self.available_margin}"
+                f"Insufficient margin. Required: {quote_decimal(total_cost)}, "
+                f"Available: {quote_decimal(available)}"
             )
             return False, msg, None
-        
+
         # Deduct fee from balance
-        self.balance -= fee
-        
+        self._balance -= fee
+
         # Determine position side
         pos_side = PositionSide.LONG if side == OrderSide.BUY else PositionSide.SHORT
-        
+
         # Open or increase position
         if position.is_open:
             if position.side == pos_side:
                 # Same side - increase position
-                position.increase_position(qty, price)
+                position.increase_position(lots, ticks)
             else:
                 # Opposite side - reduce or flip position
-                if qty >= position.qty:
-                    # Close existing and open new
-                    realized = position.close_position(price)
-                    self.balance += realized
-                    remaining_qty = qty - position.qty
-                    if remaining_qty > 0:
+                open_lots = position.lots
+                if lots >= open_lots:
+                    # Close existing and open the rest on the other side
+                    self._balance += position.close_position(ticks)
+                    remaining_lots = lots - open_lots
+                    if remaining_lots > 0:
                         position.open_position(
-                            pos_side, remaining_qty, price, self.leverage
+                            pos_side, remaining_lots, ticks, self.leverage
                         )
                 else:
                     # Partial close
-                    realized = position.reduce_position(qty, price)
-                    self.balance += realized
+                    self._balance += position.reduce_position(lots, ticks)
         else:
             # New position
-            position.open_position(pos_side, qty, price, self.leverage)
-        
+            position.open_position(pos_side, lots, ticks, self.leverage)
+
+        self._refresh_aggregates()
         self._update_watermark()
         self.updated_at = datetime.utcnow()
-        
+        self.mark_changed()
+
         return True, "Position opened successfully", position
-    
+
     def close_position(
         self,
         symbol: str,
@@ -210,103 +287,139 @@ class UserPortfolio:
     ) -> tuple[bool, str, Decimal]:
         """
         Close a position (fully or partially).
-        
+
         Returns: (success, message, realized_pnl)
         """
         position = self.positions.get(symbol)
         if not position or not position.is_open:
             return False, "No open position to close", Decimal("0")
-        
-        if price is None:
-            price = position.current_price
-        
+
+        spec = position.spec
+        ticks = spec.price_to_ticks(price) if price is not None else position.ticks
+        open_lots = position.lots
+        lots = spec.qty_to_lots(qty) if qty else open_lots
+
         # Calculate fee
-        close_qty = qty if qty and qty < position.qty else position.qty
-        fee = close_qty * price * self.fee_rate
-        
-        if qty and qty < position.qty:
+        close_lots = lots if lots < open_lots else open_lots
+        fee = self._fee_units(position.notional_units(close_lots, ticks))
+
+        if lots < open_lots:
             # Partial close
-            realized = position.reduce_position(qty, price)
+            realized = position.reduce_position(lots, ticks)
         else:
             # Full close
-            realized = position.close_position(price)
-        
+            realized = position.close_position(ticks)
+
         # Update balance
-        self.balance += realized - fee
-        
+        self._balance += realized - fee
+
+        self._refresh_aggregates()
         self._update_watermark()
         self.updated_at = datetime.utcnow()
-        
-        return True, "Position closed successfully", realized
-    
+        self.mark_changed()
+
+        return True, "Position closed successfully", quote_decimal(realized)
+
+    def set_position_price(self, symbol: str, ticks: int) -> None:
+        """Move one open position to a new price (in ticks)"""
+        position = self.positions.get(symbol)
+        if position and position.is_open:
+            self._unrealized += position.update_price_ticks(ticks)
+            self.mark_changed()
+
     def update_prices(self, prices: Dict[str, Decimal]) -> List[str]:
         """
         Update all position prices and check for liquidations.
-        
+
         Returns list of liquidated symbols.
         """
-        liquidated_symbols = []
-        
+        ticks_by_symbol = {}
         for symbol, price in prices.items():
+            spec = get_symbol_spec(symbol)
+            if spec is not None:
+                ticks_by_symbol[symbol] = spec.price_to_ticks(price)
+        return self.update_prices_ticks(ticks_by_symbol)
+
+    def update_prices_ticks(self, ticks_by_symbol: Dict[str, int]) -> List[str]:
+        """update_prices() with prices already converted to ticks"""
+        liquidated_symbols = []
+
+        for symbol, ticks in ticks_by_symbol.items():
             position = self.positions.get(symbol)
             if position and position.is_open:
-                position.update_price(price)
-                
+                self._unrealized += position.update_price_ticks(ticks)
+                self.mark_changed()
+
                 # Check liquidation
                 if position.check_liquidation():
                     self._liquidate_position(symbol)
                     liquidated_symbols.append(symbol)
-        
+
         self._update_watermark()
-        
+
         # Check Prop Drawdown (5% Max Trailing)
         if self.check_prop_failure():
             self.is_liquidated = True
             self.is_active = False
+            self.mark_changed()
             # Close all positions?
             # For now just flag it.
-            
+
         return liquidated_symbols
-    
+
     def check_prop_failure(self) -> bool:
         """
         Check if portfolio has breached prop firm rules.
         Rule: Equity < High Watermark * 0.95 (5% Max Trailing Drawdown)
         """
-        drawdown_limit = self.max_equity_watermark * Decimal("0.95")
-        return self.equity < drawdown_limit
+        return self._equity_units() * 100 < self._watermark * 95
 
     def _liquidate_position(self, symbol: str) -> None:
         """Handle position liquidation"""
         position = self.positions.get(symbol)
         if not position:
             return
-        
+
         # In liquidation, the position is closed at liquidation price
         # and any remaining margin is lost
-        liq_loss = position.margin_used + position.unrealized_pnl
-        position.close_position(position.liquidation_price or position.current_price)
-        
-        self.balance -= abs(liq_loss)
-        
+        liq_loss = position.margin_units + position.unrealized_units
+        close_price = position.liquidation_price or position.current_price
+        position.close_position(position.spec.price_to_ticks(close_price))
+
+        self._balance -= abs(liq_loss)
+        self._refresh_aggregates()
+
         # Check if entire account should be liquidated
-        if self.balance <= 0 or self.equity <= 0:
+        if self._balance <= 0 or self._equity_units() <= 0:
             self.is_liquidated = True
             self.is_active = False
-    
+
     def _update_watermark(self) -> None:
         """Update max equity watermark for drawdown tracking"""
-        if self.equity > self.max_equity_watermark:
-            self.max_equity_watermark = self.equity
-    
+        equity = self._equity_units()
+        if equity > self._watermark:
+            self._watermark = equity
+
+    def snapshot(self) -> dict:
+        """
+        to_dict(), cached until the next change.
+
+        The returned dict is shared between readers and replaced (never
+        mutated) on change, so it must be treated as read-only.
+        """
+        if self._snapshot is None or self._snapshot[0] != self.revision:
+            self._snapshot = (self.revision, self.to_dict())
+        return self._snapshot[1]
+
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses"""
+        equity = self._equity_units()
         return {
             "id": str(self.id),
             "user_id": str(self.user_id) if self.user_id else None,
             "balance": str(self.balance),
-            "equity": str(self.equity),
-            "available_margin": str(self.available_margin),
+            "equity": str(quote_decimal(equity)),
+            "available_margin": str(quote_decimal(equity - self._margin)),
             "total_margin_used": str(self.total_margin_used),
             "leverage": self.leverage,
             "is_liquidated": self.is_liquidated,
@@ -315,7 +428,7 @@ class UserPortfolio:
             "total_realized_pnl": str(self.total_realized_pnl),
             "current_drawdown": str(self.current_drawdown),
             "positions": {
-                symbol: pos.to_dict() 
+                symbol: pos.to_dict()
                 for symbol, pos in self.positions.items()
             },
         }
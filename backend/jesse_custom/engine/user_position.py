@@ -3,234 +3,365 @@ User Position - In-memory position state for real-time PnL updates
 
 This is adapted from Jesse's Position model but designed for multi-user support.
 Each UserPosition tracks a single symbol position for one user.
+
+State is kept in fixed-point integers (see fixed_point.py): the quantity in lots,
+the price in ticks, and the entry cost and PnL in quote units. The Decimal
+attributes of the API (qty, entry_price, unrealized_pnl, ...) are properties
+that convert on read.
 """
 
 import uuid
-from dataclasses import dataclass, field
 from datetime import datetime
-from decimal import Decimal
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
 from typing import Optional
 
 from app.core.config import PositionSide
 
+from .fixed_point import (
+    SymbolSpec,
+    div_round,
+    get_symbol_spec,
+    quote_decimal,
+    quote_units,
+)
+
+MAINTENANCE_MARGIN_RATE = Decimal("0.005")
+
 
-@dataclass
 class UserPosition:
     """
     In-memory representation of a user's position for real-time updates.
-    
+
     This is updated on every price tick and periodically synced to database.
     """
-    id: uuid.UUID = field(default_factory=uuid.uuid4)
-    portfolio_id: uuid.UUID = None
-    symbol: str = ""
-    side: PositionSide = PositionSide.FLAT
-    
-    # Position data
-    qty: Decimal = Decimal("0")
-    entry_price: Decimal = Decimal("0")
-    current_price: Decimal = Decimal("0")
-    
-    # PnL tracking
-    unrealized_pnl: Decimal = Decimal("0")
-    realized_pnl: Decimal = Decimal("0")
-    
-    # Risk parameters
-    leverage: int = 10
-    liquidation_price: Optional[Decimal] = None
-    
-    # Timestamps
-    opened_at: Optional[datetime] = None
-    
+
+    __slots__ = (
+        "id", "portfolio_id", "symbol", "spec", "side", "leverage", "opened_at",
+        "_lots", "_entry_cost", "_ticks", "_unrealized", "_realized",
+        "_liquidation_price", "_liquidation_ticks",
+    )
+
+    def __init__(
+        self,
+        id: Optional[uuid.UUID] = None,
+        portfolio_id: uuid.UUID = None,
+        symbol: str = "",
+        side: PositionSide = PositionSide.FLAT,
+        qty: Decimal = Decimal("0"),
+        entry_price: Decimal = Decimal("0"),
+        current_price: Decimal = Decimal("0"),
+        unrealized_pnl: Decimal = Decimal("0"),
+        realized_pnl: Decimal = Decimal("0"),
+        leverage: int = 10,
+        liquidation_price: Optional[Decimal] = None,
+        opened_at: Optional[datetime] = None,
+        spec: Optional[SymbolSpec] = None,
+    ):
+        self.id = id or uuid.uuid4()
+        self.portfolio_id = portfolio_id
+        self.symbol = symbol
+        self.spec = spec or get_symbol_spec(symbol)
+        if self.spec is None:
+            raise ValueError(
+                f"Unknown symbol {symbol!r}: it has no tick and lot sizes in SYMBOL_SPECS"
+            )
+        self.side = side
+        self.leverage = leverage
+        self.opened_at = opened_at
+
+        # Fixed-point state
+        self._lots = self.spec.qty_to_lots(abs(qty))
+        self._ticks = self.spec.price_to_ticks(current_price)
+        self._entry_cost = quote_units(abs(qty) * entry_price)
+        self._realized = quote_units(realized_pnl)
+        self._unrealized = 0
+        self._liquidation_price: Optional[Decimal] = None
+        self._liquidation_ticks: Optional[int] = None
+
+        # unrealized_pnl is derived from the prices; the argument is only kept
+        # for compatibility with rows that carry it
+        self._set_liquidation_price(liquidation_price)
+        self._calculate_pnl()
+
+    def __repr__(self) -> str:
+        return (
+            f"UserPosition(symbol={self.symbol!r}, side={self.side.value}, "
+            f"qty={self.qty}, entry_price={self.entry_price})"
+        )
+
+    # ------------------------------------------------------------------
+    # Decimal views (API boundary)
+    # ------------------------------------------------------------------
+
     @property
-    def is_open(self) -> bool:
-        return self.side != PositionSide.FLAT and self.qty > 0
-    
+    def qty(self) -> Decimal:
+        return self.spec.lots_to_qty(self._lots)
+
     @property
-    def is_long(self) -> bool:
-        return self.side == PositionSide.LONG
-    
+    def entry_price(self) -> Decimal:
+        if not self._lots:
+            return Decimal("0")
+        # entry cost / notional of one price unit at this quantity, in ticks
+        ticks = Decimal(self._entry_cost) / (self._lots * self.spec.quote_factor)
+        return ticks.scaleb(-self.spec.price_decimals)
+
     @property
-    def is_short(self) -> bool:
-        return self.side == PositionSide.SHORT
-    
+    def current_price(self) -> Decimal:
+        return self.spec.ticks_to_price(self._ticks)
+
+    @property
+    def unrealized_pnl(self) -> Decimal:
+        return quote_decimal(self._unrealized)
+
+    @property
+    def realized_pnl(self) -> Decimal:
+        return quote_decimal(self._realized)
+
+    @property
+    def liquidation_price(self) -> Optional[Decimal]:
+        return self._liquidation_price
+
     @property
     def value(self) -> Decimal:
         """Position value at current price"""
-        return abs(self.qty) * self.current_price
-    
+        return quote_decimal(self.value_units)
+
     @property
     def margin_used(self) -> Decimal:
         """Initial margin for this position"""
-        if self.entry_price and self.qty:
-            return abs(self.qty) * self.entry_price / Decimal(self.leverage)
-        return Decimal("0")
-    
+        return quote_decimal(self.margin_units)
+
     @property
     def roi_percent(self) -> Decimal:
         """Return on investment percentage"""
-        if self.margin_used > 0:
-            return (self.unrealized_pnl / self.margin_used) * 100
+        margin = self.margin_units
+        if margin > 0:
+            return Decimal(self._unrealized * 100) / margin
         return Decimal("0")
-    
+
+    # ------------------------------------------------------------------
+    # Fixed-point views (engine)
+    # ------------------------------------------------------------------
+
+    @property
+    def is_open(self) -> bool:
+        return self.side != PositionSide.FLAT and self._lots > 0
+
+    @property
+    def is_long(self) -> bool:
+        return self.side == PositionSide.LONG
+
+    @property
+    def is_short(self) -> bool:
+        return self.side == PositionSide.SHORT
+
+    @property
+    def lots(self) -> int:
+        return self._lots
+
+    @property
+    def ticks(self) -> int:
+        return self._ticks
+
+    @property
+    def value_units(self) -> int:
+        return self._lots * self._ticks * self.spec.quote_factor
+
+    @property
+    def margin_units(self) -> int:
+        if self._entry_cost and self._lots:
+            return div_round(self._entry_cost, self.leverage)
+        return 0
+
+    @property
+    def unrealized_units(self) -> int:
+        return self._unrealized
+
+    @property
+    def realized_units(self) -> int:
+        return self._realized
+
+    def notional_units(self, lots: int, ticks: int) -> int:
+        return lots * ticks * self.spec.quote_factor
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
     def update_price(self, new_price: Decimal) -> None:
         """Update current price and recalculate unrealized PnL"""
-        self.current_price = new_price
+        self.update_price_ticks(self.spec.price_to_ticks(new_price))
+
+    def update_price_ticks(self, ticks: int) -> int:
+        """
+        Update current price (in ticks) and recalculate unrealized PnL.
+
+        Returns the change of the unrealized PnL, in quote units.
+        """
+        before = self._unrealized
+        self._ticks = ticks
         self._calculate_pnl()
-    
+        return self._unrealized - before
+
     def _calculate_pnl(self) -> None:
         """Calculate unrealized PnL based on current price"""
-        if not self.is_open or not self.entry_price:
-            self.unrealized_pnl = Decimal("0")
+        if not self.is_open or not self._entry_cost:
+            self._unrealized = 0
             return
-        
-        price_diff = self.current_price - self.entry_price
-        if self.is_short:
-            price_diff = -price_diff
-        
-        self.unrealized_pnl = price_diff * abs(self.qty)
-    
+
+        pnl = self.value_units - self._entry_cost
+        self._unrealized = -pnl if self.is_short else pnl
+
     def open_position(
         self,
         side: PositionSide,
-        qty: Decimal,
-        price: Decimal,
+        lots: int,
+        ticks: int,
         leverage: int
-    ) -> Decimal:
+    ) -> int:
         """
         Open a new position.
-        
-        Returns the margin required.
+
+        Returns the margin required, in quote units.
         """
         if self.is_open:
             raise ValueError(
                 "Position already open. Close or modify existing position."
             )
-        
+
         self.side = side
-        self.qty = qty
-        self.entry_price = price
-        self.current_price = price
+        self._lots = lots
+        self._entry_cost = self.notional_units(lots, ticks)
+        self._ticks = ticks
         self.leverage = leverage
         self.opened_at = datetime.utcnow()
-        
+
         # Calculate liquidation price
         self._calculate_liquidation_price()
         self._calculate_pnl()
-        
-        return self.margin_used
-    
-    def increase_position(self, qty: Decimal, price: Decimal) -> Decimal:
+
+        return self.margin_units
+
+    def increase_position(self, lots: int, ticks: int) -> int:
         """
         Increase position size (add to existing position).
-        
-        Returns additional margin required.
+
+        Returns additional margin required, in quote units.
         """
         if not self.is_open:
             raise ValueError("No open position to increase")
-        
-        # Calculate new average entry price
-        total_value = (self.qty * self.entry_price) + (qty * price)
-        new_qty = self.qty + qty
-        self.entry_price = total_value / new_qty
-        self.qty = new_qty
-        
+
+        # The entry cost adds up; the average entry price is derived from it
+        added_cost = self.notional_units(lots, ticks)
+        self._entry_cost += added_cost
+        self._lots += lots
+
         # Recalculate liquidation price with new entry
         self._calculate_liquidation_price()
         self._calculate_pnl()
-        
+
         # Return additional margin required for the new qty
-        return (qty * price) / Decimal(self.leverage)
-    
-    def reduce_position(self, qty: Decimal, price: Decimal) -> Decimal:
+        return div_round(added_cost, self.leverage)
+
+    def reduce_position(self, lots: int, ticks: int) -> int:
         """
         Reduce position size (partial close).
-        
-        Returns realized PnL for the closed portion.
+
+        Returns realized PnL for the closed portion, in quote units.
         """
         if not self.is_open:
             raise ValueError("No open position to reduce")
-        
-        if qty > self.qty:
-            qty = self.qty  # Can't close more than we have
-        
-        # Calculate PnL for closed portion
-        price_diff = price - self.entry_price
+
+        if lots >= self._lots:
+            return self.close_position(ticks)
+
+        # Entry cost of the closed portion; what's left stays with the rest
+        closed_cost = div_round(self._entry_cost * lots, self._lots)
+        portion_pnl = self.notional_units(lots, ticks) - closed_cost
         if self.is_short:
-            price_diff = -price_diff
-        
-        portion_pnl = price_diff * qty
-        
+            portion_pnl = -portion_pnl
+
         # Update position
-        self.qty -= qty
-        self.realized_pnl += portion_pnl
-        
-        if self.qty <= 0:
-            return self.close_position(price)
-        
+        self._lots -= lots
+        self._entry_cost -= closed_cost
+        self._realized += portion_pnl
+
         self._calculate_pnl()
         return portion_pnl
-    
-    def close_position(self, close_price: Decimal) -> Decimal:
+
+    def close_position(self, ticks: int) -> int:
         """
         Close the entire position.
-        
-        Returns total realized PnL.
+
+        Returns total realized PnL, in quote units.
         """
         if not self.is_open:
-            return Decimal("0")
-        
+            return 0
+
         # Calculate final PnL
-        price_diff = close_price - self.entry_price
+        final_pnl = self.notional_units(self._lots, ticks) - self._entry_cost
         if self.is_short:
-            price_diff = -price_diff
-        
-        final_pnl = price_diff * self.qty
-        self.realized_pnl += final_pnl
-        
+            final_pnl = -final_pnl
+        self._realized += final_pnl
+
         # Reset position
-        self.qty = Decimal("0")
+        self._lots = 0
+        self._entry_cost = 0
         self.side = PositionSide.FLAT
-        self.entry_price = Decimal("0")
-        self.unrealized_pnl = Decimal("0")
-        self.liquidation_price = None
-        
+        self._unrealized = 0
+        self._set_liquidation_price(None)
+
         return final_pnl
-    
+
     def _calculate_liquidation_price(
-        self, maintenance_margin_rate: Decimal = Decimal("0.005")
+        self, maintenance_margin_rate: Decimal = MAINTENANCE_MARGIN_RATE
     ) -> None:
         """
         Calculate liquidation price using Bybit-style formula.
-        
+
         For LONG: Liq Price = Entry * (1 - 1/leverage + maintenance_rate)
         For SHORT: Liq Price = Entry * (1 + 1/leverage - maintenance_rate)
         """
         if not self.is_open:
-            self.liquidation_price = None
+            self._set_liquidation_price(None)
             return
-        
+
         initial_margin_rate = Decimal("1") / Decimal(self.leverage)
-        
+
         if self.is_long:
-            self.liquidation_price = self.entry_price * (
+            self._set_liquidation_price(self.entry_price * (
                 1 - initial_margin_rate + maintenance_margin_rate
-            )
+            ))
         else:
-            self.liquidation_price = self.entry_price * (
+            self._set_liquidation_price(self.entry_price * (
                 1 + initial_margin_rate - maintenance_margin_rate
-            )
-    
+            ))
+
+    def _set_liquidation_price(self, price: Optional[Decimal]) -> None:
+        """
+        Keep the exact price for display, plus the tick threshold that gives the
+        same answer as comparing against it: longs are liquidated at or below
+        it (floor), shorts at or above it (ceiling).
+        """
+        self._liquidation_price = price
+        if not price:
+            self._liquidation_ticks = None
+            return
+        ticks = price.scaleb(self.spec.price_decimals)
+        floor = int(ticks.to_integral_value(rounding=ROUND_FLOOR))
+        ceiling = int(ticks.to_integral_value(rounding=ROUND_CEILING))
+        self._liquidation_ticks = ceiling if self.is_short else floor
+
     def check_liquidation(self) -> bool:
         """Check if position should be liquidated at current price"""
-        if not self.is_open or not self.liquidation_price:
+        if not self.is_open or self._liquidation_ticks is None:
             return False
-        
+
         if self.is_long:
-            return self.current_price <= self.liquidation_price
+            return self._ticks <= self._liquidation_ticks
         else:
-            return self.current_price >= self.liquidation_price
-    
+            return self._ticks >= self._liquidation_ticks
+
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses"""
         return {
@@ -8,6 +8,7 @@ This module provides a paper trading implementation that:
 """
 
 import asyncio
+import time
 import uuid
 from datetime import datetime
 from decimal import Decimal
@@ -25,9 +26,15 @@ from app.core.config import (
     OrderStatus,
     OrderType,
 )
+from app.jobs.leaderboard import record_realized_pnl
 from app.models.journal import JournalEntry
 from app.models.order import Order
-from jesse_custom.engine import PortfolioManager, UserPortfolio, get_portfolio_manager
+from jesse_custom.engine import (
+    PortfolioManager,
+    UserPortfolio,
+    get_portfolio_manager,
+    get_symbol_spec,
+)
 
 
 class OrderRequest(BaseModel):
@@ -91,9 +98,114 @@ class PaperExchange:
         self._pending_by_symbol: Dict[str, List[PendingOrder]] = {
             symbol: [] for symbol in self.supported_symbols
         }
+
+        # Set by rehydrate(): what was restored on startup and how long it took
+        self.rehydration_stats: Optional[dict] = None
         
         logger.info("📜 Paper Exchange initialized")
     
+    async def rehydrate(self) -> dict:
+        """
+        Restore the engine state after a restart: portfolios and positions (see
+        PortfolioManager.load_all_from_database()), then the OPEN LIMIT/STOP
+        orders, re-armed as pending orders. Orders are loaded in one query
+        joined to their portfolio for the user id.
+
+        Reduce-only orders without an open position to reduce (on the side
+        they close) are canceled instead: filled, they would open one.
+        """
+        from sqlalchemy import select, update
+
+        from app.core.database import async_session_maker
+        from app.models import Portfolio as DBPortfolio
+
+        started_at = time.perf_counter()
+        stats = await self.portfolio_manager.load_all_from_database()
+
+        query = (
+            select(
+                Order.id,
+                Order.symbol,
+                Order.side,
+                Order.order_type,
+                Order.qty,
+                Order.price,
+                Order.reduce_only,
+                Order.leverage,
+                Order.created_at,
+                DBPortfolio.user_id,
+            )
+            .join(DBPortfolio, DBPortfolio.id == Order.portfolio_id)
+            .where(
+                Order.status == OrderStatus.OPEN,
+                Order.order_type.in_([OrderType.LIMIT, OrderType.STOP]),
+            )
+            .order_by(Order.created_at)
+        )
+        async with async_session_maker() as session:
+            rows = (await session.execute(query)).all()
+
+        restored = 0
+        orphaned = []
+        async with self._pending_lock:
+            armed = {
+                po.order_id
+                for pending in self._pending_by_symbol.values()
+                for po in pending
+            }
+            for row in rows:
+                if row.id in armed or row.symbol not in self.supported_symbols:
+                    continue
+                if row.reduce_only and not self._can_reduce(row.user_id, row.symbol, row.side):
+                    orphaned.append(row.id)
+                    continue
+                # STOP orders keep their trigger price in Order.price
+                is_stop = row.order_type == OrderType.STOP
+                self._pending_by_symbol.setdefault(row.symbol, []).append(
+                    PendingOrder(
+                        order_id=row.id,
+                        user_id=row.user_id,
+                        symbol=row.symbol,
+                        side=row.side,
+                        order_type=row.order_type,
+                        qty=row.qty,
+                        price=None if is_stop else row.price,
+                        stop_price=row.price if is_stop else None,
+                        reduce_only=row.reduce_only,
+                        leverage=row.leverage,
+                        created_at=row.created_at,
+                    )
+                )
+                restored += 1
+
+        if orphaned:
+            async with async_session_maker() as session:
+                await session.execute(
+                    update(Order)
+                    .where(Order.id.in_(orphaned))
+                    .values(status=OrderStatus.CANCELED, canceled_at=datetime.utcnow())
+                )
+                await session.commit()
+
+        stats["pending_orders"] = restored
+        stats["canceled_orders"] = len(orphaned)
+        stats["duration_ms"] = round((time.perf_counter() - started_at) * 1000, 1)
+        self.rehydration_stats = stats
+        logger.info(
+            f"♻️ Rehydrated {stats['portfolios']} portfolios, "
+            f"{stats['positions']} positions and {restored} pending orders "
+            f"({len(orphaned)} reduce-only orders canceled) in {stats['duration_ms']} ms"
+        )
+        return stats
+
+    def _can_reduce(self, user_id: uuid.UUID, symbol: str, side: OrderSide) -> bool:
+        """Whether the user has an open position that an order of this side closes"""
+        portfolio = self.portfolio_manager.get_portfolio(user_id)
+        position = portfolio.get_position(symbol) if portfolio else None
+        if not position or not position.is_open:
+            return False
+        return position.is_long == (side == OrderSide.SELL)
+
     def validate_symbol(self, symbol: str) -> bool:
         """Check if symbol is supported"""
         return symbol in self.supported_symbols
@@ -124,6 +236,30 @@ class PaperExchange:
                 )
             )
         
+        # One order at a time per account: the margin check, the fill and the
+        # DB write await in between
+        async with self.portfolio_manager.portfolio_lock(user_id):
+            return await self._submit_order(user_id, order, db)
+    
+    async def _submit_order(
+        self,
+        user_id: uuid.UUID,
+        order: OrderRequest,
+        db: Optional[AsyncSession] = None
+    ) -> OrderResult:
+        # Round to the symbol's lot and tick sizes, like the exchange would
+        spec = get_symbol_spec(order.symbol)
+        order.qty = spec.round_qty(order.qty)
+        if order.qty <= 0:
+            return OrderResult(
+                success=False,
+                message=f"Quantity is below the lot size of {spec.lot_size}"
+            )
+        if order.price is not None:
+            order.price = spec.round_price(order.price)
+        if order.stop_price is not None:
+            order.stop_price = spec.round_price(order.stop_price)
+
         # Get or create portfolio
         portfolio = await self.portfolio_manager.get_or_create_portfolio(user_id)
         
@@ -214,6 +350,7 @@ class PaperExchange:
                             avg_fill_price=fill_price,
                             status=OrderStatus.FILLED,
                             reduce_only=order.reduce_only,
+                            leverage=order.leverage,
                             filled_at=datetime.utcnow(),
                         )
                         db.add(db_order)
@@ -245,10 +382,16 @@ class PaperExchange:
                     # Let's assume caller handles commit or we do it here if it's a standalone op.
                     # Since this is "execute_market_order", it implies completion.
                     try:
+                        # balance and position, in the same transaction as the fill
+                        await self.portfolio_manager.stage_portfolio(
+                            db, portfolio, [order.symbol]
+                        )
                         await db.commit()
                     except Exception as e:
                         logger.error(f"Failed to persist order: {e}")
                         await db.rollback()
+                    else:
+                        await record_realized_pnl(portfolio.user_id, realized_pnl)
 
                 return OrderResult(
                     success=True,
@@ -292,10 +435,15 @@ class PaperExchange:
                             avg_fill_price=fill_price,
                             status=OrderStatus.FILLED,
                             reduce_only=order.reduce_only,
+                            leverage=order.leverage,
                             filled_at=datetime.utcnow(),
                         )
                         db.add(db_order)
                     try:
+                        # balance and position, in the same transaction as the fill
+                        await self.portfolio_manager.stage_portfolio(
+                            db, portfolio, [order.symbol]
+                        )
                         await db.commit()
                     except Exception as e:
                         logger.error(f"Failed to persist order: {e}")
@@ -360,6 +508,7 @@ class PaperExchange:
                 avg_fill_price=None,
                 status=OrderStatus.OPEN,
                 reduce_only=order.reduce_only,
+                leverage=order.leverage,
             )
             db.add(db_order)
             try:
@@ -429,6 +578,7 @@ class PaperExchange:
                 avg_fill_price=None,
                 status=OrderStatus.OPEN,
                 reduce_only=order.reduce_only,
+                leverage=order.leverage,
             )
             db.add(db_order)
             try:
@@ -510,28 +660,34 @@ class PaperExchange:
 
         async with async_session_maker() as session:
             for po in triggered:
-                portfolio = await self.portfolio_manager.get_or_create_portfolio(po.user_id)
-                if po.leverage and self.validate_leverage(po.leverage):
-                    portfolio.update_leverage(po.leverage)
-
-                order = OrderRequest(
-                    symbol=po.symbol,
-                    side=po.side,
-                    order_type=po.order_type,
-                    qty=po.qty,
-                    price=po.price,
-                    stop_price=po.stop_price,
-                    reduce_only=po.reduce_only,
-                    leverage=po.leverage,
-                )
+                async with self.portfolio_manager.portfolio_lock(po.user_id):
+                    await self._fill_pending_order(po, price, session)
 
-                await self._execute_market_order(
-                    portfolio=portfolio,
-                    order=order,
-                    fill_price=price,
-                    db=session,
-                    order_id=po.order_id,
-                )
+    async def _fill_pending_order(
+        self, po: PendingOrder, price: Decimal, session: AsyncSession
+    ) -> None:
+        portfolio = await self.portfolio_manager.get_or_create_portfolio(po.user_id)
+        if po.leverage and self.validate_leverage(po.leverage):
+            portfolio.update_leverage(po.leverage)
+
+        order = OrderRequest(
+            symbol=po.symbol,
+            side=po.side,
+            order_type=po.order_type,
+            qty=po.qty,
+            price=po.price,
+            stop_price=po.stop_price,
+            reduce_only=po.reduce_only,
+            leverage=po.leverage,
+        )
+
+        await self._execute_market_order(
+            portfolio=portfolio,
+            order=order,
+            fill_price=price,
+            db=session,
+            order_id=po.order_id,
+        )
     
     async def close_position(
         self,
@@ -564,10 +720,7 @@ class PaperExchange:
     
     async def get_portfolio_state(self, user_id: uuid.UUID) -> Optional[dict]:
         """Get current portfolio state for a user"""
-        portfolio = self.portfolio_manager.get_portfolio(user_id)
-        if portfolio:
-            return portfolio.to_dict()
-        return None
+        return self.portfolio_manager.get_portfolio_snapshot(user_id)
 
 
 # Global singleton instance
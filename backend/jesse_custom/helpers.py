@@ -856,6 +856,12 @@ def style(msg_text: str, msg_style: str) -> str:
 
 
 def terminate_app() -> None:
+    # os._exit() skips the interpreter's shutdown, so write buffered session logs
+    # and publish queued events first
+    from jesse.services.logger import flush_session_logs
+    from jesse.services.redis import flush_published_events
+    flush_session_logs()
+    flush_published_events()
     # close the database
     from jesse.services.db import database
     database.close_connection()
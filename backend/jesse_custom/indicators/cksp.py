@@ -2,6 +2,7 @@ from collections import namedtuple
 
 import numpy as np
 from jesse.helpers import slice_candles
+from numba import njit
 
 CKSP = namedtuple('CKSP', ['long', 'short'])
 
@@ -18,10 +19,15 @@ def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, timeperiod: int =
         return np.full_like(close, np.nan)
     atr_vals[:timeperiod-1] = np.nan
     atr_vals[timeperiod-1] = np.mean(tr[:timeperiod])
-    for t in range(timeperiod, len(close)):
-        atr_vals[t] = (atr_vals[t-1]*(timeperiod-1) + tr[t]) / timeperiod
+    _wilder_smoothing(atr_vals, tr, timeperiod)
     return atr_vals
 
+@njit(cache=True)
+def _wilder_smoothing(atr_vals, tr, timeperiod):
+    # atr_vals[timeperiod - 1] holds the seed
+    for t in range(timeperiod, len(tr)):
+        atr_vals[t] = (atr_vals[t-1]*(timeperiod-1) + tr[t]) / timeperiod
+
 def rolling_max(arr: np.ndarray, window: int) -> np.ndarray:
     n = len(arr)
     if n == 0:
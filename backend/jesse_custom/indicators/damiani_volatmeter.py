@@ -2,6 +2,7 @@ from collections import namedtuple
 
 import numpy as np
 from jesse.helpers import get_candle_source, slice_candles
+from numba import njit
 
 DamianiVolatmeter = namedtuple('DamianiVolatmeter', ['vol', 'anti'])
 
@@ -18,24 +19,22 @@ def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, timeperiod: int) -
     if high.shape[0] < timeperiod:
         atr_array[-1] = np.mean(tr)
         return atr_array
-    n = high.shape[0]
-    m = n - timeperiod + 1
-    alpha = 1.0 / timeperiod
-    initial = np.mean(tr[:timeperiod])
-    ema_vector = np.empty(m)
-    ema_vector[0] = initial
-    if m > 1:
-        k = np.arange(m)  # k = 0,..., m-1
-        initial_contrib = initial * (1 - alpha) ** k
-        # Build a lower-triangular matrix for weights for indices 1 to m-1
-        exp_matrix = np.tril((1 - alpha) ** (np.subtract.outer(np.arange(m - 1), np.arange(m - 1))))
-        # tr[timeperiod:] has length m-1
-        sum_vals = alpha * (exp_matrix @ tr[timeperiod:])
-        ema_vector[1:] = initial_contrib[1:] + sum_vals
+    ema_vector = _wilder_ema(tr, timeperiod, np.mean(tr[:timeperiod]))
     atr_array[:timeperiod - 1] = np.nan
     atr_array[timeperiod - 1:] = ema_vector
     return atr_array
 
+@njit(cache=True)
+def _wilder_ema(tr, timeperiod, initial):
+    # ema[k] = (1 - alpha) * ema[k - 1] + alpha * tr[timeperiod + k - 1], in O(n)
+    # instead of through an (n x n) matrix of weights
+    alpha = 1.0 / timeperiod
+    ema_vector = np.empty(tr.shape[0] - timeperiod + 1)
+    ema_vector[0] = initial
+    for k in range(1, ema_vector.shape[0]):
+        ema_vector[k] = (1 - alpha) * ema_vector[k - 1] + alpha * tr[timeperiod + k - 1]
+    return ema_vector
+
 def damiani_volatmeter(candles: np.ndarray, vis_atr: int = 13, vis_std: int = 20, sed_atr: int = 40, sed_std: int = 100,
                        threshold: float = 1.4, source_type: str = "close",
                        sequential: bool = False) -> DamianiVolatmeter:
@@ -3,6 +3,7 @@ from typing import Union
 import numpy as np
 from jesse.helpers import slice_candles
 from jesse.indicators import ema
+from numba import njit
 
 
 def kvo(candles: np.ndarray, short_period: int = 34, long_period: int = 55, sequential: bool = False) -> Union[float, np.ndarray]:
@@ -32,12 +33,7 @@ def kvo(candles: np.ndarray, short_period: int = 34, long_period: int = 55, sequ
     dm = candles[:, 3] - candles[:, 4]
 
     # Cumulative Measurement
-    cm = np.zeros_like(dm)
-    for i in range(1, len(trend)):
-        if trend[i] == trend[i-1]:
-            cm[i] = cm[i-1] + dm[i]
-        else:
-            cm[i] = dm[i] + dm[i-1]
+    cm = _cumulative_measurement(trend, dm)
 
     # Volume Force
     volume = candles[:, 5]
@@ -51,3 +47,14 @@ def kvo(candles: np.ndarray, short_period: int = 34, long_period: int = 55, sequ
     slow_ema = ema(vf, period=long_period, sequential=True)
     res = fast_ema - slow_ema
     return res if sequential else res[-1]
+
+
+@njit(cache=True)
+def _cumulative_measurement(trend, dm):
+    cm = np.zeros_like(dm)
+    for i in range(1, len(trend)):
+        if trend[i] == trend[i-1]:
+            cm[i] = cm[i-1] + dm[i]
+        else:
+            cm[i] = dm[i] + dm[i-1]
+    return cm
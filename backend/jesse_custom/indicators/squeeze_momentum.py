@@ -1,6 +1,7 @@
 from collections import namedtuple
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from .linearreg import linearreg
 from .sma import sma
@@ -38,29 +39,24 @@ def squeeze_momentum(candles: np.ndarray, length: int = 20, mult: float = 2.0, l
     upper_kc = ma + range_ma * mult_kc
     lower_kc = ma - range_ma * mult_kc
 
-    sqz = []
-    for i in range(len(lower_bb)):
-        sqz_on = (lower_bb[i] > lower_kc[i]) and (upper_bb[i] < upper_kc[i])
-        sqz_off = (lower_bb[i] < lower_kc[i]) and (upper_bb[i] > upper_kc[i])
-        noSqz = (sqz_on == False) and (sqz_off == False)
-        sqz.append(0 if noSqz else (-1 if sqz_on else 1))
+    sqz_on = (lower_bb > lower_kc) & (upper_bb < upper_kc)
+    sqz_off = (lower_bb < lower_kc) & (upper_bb > upper_kc)
+    sqz = np.where(sqz_on, -1, np.where(sqz_off, 1, 0)).tolist()
 
     highs = np.nan_to_num(_highest(candles[:, 3], length_kc), 0)
     lows = np.nan_to_num(_lowest(candles[:, 4], length_kc), 0)
     sma_arr = np.nan_to_num(sma(candles, period=length_kc, sequential=True))
 
-    momentum = []
-    for i in range(len(highs)):
-        momentum.append(candles[:, 2][i] - ((highs[i] + lows[i]) / 2 + sma_arr[i]) / 2)
+    momentum = candles[:, 2] - ((highs + lows) / 2 + sma_arr) / 2
+    momentum = linearreg(momentum, period=length_kc, sequential=True)
 
-    momentum = linearreg(np.array(momentum), period=length_kc, sequential=True)
-
-    momentum_signal = []
-    for i in range(len(momentum) - 1):
-        if momentum[i + 1] > 0:
-            momentum_signal.append(1 if momentum[i + 1] > momentum[i] else 2)
-        else:
-            momentum_signal.append(-1 if momentum[i + 1] < momentum[i] else -2)
+    # NaN momentum compares as neither rising nor above zero, so it's -2
+    current, previous = momentum[1:], momentum[:-1]
+    momentum_signal = np.where(
+        current > 0,
+        np.where(current > previous, 1, 2),
+        np.where(current < previous, -1, -2),
+    ).tolist()
 
     if sequential:
         return SqueezeMomentum(sqz, momentum, momentum_signal)
@@ -69,22 +65,18 @@ def squeeze_momentum(candles: np.ndarray, length: int = 20, mult: float = 2.0, l
 
 
 def _highest(values, length):
-    # Ensure values is a NumPy array for efficient computation
-    values = np.asarray(values)
-    # Initialize an array to hold the highest values
+    # highest value of each trailing window, NaN until the first full window
+    values = np.asarray(values, dtype=float)
     highest_values = np.full(values.shape, np.nan)
-    # Compute the highest value for each window
-    for i in range(length - 1, len(values)):
-        highest_values[i] = np.max(values[i - length + 1:i + 1])
+    if 0 < length <= len(values):
+        highest_values[length - 1:] = sliding_window_view(values, length).max(axis=1)
     return highest_values
 
 
 def _lowest(values, length):
-    # Ensure values is a NumPy array for efficient computation
-    values = np.asarray(values)
-    # Initialize an array to hold the lowest values
+    # lowest value of each trailing window, NaN until the first full window
+    values = np.asarray(values, dtype=float)
     lowest_values = np.full(values.shape, np.nan)
-    # Compute the lowest value for each window
-    for i in range(length - 1, len(values)):
-        lowest_values[i] = np.min(values[i - length + 1:i + 1])
+    if 0 < length <= len(values):
+        lowest_values[length - 1:] = sliding_window_view(values, length).min(axis=1)
     return lowest_values
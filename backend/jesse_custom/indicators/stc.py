@@ -1,33 +1,33 @@
 from typing import Union
 
 import numpy as np
+from numba import njit
 from jesse.helpers import get_candle_source, slice_candles
 
 
+@njit(cache=True)
 def ema(series: np.ndarray, period: int) -> np.ndarray:
     """Calculates the Exponential Moving Average (EMA) for a series using a simple recursive formula."""
     alpha = 2 / (period + 1)
-    out = np.empty_like(series, dtype=float)
+    out = np.empty(len(series))
     out[0] = series[0]
     for i in range(1, len(series)):
         out[i] = alpha * series[i] + (1 - alpha) * out[i - 1]
     return out
 
 
+@njit(cache=True)
 def stoch(series: np.ndarray, period: int) -> np.ndarray:
     """Calculates the stochastic oscillator for a series over the specified period."""
-    result = np.full_like(series, np.nan, dtype=float)
-    for i in range(len(series)):
-        if i < period - 1:
-            result[i] = np.nan
+    result = np.full(len(series), np.nan)
+    for i in range(period - 1, len(series)):
+        window = series[i - period + 1: i + 1]
+        low = np.min(window)
+        high = np.max(window)
+        if high == low:
+            result[i] = 0
         else:
-            window = series[i - period + 1: i + 1]
-            low = np.min(window)
-            high = np.max(window)
-            if high == low:
-                result[i] = 0
-            else:
-                result[i] = 100 * ((series[i] - low) / (high - low))
+            result[i] = 100 * ((series[i] - low) / (high - low))
     return result
 
 
@@ -31,22 +31,13 @@ def stiffness(candles: np.ndarray, ma_length: int = 100, stiff_length: int = 60,
     bound_stiffness = sma(source, ma_length, sequential=True) - 0.2 * \
         stddev(source, ma_length, sequential=True)
     sum_above_stiffness = _count_price_exceed_series(source, bound_stiffness, stiff_length)
-    return ema(np.array(sum_above_stiffness) * 100 / stiff_length, period=stiff_smooth)
+    return ema(sum_above_stiffness * 100 / stiff_length, period=stiff_smooth)
 
 
 def _count_price_exceed_series(close_prices, art_series, length):
-    ex_counts = []
-
-    for i in range(len(close_prices)):
-        if i < length:
-            ex_counts.append(0)
-            continue
-        count = 0
-
-        for j in range(i - length + 1, i + 1):
-            if close_prices[j] > art_series[j]:
-                count += 1
-
-        ex_counts.append(count)
-
+    # number of bars in the trailing `length`-bar window where the price is above the bound
+    # (NaN bounds never count), and 0 for the first `length` bars
+    exceeds = np.cumsum(np.asarray(close_prices) > np.asarray(art_series), dtype=np.int64)
+    ex_counts = np.zeros(len(exceeds), dtype=np.int64)
+    ex_counts[length:] = exceeds[length:] - exceeds[:-length]
     return ex_counts
@@ -1,6 +1,7 @@
 from collections import namedtuple
 
 import numpy as np
+from numba import njit
 
 from .ema import ema
 
@@ -41,78 +42,38 @@ def support_resistance_with_breaks(candles: np.ndarray, left_bars: int = 15, rig
 
 
 def _resistance(source, left_bars, right_bars):
-    pivot_highs = [None] * len(source)  # Initialize result list with None
+    return _last_pivot(source, left_bars, right_bars, 1.0)
 
-    for i in range(left_bars, len(source) - right_bars):
-        is_pivot_high = True
 
-        # Check left bars for higher high
-        for j in range(1, left_bars + 1):
-            if source[i] <= source[i - j]:
-                is_pivot_high = False
-                break
-
-        # Check right bars for higher high
-        if is_pivot_high:
-            for j in range(1, right_bars + 1):
-                if source[i] <= source[i + j]:
-                    is_pivot_high = False
-                    break
-
-        if is_pivot_high:
-            is_pivot_high = source[i]
-
-        pivot_highs[i] = is_pivot_high
-
-    next_valid = None
-    first_value = None
-    for i in range(len(pivot_highs)):
-        if pivot_highs[i] is False:
-            pivot_highs[i] = next_valid
-        elif pivot_highs[i] is not None:  # Update next_valid if it's not False or None
-            next_valid = pivot_highs[i]
-            first_value = i if first_value is None else first_value
-
-    pivot_highs[:first_value - 1] = [pivot_highs[first_value]] * len(pivot_highs[:first_value - 1])
-    pivot_highs[-right_bars:] = [pivot_highs[-right_bars - 1]] * len(pivot_highs[-right_bars:])
-
-    return pivot_highs[-1]
+def _support(source, left_bars, right_bars):
+    return _last_pivot(source, left_bars, right_bars, -1.0)
 
 
-def _support(source, left_bars, right_bars):
-    pivot_lows = [None] * len(source)  # Initialize result list with None
+@njit(cache=True)
+def _last_pivot(source, left_bars, right_bars, sign):
+    """
+    Value of the latest pivot (high for sign=1, low for sign=-1) that has
+    right_bars bars after it: a bar strictly above (below) the left_bars bars
+    before it and the right_bars bars after it. NaN if there's none.
 
-    for i in range(left_bars, len(source) - right_bars):
-        is_pivot_low = True
+    Scans backwards from the latest candidate, so it usually stops after a few bars.
+    """
+    for i in range(len(source) - right_bars - 1, left_bars - 1, -1):
+        value = sign * source[i]
+        is_pivot = True
 
-        # Check left bars for lower low
         for j in range(1, left_bars + 1):
-            if source[i] >= source[i - j]:
-                is_pivot_low = False
+            if value <= sign * source[i - j]:
+                is_pivot = False
                 break
 
-        # Check right bars for lower low
-        if is_pivot_low:
+        if is_pivot:
             for j in range(1, right_bars + 1):
-                if source[i] >= source[i + j]:
-                    is_pivot_low = False
+                if value <= sign * source[i + j]:
+                    is_pivot = False
                     break
 
-        if is_pivot_low:
-            is_pivot_low = source[i]
-
-        pivot_lows[i] = is_pivot_low
-
-    next_valid = None
-    first_value = None
-    for i in range(len(pivot_lows)):
-        if pivot_lows[i] is False:
-            pivot_lows[i] = next_valid
-        elif pivot_lows[i] is not None:  # Update next_valid if it's not False or None
-            next_valid = pivot_lows[i]
-            first_value = i if first_value is None else first_value
-
-    pivot_lows[:first_value - 1] = [pivot_lows[first_value]] * len(pivot_lows[:first_value - 1])
-    pivot_lows[-right_bars:] = [pivot_lows[-right_bars - 1]] * len(pivot_lows[-right_bars:])
+        if is_pivot:
+            return source[i]
 
-    return pivot_lows[-1]
+    return np.nan
@@ -1,6 +1,7 @@
 from typing import Union
 
 import numpy as np
+from numba import njit
 from jesse.helpers import get_candle_source, slice_candles
 
 
@@ -37,7 +38,7 @@ def t3(candles: np.ndarray, period: int = 5, vfactor: float = 0, source_type: st
         return result if sequential else result[-1]
         
     except ImportError:
-        # Fallback to pure Python implementation
+        # Fallback to the compiled kernel
         if len(candles.shape) == 1:
             source = candles
         else:
@@ -52,14 +53,15 @@ def t3(candles: np.ndarray, period: int = 5, vfactor: float = 0, source_type: st
         w3 = -6 * vfactor ** 2 - 3 * vfactor - 3 * vfactor ** 3
         w4 = 1 + 3 * vfactor + vfactor ** 3 + 3 * vfactor ** 2
         
-        t3 = _t3_fast_python(source, k, w1, w2, w3, w4)
+        t3 = _t3(source, k, w1, w2, w3, w4)
         
         return t3 if sequential else t3[-1]
 
 
-def _t3_fast_python(source: np.ndarray, k: float, w1: float, w2: float, w3: float, w4: float) -> np.ndarray:
+@njit(cache=True)
+def _t3(source: np.ndarray, k: float, w1: float, w2: float, w3: float, w4: float) -> np.ndarray:
     """
-    Pure Python implementation of T3 calculation
+    Numba implementation of T3 calculation
     """
     n = len(source)
     e1 = np.zeros(n)
@@ -1,6 +1,7 @@
 from typing import Union
 
 import numpy as np
+from numba import njit
 from jesse.helpers import get_candle_source, slice_candles
 
 
@@ -32,7 +33,7 @@ def vwap(
             return None if np.isnan(result[-1]) else result[-1]
     
     except ImportError:
-        # Fallback to original Python implementation with anchoring
+        # Fallback to the compiled kernel with anchoring
         candles = slice_candles(candles, sequential)
         source = get_candle_source(candles, source_type=source_type)
         
@@ -52,9 +53,10 @@ def vwap(
             return None if np.isnan(vwap_values[-1]) else vwap_values[-1]
 
 
+@njit(cache=True)
 def _calculate_vwap(source: np.ndarray, volume: np.ndarray, group_indices: np.ndarray) -> np.ndarray:
     """
-    Calculate VWAP values with anchoring logic (pure Python implementation fallback)
+    Calculate VWAP values with anchoring logic (Numba kernel fallback)
     """
     vwap_values = np.zeros_like(source)
     cum_vol = 0.0
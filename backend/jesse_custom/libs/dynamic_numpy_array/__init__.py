@@ -112,12 +112,14 @@ class DynamicNumpyArray:
 
         # expand if the arr will be greater than the maximum
         if self.index != 0 and (self.index + 1) >= len(self.array):
-            # in case the shape is smaller than  len(items)
+            # in case the shape is smaller than  len(items). Expand by whole buckets, since
+            # append() expands the array when the index reaches a multiple of the bucket size
+            buckets = -(-len(items) // self.bucket_size)
             if isinstance(self.shape, int):
-                shape = max(self.shape, len(items))
+                shape = buckets * self.bucket_size
             else:
                 shape = list(self.shape)
-                shape[0] = max(len(items), shape[0])
+                shape[0] = buckets * self.bucket_size
             new_bucket = np.zeros(shape)
             self.array = np.concatenate((self.array, new_bucket), axis=0)
 
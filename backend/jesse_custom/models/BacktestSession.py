@@ -217,6 +217,9 @@ def store_backtest_session(
     existing_session = get_backtest_session_by_id(id)
     
     if existing_session:
+        from jesse.services.session_artifacts import delete_artifacts
+        delete_artifacts(id)
+
         # Update existing session - reset it to fresh state
         d = {
             'status': status,
@@ -334,8 +337,11 @@ def get_backtest_sessions(limit: int = 50, offset: int = 0, title_search: str =
 
 
 def delete_backtest_session(id: str) -> bool:
+    from jesse.services.session_artifacts import delete_artifacts
+
     try:
         BacktestSession.delete().where(BacktestSession.id == id).execute()
+        delete_artifacts(id)
         return True
     except Exception as e:
         print(f"Error deleting backtest session: {e}")
@@ -343,6 +349,8 @@ def delete_backtest_session(id: str) -> bool:
 
 
 def purge_backtest_sessions(days_old: int = None) -> int:
+    from jesse.services.session_artifacts import delete_artifacts
+
     try:
         current_timestamp = jh.now_to_timestamp(True)
         
@@ -367,11 +375,15 @@ def purge_backtest_sessions(days_old: int = None) -> int:
             for session_id in sessions_to_delete:
                 try:
                     BacktestSession.delete().where(BacktestSession.id == session_id).execute()
+                    delete_artifacts(session_id)
                     deleted_count += 1
                 except Exception:
                     pass
         else:
+            session_ids = [s.id for s in BacktestSession.select(BacktestSession.id)]
             deleted_count = BacktestSession.delete().execute()
+            for session_id in session_ids:
+                delete_artifacts(session_id)
         
         return deleted_count
     except Exception as e:
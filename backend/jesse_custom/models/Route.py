@@ -12,4 +12,6 @@ class Route:
         self.timeframe = timeframe
         self.strategy_name = strategy_name
         self.strategy = None
+        # set by build_route_handles() when a simulation starts
+        self.handle = None
         self.dna = dna
@@ -19,6 +19,7 @@ from jesse.services import charts, logger, report
 from jesse.services.candle import (
     candle_includes_price,
     generate_candle_from_one_minutes,
+    generate_candles_from_one_minutes,
     get_candles,
     inject_warmup_candles_to_store,
     print_candle,
@@ -26,10 +27,12 @@ from jesse.services.candle import (
 )
 from jesse.services.failure import register_custom_exception_handler
 from jesse.services.file import store_logs
+from jesse.services.indicator_cache import indicator_cache
 from jesse.services.progressbar import Progressbar
 from jesse.services.redis import is_process_active, sync_publish
 from jesse.services.validators import validate_routes
 from jesse.store import store
+from jesse.store.route_handle import RouteHandle, build_route_handles
 from timeloop import Timeloop
 
 
@@ -252,6 +255,16 @@ def _execute_backtest(
                 except Exception:
                     pass
         
+        # Store the bulky results (equity curve, trades, chart data) in the session's
+        # binary archive; only the small ones go into the database row
+        from jesse.services.session_artifacts import store_artifacts
+        store_artifacts(
+            client_id,
+            equity_curve=result.get('equity_curve'),
+            trades=result.get('trades'),
+            chart_data=chart_data
+        )
+
         # Update backtest session in database with results
         from jesse.models.BacktestSession import (
             update_backtest_session_results,
@@ -260,10 +273,7 @@ def _execute_backtest(
         update_backtest_session_results(
             id=client_id,
             metrics=result.get('metrics'),
-            equity_curve=result.get('equity_curve'),
-            trades=result.get('trades'),
             hyperparameters=result.get('hyperparameters'),
-            chart_data=chart_data,
             execution_duration=result.get('execution_duration'),
             strategy_codes=strategy_codes if strategy_codes else None
         )
@@ -275,29 +285,24 @@ def _execute_backtest(
 
 
 def _get_formatted_candles_for_frontend():
+    """
+    Returns the candles of each route since the starting time as (n, 6) arrays. They are
+    stored as-is in the session's binary archive and only turned into the dashboard's
+    per-candle dicts (for the requested range) when they are served.
+    """
     arr = []
     for r in router.routes:
         candles_arr = store.candles.get_candles(r.exchange, r.symbol, r.timeframe)
         # Find the index where the starting time actually begins.
-        starting_index = 0
-        for i, c in enumerate(candles_arr):
-            if c[0] >= store.app.starting_time:
-                starting_index = i
-                break
-
-        candles = [{
-            'time': int(c[0]/1000),
-            'open': c[1],
-            'close': c[2],
-            'high': c[3],
-            'low': c[4],
-            'volume': c[5]
-        } for c in candles_arr[starting_index:]]
+        starting_index = int(np.searchsorted(candles_arr[:, 0], store.app.starting_time, side='left'))
+        if starting_index == len(candles_arr):
+            starting_index = 0
+
         arr.append({
             'exchange': r.exchange,
             'symbol': r.symbol,
             'timeframe': r.timeframe,
-            'candles': candles
+            'candles': np.array(candles_arr[starting_index:], dtype=np.float64)
         })
     return arr
 
@@ -468,10 +473,16 @@ def _handle_warmup_candles(warmup_candles: dict, start_date: str) -> None:
 
 
 def simulator(*args, fast_mode: bool = False, **kwargs) -> dict:
-    if fast_mode:
-        return _skip_simulator(*args, **kwargs)
+    # indicator results are shared by all the routes within a bar; the simulators
+    # clear the cache at each bar
+    indicator_cache.enable()
+    try:
+        if fast_mode:
+            return _skip_simulator(*args, **kwargs)
 
-    return _step_simulator(*args, **kwargs)
+        return _step_simulator(*args, **kwargs)
+    finally:
+        indicator_cache.disable()
 
 
 def _step_simulator(
@@ -501,6 +512,11 @@ def _step_simulator(
     length = _simulation_minutes_length(candles)
     _prepare_times_before_simulation(candles)
     candles_pipelines = _prepare_routes(hyperparameters, with_candles_pipeline, candles_pipeline_class, candles_pipeline_kwargs)
+    route_handles = _get_route_handles(candles)
+    bigger_timeframes = _bigger_timeframes()
+    # debugging options can't change during a simulation
+    debug_shorter_period_candles = jh.is_debuggable('shorter_period_candles')
+    debug_trading_candles = jh.is_debuggable('trading_candles')
 
     # add initial balance
     save_daily_portfolio_balance(is_initial=True)
@@ -508,45 +524,36 @@ def _step_simulator(
     progressbar = Progressbar(length, step=420)
     last_update_time = None
     for i in range(length):
+        indicator_cache.clear()
+
         # update time
         store.app.time = first_candles_set[i][0] + 60_000
 
         # add candles
-        for j in candles:
+        for j, handle in route_handles:
             candles_pipeline = candles_pipelines[j]
             short_candle = get_candles_from_pipeline(candles_pipeline, candles[j]['candles'], i)
             if i != 0:
                 previous_short_candle = candles[j]['candles'][i - 1]
                 short_candle = _get_fixed_jumped_candle(previous_short_candle, short_candle)
-            exchange = candles[j]['exchange']
-            symbol = candles[j]['symbol']
 
-            store.candles.add_candle(short_candle, exchange, symbol, '1m', with_execution=False,
-                                     with_generation=False)
+            handle.add_candle(short_candle)
 
             # print short candle
-            if jh.is_debuggable('shorter_period_candles'):
-                print_candle(short_candle, True, symbol)
+            if debug_shorter_period_candles:
+                print_candle(short_candle, True, handle.symbol)
 
-            _simulate_price_change_effect(short_candle, exchange, symbol)
+            _simulate_price_change_effect(short_candle, handle)
 
             # generate and add candles for bigger timeframes
-            for timeframe in config['app']['considering_timeframes']:
-                # for 1m, no work is needed
-                if timeframe == '1m':
-                    continue
-
-                count = TIMEFRAME_TO_ONE_MINUTES[timeframe]
-                # until = count - ((i + 1) % count)
-
+            for timeframe, count in bigger_timeframes:
                 if (i + 1) % count == 0:
                     generated_candle = generate_candle_from_one_minutes(
                         timeframe,
                         candles[j]['candles'][(i - (count - 1)):(i + 1)]
                     )
 
-                    store.candles.add_candle(generated_candle, exchange, symbol, timeframe, with_execution=False,
-                                             with_generation=False)
+                    handle.add_candle(generated_candle, timeframe)
 
         last_update_time = _update_progress_bar(progressbar, run_silently, i, candle_step=420,
                                                 last_update_time=last_update_time)
@@ -559,12 +566,11 @@ def _step_simulator(
                 r.strategy._execute()
             elif (i + 1) % count == 0:
                 # print candle
-                if jh.is_debuggable('trading_candles'):
-                    print_candle(store.candles.get_current_candle(r.exchange, r.symbol, r.timeframe), False,
-                                 r.symbol)
+                if debug_trading_candles:
+                    print_candle(r.handle.get_current_candle(), False, r.symbol)
                 r.strategy._execute()
 
-            store.orders.update_active_orders(r.exchange, r.symbol)
+            r.handle.update_active_orders()
 
         # now check to see if there's any MARKET orders waiting to be executed
         _execute_market_orders()
@@ -624,6 +630,28 @@ def _prepare_times_before_simulation(candles: dict) -> None:
     store.app.time = first_candles_set[0][0]
 
 
+def _get_route_handles(candles: dict) -> List[Tuple[str, RouteHandle]]:
+    """
+    Pairs each key of the candles dict with its RouteHandle so the simulation loop
+    doesn't need to look them up.
+    """
+    result = []
+    for j in candles:
+        handle = store.route_handles.get(j)
+        if handle is None:
+            raise exceptions.RouteNotFound(candles[j]['symbol'], '1m')
+        result.append((j, handle))
+    return result
+
+
+def _bigger_timeframes() -> List[Tuple[str, int]]:
+    return [
+        (timeframe, TIMEFRAME_TO_ONE_MINUTES[timeframe])
+        for timeframe in config['app']['considering_timeframes']
+        if timeframe != '1m'
+    ]
+
+
 def _prepare_routes(hyperparameters: dict = None,
                     with_candles_pipeline: bool = True,
                     candles_pipeline_class = None,
@@ -682,6 +710,10 @@ def _prepare_routes(hyperparameters: dict = None,
 
         selectors.get_position(r.exchange, r.symbol).strategy = r.strategy
 
+    build_route_handles()
+    for r in router.routes:
+        r.strategy.handle = r.handle
+
     # Ensure pipelines exist for data routes as well (no strategy attached)
     # Keys in `candles` include both trading and data routes; provide a pipeline (or None) for each
     for dr in getattr(router, 'data_routes', []) or []:
@@ -763,11 +795,11 @@ def _get_fixed_jumped_candle(
     return candle
 
 
-def _simulate_price_change_effect(real_candle: np.ndarray, exchange: str, symbol: str) -> None:
+def _simulate_price_change_effect(real_candle: np.ndarray, handle: RouteHandle) -> None:
     current_temp_candle = real_candle.copy()
     executed_order = False
 
-    executing_orders = _get_executing_orders(exchange, symbol, real_candle)
+    executing_orders = _get_executing_orders(handle, real_candle)
     if len(executing_orders) > 1:
         # extend the candle shape from (6,) to (1,6)
         executing_orders = _sort_execution_orders(executing_orders, current_temp_candle[None, :])
@@ -785,15 +817,14 @@ def _simulate_price_change_effect(real_candle: np.ndarray, exchange: str, symbol
 
                 if candle_includes_price(current_temp_candle, order.price):
                     storable_temp_candle, current_temp_candle = split_candle(current_temp_candle, order.price)
-                    _update_all_routes_a_partial_candle(exchange, symbol, storable_temp_candle)
+                    _update_all_routes_a_partial_candle(handle, storable_temp_candle)
 
-                    p = selectors.get_position(exchange, symbol)
-                    p.current_price = storable_temp_candle[2]
+                    handle.position.current_price = storable_temp_candle[2]
 
                     executed_order = True
 
                     order.execute()
-                    executing_orders = _get_executing_orders(exchange, symbol, current_temp_candle)
+                    executing_orders = _get_executing_orders(handle, current_temp_candle)
                     if len(executing_orders) > 1:
                         # extend the candle shape from (6,) to (1,6)
                         executing_orders = _sort_execution_orders(executing_orders, current_temp_candle[None, :])
@@ -806,21 +837,17 @@ def _simulate_price_change_effect(real_candle: np.ndarray, exchange: str, symbol
 
         if not executed_order:
             # add/update the real_candle to the store so we can move on
-            store.candles.add_candle(
-                real_candle, exchange, symbol, '1m',
-                with_execution=False,
-                with_generation=False
-            )
-            p = selectors.get_position(exchange, symbol)
+            handle.add_candle(real_candle)
+            p = handle.position
             if p:
                 p.current_price = real_candle[2]
             break
 
-    _check_for_liquidations(real_candle, exchange, symbol)
+    _check_for_liquidations(real_candle, handle)
 
 
-def _check_for_liquidations(candle: np.ndarray, exchange: str, symbol: str) -> None:
-    p: Position = selectors.get_position(exchange, symbol)
+def _check_for_liquidations(candle: np.ndarray, handle: RouteHandle) -> None:
+    p: Position = handle.position
 
     if not p:
         return
@@ -835,8 +862,8 @@ def _check_for_liquidations(candle: np.ndarray, exchange: str, symbol: str) -> N
         # create the market order that is used as the liquidation order
         order = Order({
             'id': jh.generate_unique_id(),
-            'symbol': symbol,
-            'exchange': exchange,
+            'symbol': handle.symbol,
+            'exchange': handle.exchange,
             'side': closing_order_side,
             'type': order_types.MARKET,
             'reduce_only': True,
@@ -911,18 +938,33 @@ def _skip_simulator(
     # add initial balance
     save_daily_portfolio_balance(is_initial=True)
 
+    route_handles = _get_route_handles(candles)
+    bigger_timeframes = _bigger_timeframes()
+    debug_trading_candles = jh.is_debuggable('trading_candles')
+
     candles_step = _calculate_minimum_candle_step()
+    signal_minutes = _precompute_signals(candles, candles_pipelines, route_handles, length, candles_step)
+    last_step_index = (length - 1) // candles_step * candles_step
     progressbar = Progressbar(length, step=candles_step)
     last_update_time = None
-    for i in range(0, length, candles_step):
+    i = 0
+    while i < length:
+        indicator_cache.clear()
+
+        if signal_minutes is not None:
+            i = _skip_idle_steps(
+                signal_minutes, candles, i, candles_step, last_step_index, route_handles, bigger_timeframes,
+                progressbar
+            )
+
         # update time moved to _simulate_price_change_effect__multiple_candles
         # store.app.time = first_candles_set[i][0] + (60_000 * candles_step)
-        _simulate_new_candles(candles, candles_pipelines, i, candles_step)
+        _simulate_new_candles(candles, candles_pipelines, i, candles_step, route_handles, bigger_timeframes)
 
         last_update_time = _update_progress_bar(progressbar, run_silently, i, candles_step,
                                                 last_update_time=last_update_time)
 
-        _execute_routes(i, candles_step)
+        _execute_routes(i, candles_step, debug_trading_candles)
 
         # now check to see if there's any MARKET orders waiting to be executed
         _execute_market_orders()
@@ -930,6 +972,8 @@ def _skip_simulator(
         if i != 0 and i % 1440 == 0:
             save_daily_portfolio_balance()
 
+        i += candles_step
+
     _finish_progress_bar(progressbar, run_silently)
 
     execution_duration = 0
@@ -962,6 +1006,121 @@ def _skip_simulator(
     return result
 
 
+def _precompute_signals(
+        candles: dict,
+        candles_pipelines: Dict[str, BaseCandlesPipeline],
+        route_handles: List[Tuple[str, RouteHandle]],
+        length: int,
+        candles_step: int,
+) -> Optional[np.ndarray]:
+    """
+    Signal precompute mode: if the strategy of every route implements precompute_signals(),
+    returns the sorted simulation minutes (the `i + candles_step` of a step) at the end of
+    which a route is executed with a long or short signal. Returns None otherwise (or when
+    a candles pipeline is used), in which case every step is simulated.
+    """
+    if any(p is not None for p in candles_pipelines.values()):
+        return None
+
+    # the price gaps at the first candle of each step are fixed as the simulation goes;
+    # fix them all now, so the signals are computed on the same candles
+    step_starts = np.arange(candles_step, length, candles_step)
+    for j, _ in route_handles:
+        one_minute_candles = candles[j]['candles']
+        previous_close = one_minute_candles[step_starts - 1, 2]
+        one_minute_candles[step_starts, 3] = np.maximum(one_minute_candles[step_starts, 3], previous_close)
+        one_minute_candles[step_starts, 4] = np.minimum(one_minute_candles[step_starts, 4], previous_close)
+        one_minute_candles[step_starts, 1] = previous_close
+
+    minutes = []
+    for r in router.routes:
+        warmup_candles = r.handle.candle_storages[r.timeframe][:]
+        route_candles = np.concatenate((
+            warmup_candles,
+            generate_candles_from_one_minutes(r.timeframe, candles[r.handle.key]['candles'][:length])
+        ))
+        signals = r.strategy.precompute_signals(route_candles)
+        if signals is None:
+            return None
+
+        has_signal = np.zeros(len(route_candles), dtype=bool)
+        for side in ('long', 'short'):
+            if side not in signals:
+                continue
+            side_signals = np.asarray(signals[side], dtype=bool)
+            if side_signals.shape != has_signal.shape:
+                raise exceptions.InvalidStrategy(
+                    f'precompute_signals() of {type(r.strategy).__name__} must return one "{side}" signal per candle '
+                    f'({len(route_candles)}); got an array of shape {side_signals.shape}.'
+                )
+            has_signal |= side_signals
+
+        # the route is executed at the end of the minute its candle closes
+        bars = np.flatnonzero(has_signal[len(warmup_candles):])
+        minutes.append((bars + 1) * TIMEFRAME_TO_ONE_MINUTES[r.timeframe])
+
+    return np.unique(np.concatenate(minutes)) if minutes else None
+
+
+def _skip_idle_steps(
+        signal_minutes: np.ndarray,
+        candles: dict,
+        candle_index: int,
+        candles_step: int,
+        last_step_index: int,
+        route_handles: List[Tuple[str, RouteHandle]],
+        bigger_timeframes: List[Tuple[str, int]],
+        progressbar: Progressbar,
+) -> int:
+    """
+    While every route is flat and has no active orders, nothing can happen before the next
+    step with a signal: its strategies would only return False from should_long() and
+    should_short(). Adds the candles of the steps until then at once (and what the skipped
+    steps would have recorded) and returns the index of the next step to simulate.
+    """
+    i = candle_index
+    if store.orders.count_all_active_orders() or store.orders.to_execute:
+        return i
+    for _, handle in route_handles:
+        if handle.position is not None and handle.position.is_open:
+            return i
+
+    n = np.searchsorted(signal_minutes, i + candles_step)
+    target = last_step_index if n == len(signal_minutes) else min(int(signal_minutes[n]) - candles_step, last_step_index)
+    if target <= i:
+        return i
+
+    one_minute_candles = None
+    for j, handle in route_handles:
+        one_minute_candles = candles[j]['candles']
+        handle.add_multiple_1m_candles(one_minute_candles[i:target])
+
+        for timeframe, count in bigger_timeframes:
+            # the candles that complete within the skipped steps
+            first_end = (i // count + 1) * count
+            handle.add_multiple_candles(
+                generate_candles_from_one_minutes(timeframe, one_minute_candles[first_end - count:target]),
+                timeframe
+            )
+
+        if handle.position is not None:
+            handle.position.current_price = one_minute_candles[target - 1, 2]
+
+    for r in router.routes:
+        count = TIMEFRAME_TO_ONE_MINUTES[r.timeframe]
+        r.strategy.index += target // count - i // count
+
+    # daily balances of the skipped steps; nothing is open, so they're all the balance
+    for day in range(max(1440, -(-i // 1440) * 1440), target, 1440):
+        if day % candles_step == 0:
+            store.app.time = one_minute_candles[day + candles_step - 1, 0] + 60_000
+            save_daily_portfolio_balance()
+
+    store.app.time = one_minute_candles[target - 1, 0] + 60_000
+    progressbar.update((target - i) // candles_step)
+    return target
+
+
 def _calculate_minimum_candle_step():
     """
     Calculates the minimum step for update candles that will allow simple updates on the simulator.
@@ -993,10 +1152,17 @@ timeframe_to_one_minutes = {
     timeframes.WEEK_1: 60 * 24 * 7,
     timeframes.MONTH_1: 60 * 24 * 30,
 }
-def _simulate_new_candles(candles: dict, candles_pipelines: Dict[str, BaseCandlesPipeline], candle_index: int, candles_step: int) -> None:
+def _simulate_new_candles(
+        candles: dict,
+        candles_pipelines: Dict[str, BaseCandlesPipeline],
+        candle_index: int,
+        candles_step: int,
+        route_handles: List[Tuple[str, RouteHandle]],
+        bigger_timeframes: List[Tuple[str, int]]
+) -> None:
     i = candle_index
     # add candles
-    for j in candles:
+    for j, handle in route_handles:
         candles_pipeline = candles_pipelines[j]
         short_candles = get_candles_from_pipeline(candles_pipeline, candles[j]['candles'], i, candles_step)
         candles[j]['candles'][i:i+candles_step] = short_candles
@@ -1006,21 +1172,10 @@ def _simulate_new_candles(candles: dict, candles_pipelines: Dict[str, BaseCandle
             short_candles[0] = _get_fixed_jumped_candle(
                 previous_short_candles, short_candles[0]
             )
-        exchange = candles[j]["exchange"]
-        symbol = candles[j]["symbol"]
-
-        _simulate_price_change_effect_multiple_candles(
-            short_candles, exchange, symbol
-        )
+        _simulate_price_change_effect_multiple_candles(short_candles, handle)
 
         # generate and add candles for bigger timeframes
-        for timeframe in config["app"]["considering_timeframes"]:
-            # for 1m, no work is needed
-            if timeframe == "1m":
-                continue
-
-            count = TIMEFRAME_TO_ONE_MINUTES[timeframe]
-
+        for timeframe, count in bigger_timeframes:
             if (i + candles_step) % count == 0:
                 generated_candle = generate_candle_from_one_minutes(
                     timeframe,
@@ -1028,18 +1183,11 @@ def _simulate_new_candles(candles: dict, candles_pipelines: Dict[str, BaseCandle
                     i - count + candles_step: i + candles_step],
                 )
 
-                store.candles.add_candle(
-                    generated_candle,
-                    exchange,
-                    symbol,
-                    timeframe,
-                    with_execution=False,
-                    with_generation=False,
-                )
+                handle.add_candle(generated_candle, timeframe)
 
 
 def _simulate_price_change_effect_multiple_candles(
-        short_timeframes_candles: np.ndarray, exchange: str, symbol: str
+        short_timeframes_candles: np.ndarray, handle: RouteHandle
 ) -> None:
     real_candle = np.array(
         [
@@ -1051,7 +1199,7 @@ def _simulate_price_change_effect_multiple_candles(
             short_timeframes_candles[:, 5].sum(),
         ]
     )
-    executing_orders = _get_executing_orders(exchange, symbol, real_candle)
+    executing_orders = _get_executing_orders(handle, real_candle)
     if len(executing_orders) > 0:
         if len(executing_orders) > 1:
             executing_orders = _sort_execution_orders(executing_orders, short_timeframes_candles)
@@ -1077,21 +1225,14 @@ def _simulate_price_change_effect_multiple_candles(
                             storable_temp_candle, current_temp_candle = split_candle(
                                 current_temp_candle, order.price
                             )
-                            _update_all_routes_a_partial_candle(
-                                exchange,
-                                symbol,
-                                storable_temp_candle,
-                            )
-                            p = selectors.get_position(exchange, symbol)
-                            p.current_price = storable_temp_candle[2]
+                            _update_all_routes_a_partial_candle(handle, storable_temp_candle)
+                            handle.position.current_price = storable_temp_candle[2]
 
                             is_executed_order = True
 
                             store.app.time = storable_temp_candle[0] + 60_000
                             order.execute()
-                            executing_orders = _get_executing_orders(
-                                exchange, symbol, real_candle
-                            )
+                            executing_orders = _get_executing_orders(handle, real_candle)
 
                             # break from the for loop, we'll try again inside the while
                             # loop with the new current_temp_candle
@@ -1101,75 +1242,46 @@ def _simulate_price_change_effect_multiple_candles(
 
                 if not is_executed_order:
                     # add/update the real_candle to the store so we can move on
-                    store.candles.add_candle(
-                        short_timeframes_candles[i].copy(),
-                        exchange,
-                        symbol,
-                        "1m",
-                        with_execution=False,
-                        with_generation=False,
-                    )
-                    p = selectors.get_position(exchange, symbol)
+                    handle.add_candle(short_timeframes_candles[i].copy())
+                    p = handle.position
                     if p:
                         p.current_price = current_temp_candle[2]
                     break
 
-    store.candles.add_multiple_1m_candles(
-        short_timeframes_candles,
-        exchange,
-        symbol,
-    )
+    handle.add_multiple_1m_candles(short_timeframes_candles)
     store.app.time = real_candle[0] + (60_000 * len(short_timeframes_candles))
-    _check_for_liquidations(real_candle, exchange, symbol)
+    _check_for_liquidations(real_candle, handle)
 
-    p = selectors.get_position(exchange, symbol)
+    p = handle.position
     if p:
         p.current_price = short_timeframes_candles[-1, 2]
 
 
 def _update_all_routes_a_partial_candle(
-        exchange: str,
-        symbol: str,
+        handle: RouteHandle,
         storable_temp_candle: np.ndarray,
 ) -> None:
     """
     This function get called when an order is getting executed you need to update the other timeframe how their last
     candles looks like
     """
-    store.candles.add_candle(
-        storable_temp_candle,
-        exchange,
-        symbol,
-        "1m",
-        with_execution=False,
-        with_generation=False,
-    )
+    handle.add_candle(storable_temp_candle)
 
-    for route in router.all_formatted_routes:
-        timeframe = route['timeframe']
-        if route['exchange'] != exchange or route['symbol'] != symbol:
-            continue
+    for timeframe in handle.route_timeframes:
         if timeframe == '1m':
             continue
         tf_minutes = TIMEFRAME_TO_ONE_MINUTES[timeframe]
         number_of_needed_candles = int(storable_temp_candle[0] % (tf_minutes * 60_000) // 60000) + 1
-        candles_1m = store.candles.get_candles(exchange, symbol, '1m')[-number_of_needed_candles:]
+        candles_1m = handle.get_candles('1m')[-number_of_needed_candles:]
         generated_candle = generate_candle_from_one_minutes(
             timeframe,
             candles_1m,
             accept_forming_candles=True
         )
-        store.candles.add_candle(
-            generated_candle,
-            exchange,
-            symbol,
-            timeframe,
-            with_execution=False,
-            with_generation=False,
-        )
+        handle.add_candle(generated_candle, timeframe)
 
 
-def _execute_routes(candle_index: int, candles_step: int) -> None:
+def _execute_routes(candle_index: int, candles_step: int, debug_trading_candles: bool) -> None:
     # now that all new generated candles are ready, execute
     for r in router.routes:
         count = TIMEFRAME_TO_ONE_MINUTES[r.timeframe]
@@ -1178,25 +1290,19 @@ def _execute_routes(candle_index: int, candles_step: int) -> None:
             r.strategy._execute()
         elif (candle_index + candles_step) % count == 0:
             # print candle
-            if jh.is_debuggable("trading_candles"):
-                print_candle(
-                    store.candles.get_current_candle(
-                        r.exchange, r.symbol, r.timeframe
-                    ),
-                    False,
-                    r.symbol,
-                )
+            if debug_trading_candles:
+                print_candle(r.handle.get_current_candle(), False, r.symbol)
             r.strategy._execute()
 
-        store.orders.update_active_orders(r.exchange, r.symbol)
+        r.handle.update_active_orders()
 
 
 def _execute_market_orders():
     store.orders.execute_pending_market_orders()
 
 
-def _get_executing_orders(exchange, symbol, real_candle):
-    orders = store.orders.get_active_orders(exchange, symbol)
+def _get_executing_orders(handle: RouteHandle, real_candle: np.ndarray):
+    orders = handle.active_orders
     return [
         order
         for order in orders
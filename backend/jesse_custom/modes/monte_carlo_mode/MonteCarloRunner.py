@@ -375,6 +375,8 @@ class MonteCarloRunner:
                         'total': self.num_scenarios,
                         'estimated_remaining_seconds': estimated_remaining
                     })
+                    # keep the session's progress current while scenarios stream in
+                    update_trades_session_progress(self.trades_session_id, completed_count)
                     
                     last_update_time = current_time
         
@@ -443,6 +445,8 @@ class MonteCarloRunner:
                         'total': self.num_scenarios,
                         'estimated_remaining_seconds': estimated_remaining
                     })
+                    # keep the session's progress current while scenarios stream in
+                    update_candles_session_progress(self.candles_session_id, completed_count)
                     
                     last_update_time = current_time
         
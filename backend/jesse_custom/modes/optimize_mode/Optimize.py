@@ -20,12 +20,12 @@ from jesse.models.OptimizationSession import (
 from jesse.modes.optimize_mode.fitness import get_fitness
 from jesse.routes import router
 from jesse.services.progressbar import Progressbar
+from jesse.services.ray_scheduler import RayScheduler
 from jesse.services.redis import is_process_active, sync_publish
 
-# Define a Ray-compatible remote function
+# Runs on the Ray workers (see RayScheduler)
 
 
-@ray.remote
 def ray_evaluate_trial(
     user_config,
     formatted_routes,
@@ -79,6 +79,81 @@ def ray_evaluate_trial(
         logger.log_optimize_mode(f"Ray Trial {trial_number} failed with exception: {str(e)}")
         raise
 
+
+def generate_trial_params(strategy_hp: list) -> dict:
+    """Generate random hyperparameters for a trial"""
+    hp = {}
+    for param in strategy_hp:
+        param_name = str(param['name'])
+        param_type = param['type']
+        # Convert to string whether input is type class or string
+        if isinstance(param_type, type):
+            param_type = param_type.__name__
+        else:
+            # Remove quotes if they exist
+            param_type = param_type.strip("'").strip('"')
+
+        if param_type == 'int':
+            if 'step' in param and param['step'] is not None:
+                steps = (param['max'] - param['min']) // param['step'] + 1
+                value = param['min'] + np.random.randint(0, steps) * param['step']
+            else:
+                value = np.random.randint(param['min'], param['max'] + 1)
+            hp[param_name] = value
+        elif param_type == 'float':
+            if 'step' in param and param['step'] is not None:
+                steps = int((param['max'] - param['min']) / param['step']) + 1
+                value = param['min'] + np.random.randint(0, steps) * param['step']
+            else:
+                value = np.random.uniform(param['min'], param['max'])
+            hp[param_name] = value
+        elif param_type == 'categorical':
+            options = param['options']
+            hp[param_name] = options[np.random.randint(0, len(options))]
+        else:
+            raise ValueError(f"Unsupported hyperparameter type: {param_type}")
+
+    return hp
+
+
+def best_trial_info(trial_number, params, score, training_metrics, testing_metrics) -> dict:
+    """The entry of a trial in a session's best trials"""
+    # Convert parameters to DNA (base64)
+    params_str = json.dumps(params, sort_keys=True)
+    dna = base64.b64encode(params_str.encode()).decode()
+
+    return {
+        'trial': trial_number,
+        'params': params,
+        'fitness': round(score, 4),
+        'value': score,  # Used for sorting, not sent to frontend
+        'dna': dna,
+        'training_metrics': training_metrics,
+        'testing_metrics': testing_metrics
+    }
+
+
+def start_termination_check(session_id: str):
+    """
+    Starts a periodic check that stops the session once the user ends it; returns the
+    Timeloop running it
+    """
+    client_id = jh.get_session_id()
+    from timeloop import Timeloop
+    tl = Timeloop()
+
+    @tl.job(interval=timedelta(seconds=1))
+    def check_for_termination():
+        if is_process_active(client_id) is False:
+            # Update session status to 'stopped' in the database
+            if get_optimization_session(session_id)['status'] != 'terminated':
+                update_optimization_session_status(session_id, 'stopped')
+            raise exceptions.Termination
+    tl.start()
+
+    return tl
+
+
 # Optimizer class that uses Ray for hyperparameter optimization
 
 
@@ -169,18 +244,7 @@ class Optimizer:
                 ray.init(num_cpus=1, ignore_reinit_error=True)
 
         # Setup a periodic termination check in case the user ends the session
-        client_id = jh.get_session_id()
-        from timeloop import Timeloop
-        self.tl = Timeloop()
-
-        @self.tl.job(interval=timedelta(seconds=1))
-        def check_for_termination():
-            if is_process_active(client_id) is False:
-                # Update session status to 'stopped' in the database
-                if get_optimization_session(self.session_id)['status'] != 'terminated':
-                    update_optimization_session_status(self.session_id, 'stopped')
-                raise exceptions.Termination
-        self.tl.start()
+        self.tl = start_termination_check(self.session_id)
 
         # Load existing trials from the Optuna study
         self._load_study_trials()
@@ -235,38 +299,14 @@ class Optimizer:
 
     def _generate_trial_params(self):
         """Generate random hyperparameters for a trial"""
-        hp = {}
-        for param in self.strategy_hp:
-            param_name = str(param['name'])
-            param_type = param['type']
-            # Convert to string whether input is type class or string
-            if isinstance(param_type, type):
-                param_type = param_type.__name__
-            else:
-                # Remove quotes if they exist
-                param_type = param_type.strip("'").strip('"')
-
-            if param_type == 'int':
-                if 'step' in param and param['step'] is not None:
-                    steps = (param['max'] - param['min']) // param['step'] + 1
-                    value = param['min'] + np.random.randint(0, steps) * param['step']
-                else:
-                    value = np.random.randint(param['min'], param['max'] + 1)
-                hp[param_name] = value
-            elif param_type == 'float':
-                if 'step' in param and param['step'] is not None:
-                    steps = int((param['max'] - param['min']) / param['step']) + 1
-                    value = param['min'] + np.random.randint(0, steps) * param['step']
-                else:
-                    value = np.random.uniform(param['min'], param['max'])
-                hp[param_name] = value
-            elif param_type == 'categorical':
-                options = param['options']
-                hp[param_name] = options[np.random.randint(0, len(options))]
-            else:
-                raise ValueError(f"Unsupported hyperparameter type: {param_type}")
+        return generate_trial_params(self.strategy_hp)
 
-        return hp
+    def _trials_to_run(self):
+        """Arguments of the remaining trials, generated as the scheduler submits them"""
+        while self.trial_counter < self.n_trials:
+            trial_number = self.trial_counter
+            self.trial_counter += 1
+            yield {'hp': self._generate_trial_params(), 'trial_number': trial_number}
 
     def _create_optuna_trial(self, trial_number, params, score, training_metrics, testing_metrics):
         """Create and store an Optuna trial for persistence"""
@@ -365,20 +405,8 @@ class Optimizer:
 
         # Add to best trials if the score is valid
         if score > 0.0001:
-            # Convert parameters to DNA (base64)
-            params_str = json.dumps(params, sort_keys=True)
-            dna = base64.b64encode(params_str.encode()).decode()
-
             # Create trial info dict
-            current_trial_info = {
-                'trial': trial_number,
-                'params': params,
-                'fitness': round(score, 4),
-                'value': score,  # Used for sorting, not sent to frontend
-                'dna': dna,
-                'training_metrics': training_metrics,
-                'testing_metrics': testing_metrics
-            }
+            current_trial_info = best_trial_info(trial_number, params, score, training_metrics, testing_metrics)
 
             # Debug log trial metrics
             if jh.is_debugging():
@@ -519,76 +547,56 @@ class Optimizer:
             best_trial_params = None
 
         try:
-            # Maximum number of active workers (slightly higher than CPU cores to keep CPUs busy)
-            max_workers = min(self.cpu_cores * 2, self.n_trials - self.completed_trials)
-
-            # Dictionary to keep track of active workers
-            active_refs = {}
-            # Begin optimization loop
-            while self.completed_trials < self.n_trials:
-                if self.completed_trials == 0:
-                    update_optimization_session_trials(
-                        self.session_id,
-                        0,
-                        [],
-                        [],
-                        self.n_trials
-                    )
-                # Launch new trials if we have capacity
-                while len(active_refs) < max_workers and self.trial_counter < self.n_trials:
-                    # Generate parameters for this trial
-                    hp = self._generate_trial_params()
-
-                    # Launch the trial evaluation
-                    ref = ray_evaluate_trial.options(num_cpus=1).remote(
-                        self.user_config,
-                        router.formatted_routes,
-                        router.formatted_data_routes,
-                        self.strategy_hp,
-                        hp,
-                        self.training_warmup_candles,
-                        self.training_candles,
-                        self.testing_warmup_candles,
-                        self.testing_candles,
-                        self.optimal_total,
-                        self.fast_mode,
-                        self.trial_counter
-                    )
-
-                    # Store the reference
-                    active_refs[ref] = self.trial_counter
-                    self.trial_counter += 1
-
-                # No more workers to launch, wait for results
-                if not active_refs:
-                    break
+            # Slightly more trials in flight than CPU cores to keep CPUs busy, as long as memory allows
+            scheduler = RayScheduler(max_in_flight=self.cpu_cores * 2)
 
-                # Wait for any trial to complete (with timeout to ensure responsiveness)
-                done_refs, _ = ray.wait(list(active_refs.keys()), num_returns=1, timeout=0.5)
-
-                # Process completed trials
-                for ref in done_refs:
-                    trial_number = active_refs.pop(ref)
-                    try:
-                        result = ray.get(ref)
-                        # Process the result
-                        self._process_trial_result(result)
-
-                        # Update best trial if better
-                        if result['score'] > best_trial_value:
-                            best_trial_value = result['score']
-                            best_trial_params = result['params']
-                    except ray.exceptions.RayTaskError as e:
-                        # Check if this is a RouteNotFound error converted to RuntimeError
-                        if hasattr(e, 'cause') and isinstance(e.cause, RuntimeError) and 'RouteNotFound:' in str(e.cause):
-                            raise e.cause
-                        else:
-                            jh.debug(f'Ray task error for trial {trial_number}: {e}')
-                            original_exception = e.cause
-                            raise
-                    except Exception as e:
-                        jh.debug(f'Exception raised in the ray method for trial {trial_number}: {e}')
-                        raise e
+            if self.completed_trials == 0:
+                update_optimization_session_trials(
+                    self.session_id,
+                    0,
+                    [],
+                    [],
+                    self.n_trials
+                )
+
+            # Process trials as they complete
+            for task in scheduler.run(
+                ray_evaluate_trial,
+                self._trials_to_run(),
+                user_config=self.user_config,
+                formatted_routes=router.formatted_routes,
+                formatted_data_routes=router.formatted_data_routes,
+                strategy_hp=self.strategy_hp,
+                training_warmup_candles=self.training_warmup_candles,
+                training_candles=self.training_candles,
+                testing_warmup_candles=self.testing_warmup_candles,
+                testing_candles=self.testing_candles,
+                optimal_total=self.optimal_total,
+                fast_mode=self.fast_mode
+            ):
+                trial_number = task.kwargs['trial_number']
+                try:
+                    result = task.result()
+                    # Process the result
+                    self._process_trial_result(result)
+
+                    # Update best trial if better
+                    if result['score'] > best_trial_value:
+                        best_trial_value = result['score']
+                        best_trial_params = result['params']
+                except ray.exceptions.RayTaskError as e:
+                    # Check if this is a RouteNotFound error converted to RuntimeError
+                    if hasattr(e, 'cause') and isinstance(e.cause, RuntimeError) and 'RouteNotFound:' in str(e.cause):
+                        raise e.cause
+                    else:
+                        jh.debug(f'Ray task error for trial {trial_number}: {e}')
+                        original_exception = e.cause
+                        raise
+                except Exception as e:
+                    jh.debug(f'Exception raised in the ray method for trial {trial_number}: {e}')
+                    raise e
+
+            logger.log_optimize_mode(f"Trials scheduling stats: {scheduler.stats()}")
 
             # Publish any remaining data in the buffer
             if self.objective_curve_buffer:
@@ -0,0 +1,485 @@
+import json
+import traceback
+from collections import Counter
+from multiprocessing import cpu_count
+from typing import List
+
+import jesse.helpers as jh
+import jesse.services.logger as logger
+import numpy as np
+import ray
+from jesse import exceptions
+from jesse.models.OptimizationSession import (
+    add_session_exception,
+    get_optimization_session_by_id,
+    update_optimization_session_status,
+    update_optimization_session_trials,
+)
+from jesse.modes.optimize_mode.fitness import _formatted_inputs_for_isolated_backtest
+from jesse.modes.optimize_mode.Optimize import (
+    best_trial_info,
+    generate_trial_params,
+    ray_evaluate_trial,
+    start_termination_check,
+)
+from jesse.research.backtest import _isolated_backtest as isolated_backtest
+from jesse.routes import router
+from jesse.services.progressbar import Progressbar
+from jesse.services.ray_scheduler import RayScheduler
+from jesse.services.redis import sync_publish
+
+ONE_DAY_MINUTES = 1440
+
+
+def generate_folds(length: int, folds_count: int, training_ratio: float = 3, anchored: bool = False) -> List[dict]:
+    """
+    Slices `length` 1m candles into walk-forward folds. Each fold's testing window is
+    right after its training window, and testing windows follow each other without gaps.
+    Windows are whole days.
+
+    With `anchored=True` every training window starts at the first candle (expanding
+    windows); otherwise it has a fixed length of `training_ratio` testing windows (rolling).
+    """
+    if folds_count < 1:
+        raise ValueError('folds_count must be at least 1')
+    if training_ratio <= 0:
+        raise ValueError('training_ratio must be greater than 0')
+
+    testing_length = int(length / (folds_count + training_ratio)) // ONE_DAY_MINUTES * ONE_DAY_MINUTES
+    if testing_length == 0:
+        raise ValueError(
+            f'Not enough candles for {folds_count} folds with a training ratio of {training_ratio}. '
+            f'Each testing window must be at least one day long.'
+        )
+    training_length = int(testing_length * training_ratio) // ONE_DAY_MINUTES * ONE_DAY_MINUTES
+
+    folds = []
+    for i in range(folds_count):
+        testing_start = training_length + i * testing_length
+        folds.append({
+            'index': i,
+            'training_start': 0 if anchored else testing_start - training_length,
+            'training_finish': testing_start,
+            'testing_start': testing_start,
+            'testing_finish': testing_start + testing_length,
+        })
+    return folds
+
+
+def _slice_candles(candles: dict, warmup_candles: dict, start: int, finish: int) -> tuple:
+    """
+    Returns the candles between the `start` and `finish` indexes and the warmup candles
+    that precede them (the last part of the original warmup candles followed by the
+    candles before `start`).
+    """
+    sliced = {}
+    sliced_warmup = {}
+    for key, c in candles.items():
+        sliced[key] = {'exchange': c['exchange'], 'symbol': c['symbol'], 'candles': c['candles'][start:finish]}
+
+        if warmup_candles:
+            warmup_arr = warmup_candles[key]['candles']
+            if start == 0:
+                arr = warmup_arr
+            else:
+                arr = np.concatenate((warmup_arr, c['candles'][:start]))[-len(warmup_arr):]
+            sliced_warmup[key] = {'exchange': c['exchange'], 'symbol': c['symbol'], 'candles': arr}
+
+    return sliced, (sliced_warmup if warmup_candles else None)
+
+
+def ray_evaluate_fold_trial(
+    user_config,
+    formatted_routes,
+    formatted_data_routes,
+    strategy_hp,
+    hp,
+    candles,
+    warmup_candles,
+    fold,
+    optimal_total,
+    fast_mode,
+    trial_number
+):
+    """
+    Evaluates a trial on one fold on a Ray worker. The full candles are shared through
+    Ray's object store; each task only slices out its fold's windows and evaluates them
+    the way Optimizer does (see ray_evaluate_trial()).
+    """
+    training_candles, training_warmup_candles = _slice_candles(
+        candles, warmup_candles, fold['training_start'], fold['training_finish']
+    )
+    testing_candles, testing_warmup_candles = _slice_candles(
+        candles, warmup_candles, fold['testing_start'], fold['testing_finish']
+    )
+    result = ray_evaluate_trial(
+        user_config,
+        formatted_routes,
+        formatted_data_routes,
+        strategy_hp,
+        hp,
+        training_warmup_candles,
+        training_candles,
+        testing_warmup_candles,
+        testing_candles,
+        optimal_total,
+        fast_mode,
+        trial_number
+    )
+    result['fold'] = fold['index']
+    return result
+
+
+def ray_evaluate_out_of_sample(
+    user_config,
+    formatted_routes,
+    formatted_data_routes,
+    hp,
+    candles,
+    warmup_candles,
+    fold,
+    fast_mode
+):
+    """
+    Backtests a fold's best hyperparameters on its testing window on a Ray worker.
+    """
+    testing_candles, testing_warmup_candles = _slice_candles(
+        candles, warmup_candles, fold['testing_start'], fold['testing_finish']
+    )
+    result = isolated_backtest(
+        _formatted_inputs_for_isolated_backtest(user_config, formatted_routes),
+        formatted_routes,
+        formatted_data_routes,
+        candles=testing_candles,
+        warmup_candles=testing_warmup_candles,
+        hyperparameters=hp,
+        fast_mode=fast_mode,
+        generate_equity_curve=True,
+    )
+
+    daily_balance = None
+    if result.get('equity_curve'):
+        portfolio = next(c for c in result['equity_curve'] if c['name'] == 'Portfolio')
+        daily_balance = [d['value'] for d in portfolio['data']]
+
+    return {
+        'fold': fold['index'],
+        'metrics': result['metrics'],
+        'daily_balance': daily_balance,
+    }
+
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward optimization: the candles are sliced into folds (see generate_folds()) and
+    the same random search as Optimizer runs on each fold's training window. The best
+    hyperparameters of each fold are then backtested on the fold's (unseen) testing window,
+    and those out-of-sample results are chained into one equity curve.
+
+    Trials of all folds are scheduled from one queue by a RayScheduler, so no core sits
+    idle waiting for a fold to finish; a fold's out-of-sample run is submitted ahead of the
+    remaining trials as soon as its last trial completes. The candles are put into Ray's
+    object store once and shared by all folds, and Ray keeps reusing the same worker processes.
+
+    Progress is stored in the session's OptimizationSession row: the best trial of each fold
+    goes into best_trials (with the fold's windows and, once it has run, its out-of-sample
+    result). Resuming a session skips the folds whose out-of-sample run had finished.
+    """
+
+    def __init__(
+            self,
+            session_id: str,
+            user_config: dict,
+            warmup_candles: dict,
+            candles: dict,
+            fast_mode: bool,
+            optimal_total: int,
+            cpu_cores: int,
+            folds_count: int,
+            training_ratio: float = 3,
+            anchored: bool = False,
+            trials_per_fold: int = None,
+    ) -> None:
+        self.session_id = session_id
+        self.user_config = user_config
+        self.warmup_candles = warmup_candles
+        self.candles = candles
+        self.fast_mode = fast_mode
+        self.optimal_total = optimal_total
+        self.anchored = anchored
+
+        strategy_class = jh.get_strategy_class(router.routes[0].strategy_name)
+        self.strategy_hp = strategy_class.hyperparameters(None)
+        if not self.strategy_hp:
+            update_optimization_session_status(self.session_id, 'stopped')
+            raise exceptions.InvalidStrategy('Targeted strategy does not implement a valid hyperparameters() method.')
+
+        if cpu_cores < 1:
+            raise ValueError('cpu_cores must be an integer value greater than 0.')
+        self.cpu_cores = min(cpu_cores, cpu_count())
+
+        first_key = next(iter(candles))
+        self.starting_time = int(candles[first_key]['candles'][0][0])
+        self.folds = generate_folds(len(candles[first_key]['candles']), folds_count, training_ratio, anchored)
+
+        if trials_per_fold is None:
+            trials_per_fold = len(self.strategy_hp) * jh.get_config('env.optimization.trials', 200)
+        self.trials_per_fold = trials_per_fold
+
+        # the best trial result and the out-of-sample result of each fold
+        self.best = {fold['index']: None for fold in self.folds}
+        self.out_of_sample = {}
+        # trials and out-of-sample runs
+        self.n_tasks = self.trials_per_fold * len(self.folds) + len(self.folds)
+        self.completed_tasks = 0
+        self.progressbar = Progressbar(self.n_tasks)
+
+        # Setup a periodic termination check in case the user ends the session
+        self.tl = start_termination_check(self.session_id)
+
+        self._load_session_folds()
+
+    def _load_session_folds(self) -> None:
+        """Restores the folds that a previous run of this session finished"""
+        session_data = get_optimization_session_by_id(self.session_id)
+        if not session_data or not session_data.best_trials:
+            return
+
+        windows = ('training_start', 'training_finish', 'testing_start', 'testing_finish')
+        for entry in json.loads(session_data.best_trials):
+            if entry.get('out_of_sample') is None or entry.get('fold') not in self.best:
+                continue
+            fold = self.folds[entry['fold']]
+            # the candles or the fold settings changed since
+            if any(entry.get(k) != fold[k] for k in windows):
+                continue
+
+            self.best[fold['index']] = {
+                'fold': fold['index'],
+                'trial_number': entry['trial'],
+                'score': entry['value'],
+                'params': entry['params'],
+                'training_metrics': entry['training_metrics'],
+                'testing_metrics': entry['testing_metrics'],
+            }
+            self.out_of_sample[fold['index']] = entry['out_of_sample']
+            self.completed_tasks += self.trials_per_fold + 1
+
+        if self.out_of_sample:
+            logger.log_optimize_mode(f"Loaded {len(self.out_of_sample)} completed folds from previous session")
+            self.progressbar.index = self.completed_tasks
+
+    def _save_session(self) -> None:
+        best_trials = []
+        for fold in self.folds:
+            best = self.best[fold['index']]
+            if best is None:
+                continue
+            best_trials.append({
+                **best_trial_info(
+                    best['trial_number'], best['params'], best['score'], best['training_metrics'], best['testing_metrics']
+                ),
+                'fold': fold['index'],
+                'training_start': fold['training_start'],
+                'training_finish': fold['training_finish'],
+                'testing_start': fold['testing_start'],
+                'testing_finish': fold['testing_finish'],
+                'out_of_sample': self.out_of_sample.get(fold['index']),
+            })
+
+        update_optimization_session_trials(
+            self.session_id,
+            self.completed_tasks,
+            best_trials,
+            [],
+            self.n_tasks
+        )
+
+    def run(self) -> dict:
+        if not ray.is_initialized():
+            ray.init(num_cpus=self.cpu_cores, ignore_reinit_error=True)
+        logger.log_optimize_mode(
+            f"Walk-forward optimization started: {len(self.folds)} {'anchored' if self.anchored else 'rolling'} folds, "
+            f"{self.trials_per_fold} trials per fold, {self.cpu_cores} CPU cores"
+        )
+
+        try:
+            self._save_session()
+            fold_results = self._run_folds()
+            self._save_session()
+            update_optimization_session_status(self.session_id, 'finished')
+        except exceptions.Termination:
+            logger.log_optimize_mode("Walk-forward optimization terminated by user")
+            update_optimization_session_status(self.session_id, 'stopped')
+            raise
+        except Exception as e:
+            logger.log_optimize_mode(f"Error during walk-forward optimization: {e}")
+            update_optimization_session_status(self.session_id, 'stopped')
+            add_session_exception(self.session_id, str(e), str(traceback.format_exc()))
+            raise
+        finally:
+            ray.shutdown()
+
+        return self._report(fold_results)
+
+    def _run_folds(self) -> List[dict]:
+        folds = [fold for fold in self.folds if fold['index'] not in self.out_of_sample]
+        # (fold, trial_number) pairs in the order they are submitted
+        pending_trials = [(fold, t) for fold in folds for t in range(self.trials_per_fold)]
+        remaining_trials = {fold['index']: self.trials_per_fold for fold in folds}
+        pending_out_of_sample = []
+
+        def tasks_to_run():
+            submitted_out_of_sample = 0
+            while submitted_out_of_sample < len(folds):
+                # out-of-sample runs go first; they unblock the final report
+                if pending_out_of_sample:
+                    fold = pending_out_of_sample.pop(0)
+                    submitted_out_of_sample += 1
+                    yield ray_evaluate_out_of_sample, {'hp': self.best[fold['index']]['params'], 'fold': fold}
+                elif pending_trials:
+                    fold, trial_number = pending_trials.pop(0)
+                    yield ray_evaluate_fold_trial, {
+                        'strategy_hp': self.strategy_hp,
+                        'hp': generate_trial_params(self.strategy_hp),
+                        'fold': fold,
+                        'optimal_total': self.optimal_total,
+                        'trial_number': trial_number,
+                    }
+                else:
+                    # waiting for the last trials of a fold
+                    yield None
+
+        scheduler = RayScheduler(max_in_flight=self.cpu_cores * 2)
+        for task in scheduler.run_calls(
+            tasks_to_run(),
+            user_config=self.user_config,
+            formatted_routes=router.formatted_routes,
+            formatted_data_routes=router.formatted_data_routes,
+            candles=self.candles,
+            warmup_candles=self.warmup_candles,
+            fast_mode=self.fast_mode
+        ):
+            try:
+                result = task.result()
+            except ray.exceptions.RayTaskError as e:
+                if isinstance(e.cause, RuntimeError) and 'RouteNotFound:' in str(e.cause):
+                    raise e.cause
+                raise
+
+            self.completed_tasks += 1
+            self.progressbar.update()
+            sync_publish('progressbar', {
+                'current': self.progressbar.current,
+                'estimated_remaining_seconds': self.progressbar.estimated_remaining_seconds
+            })
+
+            if task.fn is ray_evaluate_out_of_sample:
+                self.out_of_sample[result['fold']] = result
+                logger.log_optimize_mode(
+                    f"Fold {result['fold'] + 1}/{len(self.folds)} out-of-sample: "
+                    f"pnl%: {round(result['metrics'].get('net_profit_percentage', 0), 2)}%, "
+                    f"trades: {result['metrics'].get('total', 0)}"
+                )
+                # a finished fold is what a resumed session can skip
+                self._save_session()
+                continue
+
+            fold_index = result['fold']
+            if self.best[fold_index] is None or result['score'] > self.best[fold_index]['score']:
+                self.best[fold_index] = result
+            remaining_trials[fold_index] -= 1
+            if remaining_trials[fold_index] == 0:
+                pending_out_of_sample.append(self.folds[fold_index])
+
+            # We do this every 5 trials to avoid too many database writes
+            if self.completed_tasks % 5 == 0:
+                self._save_session()
+
+        logger.log_optimize_mode(f"Walk-forward scheduling stats: {scheduler.stats()}")
+
+        return [
+            {**fold, 'best': self.best[fold['index']], 'out_of_sample': self.out_of_sample[fold['index']]}
+            for fold in self.folds
+        ]
+
+    def _report(self, fold_results: List[dict]) -> dict:
+        starting_balance = self.user_config['exchange']['balance']
+
+        # chain the daily returns of the out-of-sample windows into one equity curve: each
+        # fold adds a point at the end of each day of its own testing window
+        first_testing_start = self.starting_time + fold_results[0]['testing_start'] * 60_000
+        equity = [starting_balance]
+        times = [first_testing_start / 1000]
+        for f in fold_results:
+            days = (f['testing_finish'] - f['testing_start']) // ONE_DAY_MINUTES
+            testing_start = (self.starting_time + f['testing_start'] * 60_000) / 1000
+            daily_balance = f['out_of_sample']['daily_balance']
+            if not daily_balance:
+                growth = np.ones(days)
+            else:
+                # the balance at the start of the window and at the end of each of its days; a
+                # shorter series stays flat after its last value, which also ends a longer one
+                daily_balance = np.array(daily_balance, dtype=np.float64)
+                indices = np.minimum(np.arange(days + 1), len(daily_balance) - 1)
+                indices[-1] = len(daily_balance) - 1
+                growth = daily_balance[indices[1:]] / daily_balance[0]
+            equity += (equity[-1] * growth).tolist()
+            times += (testing_start + np.arange(1, days + 1) * 86400).tolist()
+
+        equity_curve = [{
+            'name': 'Out-of-sample',
+            'data': [{'time': t, 'value': v} for t, v in zip(times, equity)],
+        }]
+
+        folds = []
+        for f in fold_results:
+            folds.append({
+                'index': f['index'],
+                'training_start': self.starting_time + f['training_start'] * 60_000,
+                'training_finish': self.starting_time + f['training_finish'] * 60_000,
+                'testing_start': self.starting_time + f['testing_start'] * 60_000,
+                'testing_finish': self.starting_time + f['testing_finish'] * 60_000,
+                'params': f['best']['params'],
+                'score': f['best']['score'],
+                'training_metrics': f['best']['training_metrics'],
+                'out_of_sample_metrics': f['out_of_sample']['metrics'],
+            })
+
+        return jh.clean_infinite_values({
+            'anchored': self.anchored,
+            'trials_per_fold': self.trials_per_fold,
+            'folds': folds,
+            'equity_curve': equity_curve,
+            'net_profit_percentage': (equity[-1] / starting_balance - 1) * 100,
+            'parameter_stability': parameter_stability([f['params'] for f in folds]),
+        })
+
+
+def parameter_stability(params_per_fold: List[dict]) -> dict:
+    """
+    Describes how much each hyperparameter's best value moves between folds. Numeric values
+    get their mean, standard deviation and coefficient of variation (std / |mean|);
+    categorical ones the most common value and the share of folds that picked it.
+    """
+    report = {}
+    for name in params_per_fold[0]:
+        values = [p[name] for p in params_per_fold]
+        if all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) for v in values):
+            arr = np.array(values, dtype=np.float64)
+            mean = float(arr.mean())
+            std = float(arr.std())
+            report[name] = {
+                'values': arr.tolist(),
+                'mean': mean,
+                'std': std,
+                'coefficient_of_variation': None if mean == 0 else std / abs(mean),
+            }
+        else:
+            value, count = Counter(values).most_common(1)[0]
+            report[name] = {
+                'values': values,
+                'most_common': value,
+                'most_common_share': count / len(values),
+            }
+    return report
@@ -1,8 +1,11 @@
+import json
+import os
 from multiprocessing import cpu_count
 from typing import Dict, List, Tuple
 
 import arrow
 import jesse.helpers as jh
+import jesse.services.logger as logger
 from jesse.models.OptimizationSession import (
     get_optimization_session_by_id,
     store_optimization_session,
@@ -12,10 +15,12 @@ from jesse.models.OptimizationSession import (
 from jesse.modes.backtest_mode import load_candles
 from jesse.routes import router
 from jesse.services.failure import register_custom_exception_handler
+from jesse.services.redis import sync_publish
 from jesse.services.validators import validate_routes
 from jesse.store import store
 
 from .Optimize import Optimizer
+from .WalkForward import WalkForwardOptimizer
 
 
 def run(
@@ -70,15 +75,105 @@ def run(
         testing_finish_date
     )
 
+    _store_or_resume_session(session_id, state)
+
+    optimizer = Optimizer(
+        session_id,
+        user_config,
+        training_warmup_candles,
+        training_candles,
+        testing_warmup_candles,
+        testing_candles,
+        fast_mode,
+        optimal_total,
+        cpu_cores
+    )
+
+    optimizer.run()
+
+
+def run_walk_forward(
+        session_id: str,
+        user_config: dict,
+        exchange: str,
+        routes: List[Dict[str, str]],
+        data_routes: List[Dict[str, str]],
+        start_date: str,
+        finish_date: str,
+        folds: int,
+        training_ratio: float,
+        anchored: bool,
+        trials_per_fold: int,
+        optimal_total: int,
+        fast_mode: bool,
+        cpu_cores: int,
+        state: dict = None,
+) -> dict:
+    if jh.python_version() == (3, 13):
+        raise ValueError(
+            'Optimization is not supported on Python 3.13. The "Ray" library used for optimization does not support Python 3.13 yet. Please use Python 3.12 or lower.')
+
+    from jesse.config import config, set_config
+    config['app']['trading_mode'] = 'optimize'
+
+    if cpu_cores < 1:
+        raise ValueError('cpu_cores must be an integer value greater than 0. Please check your settings page for optimization.')
+    max_cpu_cores = cpu_count()
+    if cpu_cores > max_cpu_cores:
+        raise ValueError(f'cpu_cores must be less than or equal to {max_cpu_cores} which is the number of cores on your machine.')
+
+    set_config(user_config)
+    for r in routes:
+        r['exchange'] = exchange
+    for r in data_routes:
+        r['exchange'] = exchange
+    router.initiate(routes, data_routes)
+    store.app.set_session_id(session_id)
+    register_custom_exception_handler()
+    validate_routes(router)
+
+    # the whole range is loaded once; the folds are slices of it
+    warmup_candles, candles = load_candles(
+        jh.arrow_to_timestamp(arrow.get(start_date, 'YYYY-MM-DD')),
+        jh.arrow_to_timestamp(arrow.get(finish_date, 'YYYY-MM-DD'))
+    )
+
+    _store_or_resume_session(session_id, state)
+
+    optimizer = WalkForwardOptimizer(
+        session_id,
+        user_config,
+        warmup_candles,
+        candles,
+        fast_mode,
+        optimal_total,
+        cpu_cores,
+        folds,
+        training_ratio,
+        anchored,
+        trials_per_fold,
+    )
+    report = optimizer.run()
+
+    sync_publish('walk_forward_report', report)
+    path = f'storage/json/walk-forward-{session_id}.json'
+    jh.make_directory('storage/json')
+    with open(path, 'w') as f:
+        json.dump(report, f, default=str)
+    logger.log_optimize_mode(f'Walk-forward report saved to {path}')
+
+    return report
+
+
+def _store_or_resume_session(session_id: str, state: dict) -> None:
     # Capture strategy codes for each route
-    import os
     strategy_codes = {}
     for r in router.routes:
         key = f"{r.exchange}-{r.symbol}"
         if key not in strategy_codes:
             try:
                 strategy_path = f'strategies/{r.strategy_name}/__init__.py'
-                
+
                 if os.path.exists(strategy_path):
                     with open(strategy_path, 'r') as f:
                         content = f.read()
@@ -108,20 +203,6 @@ def run(
         if jh.is_debugging():
             jh.debug(f"Created new optimization session with ID: {session_id}")
 
-    optimizer = Optimizer(
-        session_id,
-        user_config,
-        training_warmup_candles,
-        training_candles,
-        testing_warmup_candles,
-        testing_candles,
-        fast_mode,
-        optimal_total,
-        cpu_cores
-    )
-
-    optimizer.run()
-
 
 def _get_training_and_testing_candles(
         training_start_date: str,
@@ -8,3 +8,4 @@ from .candles import (
 )
 from .import_candles import import_candles
 from .monte_carlo import monte_carlo_candles, monte_carlo_trades
+from .parallel_backtest import parallel_backtest
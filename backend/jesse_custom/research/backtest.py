@@ -90,7 +90,13 @@ def _isolated_backtest(
         fast_mode: bool = False,
         candles_pipeline_class = None,
         candles_pipeline_kwargs: dict = None,
+        copy_candles: bool = True,
 ) -> dict:
+    """
+    `copy_candles=False` is for callers that already pass candles the simulation may
+    mutate (the warmup candles are only read), such as the per-worker buffers of the
+    Monte Carlo candles scenarios.
+    """
     import jesse.helpers as jh
     from jesse.config import config as jesse_config
     from jesse.config import reset_config, set_config
@@ -126,8 +132,12 @@ def _isolated_backtest(
             )
 
     # make a copy to make sure we don't mutate the past data causing some issues for multiprocessing tasks
-    trading_candles_dict = copy.deepcopy(candles)
-    warmup_candles_dict = copy.deepcopy(warmup_candles)
+    if copy_candles:
+        trading_candles_dict = copy.deepcopy(candles)
+        warmup_candles_dict = copy.deepcopy(warmup_candles)
+    else:
+        trading_candles_dict = candles
+        warmup_candles_dict = warmup_candles
 
     # if warmup_candles is passed, use it
     if warmup_candles:
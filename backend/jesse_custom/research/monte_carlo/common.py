@@ -1,8 +1,9 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import jesse.helpers as jh
 import jesse.services.logger as logger
 import ray
+from jesse.services.ray_scheduler import ScheduledTask
 
 # =============================================================================
 # SHARED CONSTANTS
@@ -11,7 +12,6 @@ import ray
 # CPU and performance constants
 DEFAULT_CPU_USAGE_RATIO = 0.8  # Use 80% of available CPU cores by default
 MIN_CPU_CORES = 1  # Minimum number of CPU cores to use
-RAY_WAIT_TIMEOUT = 0.5  # Timeout for Ray wait operations (seconds)
 
 # Random seed constants
 BASE_RANDOM_SEED = 42  # Base seed for reproducible results
@@ -67,48 +67,44 @@ def _safe_log_message(message: str, pbar, is_error: bool = False) -> None:
 
 
 def _process_scenario_results(
-    scenario_refs: List[Any],
+    tasks: Iterator[ScheduledTask],
     pbar,
     progress_callback=None,
     result_callback=None
 ) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
-    remaining_refs = scenario_refs.copy()
-    total_scenarios = len(scenario_refs)
     completed_count = 0
-    
-    while remaining_refs:
-        completed_refs, remaining_refs = ray.wait(remaining_refs, num_returns=1, timeout=RAY_WAIT_TIMEOUT)
-        for ref in completed_refs:
-            try:
-                response = ray.get(ref)
-                if isinstance(response, dict) and 'result' in response:
-                    if response['result'] is not None:
-                        results.append(response['result'])
-                        # Stream the result immediately to the caller (for progressive UI updates)
-                        if result_callback is not None:
-                            try:
-                                result_callback(response['result'])
-                            except Exception:
-                                # Do not crash the loop due to callback errors
-                                pass
-                    if response.get('log'):
-                        is_error = response.get('error', False)
-                        _safe_log_message(response['log'], pbar, is_error=is_error)
-                else:
-                    results.append(response)
-            except Exception as e:
-                error_msg = f"Error processing scenario result: {str(e)}"
-                _safe_log_message(error_msg, pbar, is_error=True)
-            
-            if pbar:
-                pbar.update(1)
-            
-            # Call progress callback with actual completion count
-            completed_count += 1
-            if progress_callback:
-                progress_callback(completed_count)
-    
+
+    for task in tasks:
+        try:
+            response = task.result()
+            if isinstance(response, dict) and 'result' in response:
+                if response['result'] is not None:
+                    results.append(response['result'])
+                    # Stream the result immediately to the caller (for progressive UI updates)
+                    if result_callback is not None:
+                        try:
+                            result_callback(response['result'])
+                        except Exception:
+                            # Do not crash the loop due to callback errors
+                            pass
+                if response.get('log'):
+                    is_error = response.get('error', False)
+                    _safe_log_message(response['log'], pbar, is_error=is_error)
+            else:
+                results.append(response)
+        except Exception as e:
+            error_msg = f"Error processing scenario result: {str(e)}"
+            _safe_log_message(error_msg, pbar, is_error=True)
+
+        if pbar:
+            pbar.update(1)
+
+        # Call progress callback with actual completion count
+        completed_count += 1
+        if progress_callback:
+            progress_callback(completed_count)
+
     return results
 
 
@@ -1,12 +1,13 @@
 import os
 from datetime import datetime
 from multiprocessing import cpu_count
-from typing import Any, Dict, List, Optional, Tuple, TypedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TypedDict
 
 import jesse.helpers as jh
 import numpy as np
 import ray
-from jesse.research import backtest
+from jesse.research.backtest import _isolated_backtest as isolated_backtest
+from jesse.services.ray_scheduler import RayScheduler, ScheduledTask
 
 from .common import (
     ALPHA_1_PERCENT,
@@ -42,9 +43,31 @@ class MonteCarloCandlesReturn(TypedDict):
     scenarios: List[MonteCarloCandlesScenarioResult]
     num_scenarios: int
     total_requested: int
+    scheduler_stats: Dict[str, Any]
+
+
+# candles of the scenarios run by this worker process, by candles key. Ray reuses its
+# workers between tasks, so they're allocated once per worker instead of per scenario.
+_worker_candles_buffers: Dict[str, np.ndarray] = {}
+
+
+def _copy_to_worker_buffers(candles: dict) -> dict:
+    """
+    The candles a task receives are read-only views of the Ray object store, shared by all
+    the workers, but the simulation writes to its candles (fixing gaps and storing the
+    pipeline's perturbed candles), so each scenario runs on a copy in the worker's buffers.
+    """
+    copied = {}
+    for key, value in candles.items():
+        source = value['candles']
+        buffer = _worker_candles_buffers.get(key)
+        if buffer is None or buffer.shape != source.shape or buffer.dtype != source.dtype:
+            buffer = _worker_candles_buffers[key] = np.empty_like(source)
+        np.copyto(buffer, source)
+        copied[key] = {**value, 'candles': buffer}
+    return copied
 
 
-@ray.remote
 def _ray_run_scenario_monte_carlo_candles(
     config: dict,
     routes: List[Dict[str, str]],
@@ -58,17 +81,19 @@ def _ray_run_scenario_monte_carlo_candles(
     candles_pipeline_kwargs: dict = None
 ) -> Dict[str, Any]:
     """
-    Ray remote function to execute a single Monte Carlo candles scenario.
+    Executes a single Monte Carlo candles scenario on a Ray worker (see RayScheduler).
     """
     try:
         # Always apply the pipeline for Monte Carlo scenarios (except scenario 0 which is original)
         should_use_pipeline = candles_pipeline_class is not None and scenario_index > 0
-        result = backtest(
+        # the warmup candles are only read, so they're used straight from the object store
+        result = isolated_backtest(
             config=config,
             routes=routes,
             data_routes=data_routes,
-            candles=candles,
+            candles=_copy_to_worker_buffers(candles),
             warmup_candles=warmup_candles,
+            copy_candles=False,
             generate_equity_curve=True,
             hyperparameters=hyperparameters,
             fast_mode=fast_mode,
@@ -144,28 +169,26 @@ def monte_carlo_candles(
 
 
 def _launch_monte_carlo_candles_scenarios(
+    scheduler: RayScheduler,
     num_scenarios: int,
     shared_objects: Dict[str, Any],
     fast_mode: bool,
     candles_pipeline_class,
     candles_pipeline_kwargs: dict
-) -> List[Any]:
-    scenario_refs = []
-    for i in range(num_scenarios):
-        ref = _ray_run_scenario_monte_carlo_candles.remote(
-            config=shared_objects['config'],
-            routes=shared_objects['routes'],
-            data_routes=shared_objects['data_routes'],
-            candles=shared_objects['candles'],
-            warmup_candles=shared_objects['warmup_candles'],
-            hyperparameters=shared_objects['hyperparameters'],
-            fast_mode=fast_mode,
-            scenario_index=i,
-            candles_pipeline_class=candles_pipeline_class,
-            candles_pipeline_kwargs=candles_pipeline_kwargs
-        )
-        scenario_refs.append(ref)
-    return scenario_refs
+) -> Iterator[ScheduledTask]:
+    return scheduler.run(
+        _ray_run_scenario_monte_carlo_candles,
+        ({'scenario_index': i} for i in range(num_scenarios)),
+        config=shared_objects['config'],
+        routes=shared_objects['routes'],
+        data_routes=shared_objects['data_routes'],
+        candles=shared_objects['candles'],
+        warmup_candles=shared_objects['warmup_candles'],
+        hyperparameters=shared_objects['hyperparameters'],
+        fast_mode=fast_mode,
+        candles_pipeline_class=candles_pipeline_class,
+        candles_pipeline_kwargs=candles_pipeline_kwargs
+    )
 
 
 def _filter_valid_results(results: List[dict]) -> Tuple[List[dict], int]:
@@ -340,11 +363,12 @@ def _run_monte_carlo_candles_simulation(
         shared_objects = _create_ray_shared_objects(
             config, routes, data_routes, candles, warmup_candles, hyperparameters
         )
-        scenario_refs = _launch_monte_carlo_candles_scenarios(
-            num_scenarios, shared_objects, fast_mode,
+        scheduler = RayScheduler(max_in_flight=cpu_cores * 2)
+        scenario_tasks = _launch_monte_carlo_candles_scenarios(
+            scheduler, num_scenarios, shared_objects, fast_mode,
             candles_pipeline_class, candles_pipeline_kwargs
         )
-        results = _process_scenario_results(scenario_refs, pbar, progress_callback, result_callback)
+        results = _process_scenario_results(scenario_tasks, pbar, progress_callback, result_callback)
         if pbar:
             pbar.close()
         valid_results, filtered_count = _filter_valid_results(results)
@@ -362,7 +386,8 @@ def _run_monte_carlo_candles_simulation(
             'scenarios': simulation_results,
             'confidence_analysis': confidence_analysis,
             'num_scenarios': len(simulation_results),
-            'total_requested': num_scenarios
+            'total_requested': num_scenarios,
+            'scheduler_stats': scheduler.stats()
         }
     except Exception as e:
         print(f"Error during Monte Carlo candles simulation: {e}")
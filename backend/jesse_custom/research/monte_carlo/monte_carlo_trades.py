@@ -2,12 +2,13 @@ import os
 import random
 from datetime import datetime
 from multiprocessing import cpu_count
-from typing import Any, Dict, List, Optional, Tuple, TypedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TypedDict
 
 import jesse.helpers as jh
 import numpy as np
 import ray
 from jesse.research import backtest
+from jesse.services.ray_scheduler import RayScheduler, ScheduledTask
 
 from .common import (
     ALPHA_1_PERCENT,
@@ -89,9 +90,9 @@ class MonteCarloTradesReturn(TypedDict):
     confidence_analysis: ConfidenceAnalysis
     num_scenarios: int
     total_requested: int
+    scheduler_stats: Dict[str, Any]
 
 
-@ray.remote
 def _ray_run_scenario_monte_carlo(
     original_trades: list,
     original_equity_curve: list,
@@ -186,10 +187,11 @@ def _run_monte_carlo_simulation(
         pbar = _setup_progress_bar(progress_bar, num_scenarios, "Monte Carlo Scenarios")
         trades_ref = ray.put(original_trades)
         equity_curve_ref = ray.put(original_equity_curve)
-        scenario_refs = _launch_monte_carlo_scenarios(
-            num_scenarios, trades_ref, equity_curve_ref, starting_balance
+        scheduler = RayScheduler(max_in_flight=cpu_cores * 2)
+        scenario_tasks = _launch_monte_carlo_scenarios(
+            scheduler, num_scenarios, trades_ref, equity_curve_ref, starting_balance
         )
-        results = _process_scenario_results(scenario_refs, pbar, progress_callback, result_callback)
+        results = _process_scenario_results(scenario_tasks, pbar, progress_callback, result_callback)
         if pbar:
             pbar.close()
         print(f"Completed {len(results)} Monte Carlo scenarios out of {num_scenarios} requested")
@@ -199,7 +201,8 @@ def _run_monte_carlo_simulation(
             'scenarios': results,
             'confidence_analysis': confidence_analysis,
             'num_scenarios': len(results),
-            'total_requested': num_scenarios
+            'total_requested': num_scenarios,
+            'scheduler_stats': scheduler.stats()
         }
     except Exception as e:
         print(f"Error during Monte Carlo simulation: {e}")
@@ -254,22 +257,20 @@ def _diagnose_empty_trades(original_result: dict) -> None:
 
 
 def _launch_monte_carlo_scenarios(
+    scheduler: RayScheduler,
     num_scenarios: int,
     trades_ref: Any,
     equity_curve_ref: Any,
     starting_balance: float
-) -> List[Any]:
-    scenario_refs: List[Any] = []
-    for i in range(num_scenarios):
-        ref = _ray_run_scenario_monte_carlo.remote(
-            original_trades=trades_ref,
-            original_equity_curve=equity_curve_ref,
-            starting_balance=starting_balance,
-            scenario_index=i,
-            seed=BASE_RANDOM_SEED
-        )
-        scenario_refs.append(ref)
-    return scenario_refs
+) -> Iterator[ScheduledTask]:
+    return scheduler.run(
+        _ray_run_scenario_monte_carlo,
+        ({'scenario_index': i} for i in range(num_scenarios)),
+        original_trades=trades_ref,
+        original_equity_curve=equity_curve_ref,
+        starting_balance=starting_balance,
+        seed=BASE_RANDOM_SEED
+    )
 
 
 def _reconstruct_equity_curve_from_trades(shuffled_trades: list, original_equity_curve: list, starting_balance: float) -> list:
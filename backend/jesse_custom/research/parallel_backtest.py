@@ -0,0 +1,224 @@
+from multiprocessing import cpu_count
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import ray
+from jesse.research.backtest import backtest
+
+
+def partition_routes(routes: List[Dict[str, str]], data_routes: List[Dict[str, str]]) -> List[dict]:
+    """
+    Splits the routes into groups that can be simulated independently of each other:
+    one group per exchange/symbol pair that is traded. Data routes of a traded pair go
+    into that pair's group; data routes of pairs that aren't traded go into every group
+    since any strategy may read them.
+
+    The order of the groups (and of the routes within them) follows the order of the
+    passed routes, which keeps the merged results deterministic.
+    """
+    groups = {}
+    for r in routes:
+        key = (r['exchange'], r['symbol'])
+        if key not in groups:
+            groups[key] = {'routes': [], 'data_routes': []}
+        groups[key]['routes'].append(r)
+
+    shared_data_routes = []
+    for dr in data_routes:
+        key = (dr['exchange'], dr['symbol'])
+        if key in groups:
+            groups[key]['data_routes'].append(dr)
+        else:
+            shared_data_routes.append(dr)
+
+    for g in groups.values():
+        g['data_routes'] += shared_data_routes
+
+    return list(groups.values())
+
+
+def _partition_candle_keys(partition: dict) -> List[str]:
+    keys = []
+    for r in partition['routes'] + partition['data_routes']:
+        key = f"{r['exchange']}-{r['symbol']}"
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+@ray.remote
+def _ray_run_partition(
+        config: dict,
+        partition: dict,
+        candles: dict,
+        warmup_candles: Optional[dict],
+        hyperparameters: Optional[dict],
+        fast_mode: bool,
+        partition_index: int
+) -> Dict[str, Any]:
+    # Ray only resolves top-level object refs, not the ones nested in a dict
+    candles = {key: ray.get(ref) for key, ref in candles.items()}
+    if warmup_candles is not None:
+        warmup_candles = {key: ray.get(ref) for key, ref in warmup_candles.items()}
+
+    result = backtest(
+        config=config,
+        routes=partition['routes'],
+        data_routes=partition['data_routes'],
+        candles=candles,
+        warmup_candles=warmup_candles,
+        generate_equity_curve=True,
+        hyperparameters=hyperparameters,
+        fast_mode=fast_mode,
+    )
+    result['partition_index'] = partition_index
+    return result
+
+
+def parallel_backtest(
+        config: dict,
+        routes: List[Dict[str, str]],
+        data_routes: List[Dict[str, str]],
+        candles: dict,
+        warmup_candles: dict = None,
+        hyperparameters: dict = None,
+        fast_mode: bool = False,
+        generate_equity_curve: bool = False,
+        cpu_cores: Optional[int] = None,
+) -> dict:
+    """
+    Runs a multi-route backtest with each independent group of routes (see partition_routes())
+    in its own Ray worker, and merges the trades, daily balances and metrics.
+
+    Every group is simulated with the full starting balance and the merged balance is the
+    starting balance plus the sum of each group's profit. That's identical to a regular
+    backtest as long as the strategies don't interact through the shared wallet (for example,
+    by sizing positions from the available margin, or by reading each other's positions).
+    It's an opt-in mode for that reason.
+
+    Takes the same arguments as research.backtest(). Candles are put in Ray's object store once
+    and shared read-only between the workers.
+    """
+    partitions = partition_routes(routes, data_routes)
+
+    if len(partitions) < 2:
+        return backtest(
+            config, routes, data_routes, candles, warmup_candles,
+            generate_equity_curve=generate_equity_curve,
+            hyperparameters=hyperparameters,
+            fast_mode=fast_mode,
+        )
+
+    if cpu_cores is None:
+        cpu_cores = cpu_count()
+    cpu_cores = max(1, min(cpu_cores, cpu_count(), len(partitions)))
+
+    ray_started_here = False
+    if not ray.is_initialized():
+        try:
+            ray.init(num_cpus=cpu_cores, ignore_reinit_error=True)
+            ray_started_here = True
+        except Exception as e:
+            raise RuntimeError(f"Error initializing Ray: {e}")
+
+    try:
+        config_ref = ray.put(config)
+        hyperparameters_ref = ray.put(hyperparameters)
+        candle_refs = {key: ray.put(value) for key, value in candles.items()}
+        warmup_refs = {key: ray.put(value) for key, value in (warmup_candles or {}).items()}
+
+        refs = []
+        for i, p in enumerate(partitions):
+            keys = _partition_candle_keys(p)
+            refs.append(_ray_run_partition.remote(
+                config_ref,
+                p,
+                {key: candle_refs[key] for key in keys},
+                {key: warmup_refs[key] for key in keys} if warmup_candles else None,
+                hyperparameters_ref,
+                fast_mode,
+                i
+            ))
+        # ray.get() keeps the order of the refs, hence the order of the partitions
+        results = ray.get(refs)
+    finally:
+        if ray_started_here:
+            ray.shutdown()
+
+    first_key = f"{routes[0]['exchange']}-{routes[0]['symbol']}"
+    starting_time = int(candles[first_key]['candles'][0][0])
+    return merge_partition_results(results, config['starting_balance'], starting_time, generate_equity_curve)
+
+
+def _daily_balance(result: dict) -> Optional[np.ndarray]:
+    if not result.get('equity_curve'):
+        return None
+    portfolio = next(c for c in result['equity_curve'] if c['name'] == 'Portfolio')
+    return np.array([d['value'] for d in portfolio['data']], dtype=np.float64)
+
+
+def merge_partition_results(
+        results: List[dict], starting_balance: float, starting_time: int, generate_equity_curve: bool = False
+) -> dict:
+    """
+    Merges the results of independently simulated route groups into the result of one backtest.
+    """
+    from jesse.services.metrics import trades_from_records
+
+    results = sorted(results, key=lambda r: r['partition_index'])
+
+    # a group without any closed trade has no equity curve: its balance never moved
+    balances = [_daily_balance(r) for r in results]
+    template = next((b for b in balances if b is not None), None)
+    if template is None:
+        daily_balance = []
+    else:
+        daily_balance = np.full(len(template), starting_balance, dtype=np.float64)
+        for b in balances:
+            if b is not None:
+                daily_balance += b[:len(template)] - starting_balance
+        daily_balance = daily_balance.tolist()
+
+    trades = []
+    for r in results:
+        trades += r.get('trades', [])
+    trades.sort(key=lambda t: (t['closed_at'], t['opened_at'], t['symbol'], str(t['id'])))
+
+    finishing_balance = starting_balance + sum(
+        r['metrics'].get('finishing_balance', starting_balance) - starting_balance
+        for r in results if r['metrics'].get('total', 0)
+    )
+    metrics = trades_from_records(
+        [{k: v for k, v in t.items() if k != 'orders'} for t in trades],
+        daily_balance,
+        starting_balance,
+        finishing_balance,
+        starting_time,
+        sum(r['metrics'].get('total_open_trades', 0) for r in results),
+        sum(r['metrics'].get('open_pl', 0) for r in results),
+    )
+
+    result = {
+        'metrics': metrics,
+        'trades': trades,
+        'logs': None,
+        'partitions': len(results),
+    }
+
+    if generate_equity_curve:
+        result['equity_curve'] = None
+        if template is not None:
+            portfolio = next(
+                c for b, r in zip(balances, results) if b is not None
+                for c in r['equity_curve'] if c['name'] == 'Portfolio'
+            )
+            result['equity_curve'] = [{
+                'name': 'Portfolio',
+                'color': portfolio['color'],
+                'data': [
+                    {'time': d['time'], 'value': v, 'color': portfolio['color']}
+                    for d, v in zip(portfolio['data'], daily_balance)
+                ],
+            }]
+
+    return result
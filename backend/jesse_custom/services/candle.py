@@ -31,6 +31,50 @@ def generate_candle_from_one_minutes(
     ])
 
 
+def generate_candles_from_one_minutes(timeframe: str, candles: np.ndarray) -> np.ndarray:
+    """
+    Vectorized generate_candle_from_one_minutes() for a series: returns one candle of
+    `timeframe` for each complete group of 1m candles, counting from the first one. A
+    trailing incomplete group is left out.
+    """
+    num = jh.timeframe_to_one_minutes(timeframe)
+    count = len(candles) // num
+    groups = candles[:count * num].reshape(count, num, candles.shape[1])
+
+    return np.column_stack((
+        groups[:, 0, 0],
+        groups[:, 0, 1],
+        groups[:, -1, 2],
+        groups[:, :, 3].max(axis=1),
+        groups[:, :, 4].min(axis=1),
+        groups[:, :, 5].sum(axis=1),
+    ))
+
+
+def downsample_candles(candles: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Merges consecutive candles into buckets so that at most max_points candles are
+    returned (for example to match the pixel width of a chart). Each bucket keeps
+    the first timestamp and open, the last close, the highest high, the lowest low
+    and the summed volume.
+    """
+    if max_points is None or max_points <= 0 or len(candles) <= max_points:
+        return candles
+
+    bucket_size = int(np.ceil(len(candles) / max_points))
+    starts = np.arange(0, len(candles), bucket_size)
+    ends = np.append(starts[1:], len(candles)) - 1
+
+    return np.column_stack((
+        candles[starts, 0],
+        candles[starts, 1],
+        candles[ends, 2],
+        np.maximum.reduceat(candles[:, 3], starts),
+        np.minimum.reduceat(candles[:, 4], starts),
+        np.add.reduceat(candles[:, 5], starts),
+    ))
+
+
 def candle_dict_to_np_array(candle: dict) -> np.ndarray:
     return np.array([
         candle['timestamp'],
@@ -0,0 +1,104 @@
+"""
+Per-bar cache of indicator results, shared by all the strategies of a simulation.
+
+`Strategy.cached` only memoizes methods of one strategy, so `ta.ema(self.candles, 50)`
+is computed again when it's called from both should_long() and update_position(), or
+by two routes trading (or reading) the same exchange-symbol-timeframe. While a
+simulation runs, calls made through `jesse.indicators` are looked up here first.
+
+A call is cached only if every array argument is a view of a candle storage buffer.
+The key is made of the indicator name, each array's storage buffer, offset, shape
+and strides and its last row (where the forming candle lives), plus the other
+arguments. Calls with other arrays (e.g. computed by the strategy) or unhashable
+arguments are passed through. The simulators clear the cache at every bar, since
+the storages are updated in place between bars.
+"""
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+
+class IndicatorCache:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        # key => (result, arguments); the arguments are kept so that the buffers
+        # (and thus the ids and addresses in the keys) outlive the entry
+        self._results = {}
+        # ids of the candle storage buffers, collected on the first lookup of a bar
+        self._storage_buffer_ids: Optional[set] = None
+
+    def enable(self) -> None:
+        self.clear()
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.clear()
+
+    def clear(self) -> None:
+        self._results.clear()
+        self._storage_buffer_ids = None
+
+    def call(self, name: str, indicator: Callable, args: tuple, kwargs: dict) -> Any:
+        key = self._key(name, args, kwargs)
+        if key is None:
+            return indicator(*args, **kwargs)
+
+        entry = self._results.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._results[key] = (indicator(*args, **kwargs), (args, kwargs))
+        else:
+            self.hits += 1
+        return _copy_arrays(entry[0])
+
+    def _key(self, name: str, args: tuple, kwargs: dict) -> Optional[tuple]:
+        parts = [name]
+        for value in args:
+            part = self._array_key(value) if isinstance(value, np.ndarray) else value
+            if part is None and value is not None:
+                return None
+            parts.append(part)
+        for keyword in sorted(kwargs):
+            value = kwargs[keyword]
+            part = self._array_key(value) if isinstance(value, np.ndarray) else value
+            if part is None and value is not None:
+                return None
+            parts.append((keyword, part))
+
+        key = tuple(parts)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _array_key(self, arr: np.ndarray) -> Optional[tuple]:
+        base = arr.base
+        if base is None or arr.size == 0 or id(base) not in self._storage_buffers():
+            return None
+        return id(base), arr.__array_interface__['data'][0], arr.shape, arr.strides, arr[-1].tobytes()
+
+    def _storage_buffers(self) -> set:
+        if self._storage_buffer_ids is None:
+            from jesse.store import store
+            self._storage_buffer_ids = {id(s.array) for s in store.candles.storage.values()}
+        return self._storage_buffer_ids
+
+
+def _copy_arrays(result: Any) -> Any:
+    """Callers get their own arrays, so one can't modify another's result in place"""
+    if isinstance(result, np.ndarray):
+        return result.copy()
+    if isinstance(result, tuple) and any(isinstance(v, np.ndarray) for v in result):
+        values = [v.copy() if isinstance(v, np.ndarray) else v for v in result]
+        # namedtuples (most multi-output indicators) or plain tuples
+        return result._make(values) if hasattr(result, '_make') else tuple(values)
+    return result
+
+
+indicator_cache = IndicatorCache()
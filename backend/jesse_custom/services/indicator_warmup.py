@@ -0,0 +1,78 @@
+"""
+Ahead-of-time warmup of the indicators' numba kernels.
+
+Kernels decorated with `@njit(cache=True)` are compiled on their first call and
+the machine code is saved next to the module (in __pycache__), so later
+processes load it instead of compiling. Running this once after installing or
+upgrading (e.g. in the Docker build) moves that compile time out of the first
+backtest and the first optimization trials:
+
+    python -m jesse.services.indicator_warmup            # every indicator
+    python -m jesse.services.indicator_warmup rsi ema    # a chosen set
+"""
+import argparse
+import sys
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+def _warmup_candles(count: int = 300) -> np.ndarray:
+    """Random-walk candles in Jesse's [timestamp, open, close, high, low, volume] layout"""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) + rng.random(count)
+    low = np.minimum(open_, close) - rng.random(count)
+    volume = rng.random(count) * 1000 + 1
+    timestamps = 1_600_000_000_000 + np.arange(count) * 60_000
+    return np.column_stack((timestamps, open_, close, high, low, volume)).astype(np.float64)
+
+
+def warmup_indicators(names: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+    """
+    Calls each indicator (all of them by default) on synthetic candles, in both
+    sequential modes, so that the numba kernels they use are compiled and cached.
+
+    Returns the error message of each indicator that failed, None for the others.
+    Indicators needing arguments without defaults fail and are reported, since
+    they can't be called blindly; their kernels are compiled on first use instead.
+    """
+    import jesse.indicators as ta
+
+    candles = _warmup_candles()
+    results = {}
+    for name in names or ta.__all__:
+        try:
+            indicator = getattr(ta, name)
+            indicator(candles, sequential=False)
+            indicator(candles, sequential=True)
+            results[name] = None
+        except Exception as e:
+            results[name] = f'{type(e).__name__}: {e}'
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compile and cache the indicators' numba kernels.")
+    parser.add_argument('indicators', nargs='*', help='indicator names (default: all)')
+    args = parser.parse_args(argv)
+
+    import jesse.indicators as ta
+    unknown = [name for name in args.indicators if name not in ta.__all__]
+    if unknown:
+        parser.error(f"unknown indicator(s): {', '.join(unknown)}")
+
+    start = time.time()
+    results = warmup_indicators(args.indicators)
+    failed = {name: error for name, error in results.items() if error}
+
+    for name, error in failed.items():
+        print(f'{name}: {error}')
+    print(f'Warmed up {len(results) - len(failed)}/{len(results)} indicators in {time.time() - start:.1f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
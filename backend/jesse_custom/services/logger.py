@@ -1,5 +1,8 @@
+import atexit
 import logging
 import os
+import threading
+import time
 
 import jesse.helpers as jh
 from jesse.services.notifier import notify
@@ -8,6 +11,132 @@ from jesse.services.redis import sync_publish
 # store loggers in the dict because we might want to add more later
 LOGGERS = {}
 
+# seconds between two writes of the buffered session logs
+SESSION_LOG_FLUSH_INTERVAL = 0.5
+# a session buffer holding this many lines is written right away
+SESSION_LOG_MAX_BUFFERED_LINES = 1000
+
+
+class _SessionLogSink:
+    """
+    Buffers the lines of one session log (optimize or Monte Carlo mode) and writes
+    them in batches: one append to the log file and one 'log' event per flush,
+    instead of an open/write/close and a publish per line. Lines are flushed by a
+    background thread every SESSION_LOG_FLUSH_INTERVAL seconds, when the buffer
+    is full, and when the process exits (see flush_session_logs()).
+    """
+    def __init__(self, path) -> None:
+        # None for Ray workers, which only publish
+        self.path = path
+        self._lines = []
+        self._lock = threading.Lock()
+        # keeps concurrent flushes from writing batches out of order
+        self._write_lock = threading.Lock()
+
+    def append(self, line: str) -> bool:
+        """
+        Buffers a line. Returns True if the buffer is full and should be flushed.
+        """
+        with self._lock:
+            self._lines.append(line)
+            return len(self._lines) >= SESSION_LOG_MAX_BUFFERED_LINES
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                lines, self._lines = self._lines, []
+            if not lines:
+                return
+            text = '\n'.join(lines)
+
+            if self.path is not None:
+                try:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.write(text + '\n')
+                except Exception as e:
+                    print(f"Warning: Failed to write to log file {self.path}: {e}")
+
+            sync_publish('log', {
+                'id': jh.generate_unique_id(),
+                'timestamp': jh.now_to_timestamp(),
+                'message': text
+            })
+
+
+_session_log_sinks = {}
+_session_log_lock = threading.Lock()
+# pid of the process the flush thread was started in; a forked child has none
+_session_log_pid = None
+
+
+def _session_log_sink(path, key) -> _SessionLogSink:
+    global _session_log_pid
+    sink = _session_log_sinks.get(key)
+    if sink is not None and _session_log_pid == os.getpid():
+        return sink
+
+    with _session_log_lock:
+        if _session_log_pid != os.getpid():
+            _session_log_sinks.clear()
+            _session_log_pid = os.getpid()
+            threading.Thread(target=_flush_session_logs_periodically, daemon=True, name='session-log-flusher').start()
+        sink = _session_log_sinks.get(key)
+        if sink is None:
+            sink = _session_log_sinks[key] = _SessionLogSink(path)
+    return sink
+
+
+def _flush_session_logs_periodically() -> None:
+    while True:
+        time.sleep(SESSION_LOG_FLUSH_INTERVAL)
+        try:
+            flush_session_logs()
+        except Exception as e:
+            print(f"Error flushing session logs: {e}")
+
+
+def flush_session_logs() -> None:
+    """
+    Writes out all buffered session log lines. Must be called before the process
+    exits through os._exit(), which skips atexit handlers.
+    """
+    if _session_log_pid != os.getpid():
+        return
+    for sink in list(_session_log_sinks.values()):
+        sink.flush()
+
+
+def _log_session_line(message: str, path, key) -> None:
+    sink = _session_log_sink(path, key)
+    if sink.append(message):
+        sink.flush()
+
+
+atexit.register(flush_session_logs)
+
+
+_is_ray_worker_by_pid = {}
+
+
+def _is_ray_worker() -> bool:
+    """
+    Whether this process is a Ray worker. Checked once per process: Ray code only
+    runs in a worker after it's initialized, and a driver never becomes one.
+    """
+    pid = os.getpid()
+    if pid not in _is_ray_worker_by_pid:
+        is_ray_worker = False
+        try:
+            import ray
+            if ray.is_initialized():
+                runtime_ctx = ray.get_runtime_context()
+                is_ray_worker = runtime_ctx.worker.mode == ray.WORKER_MODE
+        except Exception as e:
+            print(f"Error checking Ray worker status: {e}")
+        _is_ray_worker_by_pid[pid] = is_ray_worker
+    return _is_ray_worker_by_pid[pid]
+
 
 def _init_main_logger():
     session_id = jh.get_session_id()
@@ -144,19 +273,9 @@ def log_optimize_mode(message):
 
     formatted_time = jh.timestamp_to_time(jh.now())[:19]
     message = f'[{formatted_time}]: ' + message
-    file_name = 'optimize-mode'
 
-    if file_name not in LOGGERS:
-        create_logger_file(file_name)
-
-    LOGGERS[file_name].info(message)
-
-    # also, publish to redis
-    sync_publish('log', {
-        'id': jh.generate_unique_id(),
-        'timestamp': jh.now_to_timestamp(),
-        'message': message
-    })
+    # buffered: appended to the log file and published to redis in batches
+    _log_session_line(message, 'storage/logs/optimize-mode.txt', 'optimize-mode')
 
 
 def log_monte_carlo(message, session_id: str):
@@ -168,37 +287,14 @@ def log_monte_carlo(message, session_id: str):
     formatted_time = jh.timestamp_to_time(jh.now())[:19]
     message = f'[{formatted_time}]: ' + message
 
-    # Check if we're in a Ray worker process
-    # Workers should not create file loggers as they can't share the LOGGERS dict properly
-    import ray
-    is_ray_worker = False
-    try:
-        if ray.is_initialized():
-            runtime_ctx = ray.get_runtime_context()
-            is_ray_worker = runtime_ctx.worker.mode == ray.WORKER_MODE
-    except Exception as e:
-        print(f"Error checking Ray worker status: {e}")
-
-    # Only create file logger from main process (not workers)
-    if not is_ray_worker:
-        try:
-            # Append to log file directly instead of using global logger
-            log_file = f"storage/logs/monte-carlo-mode/{session_id}.txt"
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-            # Append the message to the file
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(message + '\n')
-                f.flush()  # Ensure it's written immediately
-        except Exception as e:
-            print(f"Warning: Failed to write to monte carlo log file {log_file}: {e}")
-
-    # Always publish to redis for real-time updates
-    sync_publish('log', {
-        'id': jh.generate_unique_id(),
-        'timestamp': jh.now_to_timestamp(),
-        'message': message
-    })
+    # Workers should not write the log file as they don't share the main process' buffer;
+    # their lines are only published to redis for real-time updates
+    if _is_ray_worker():
+        _log_session_line(message, None, ('monte-carlo-mode', session_id, 'worker'))
+    else:
+        _log_session_line(
+            message, f"storage/logs/monte-carlo-mode/{session_id}.txt", ('monte-carlo-mode', session_id)
+        )
 
 
 def broadcast_error_without_logging(msg: str):
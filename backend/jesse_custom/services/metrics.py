@@ -261,10 +261,35 @@ def trades(trades_list: List[ClosedTrade], daily_balance: list, final: bool = Tr
         starting_balance += store.exchanges.storage[e].starting_assets[jh.app_currency()]
         current_balance += store.exchanges.storage[e].assets[jh.app_currency()]
 
-    if not trades_list:
+    return trades_from_records(
+        [t.to_dict for t in trades_list],
+        daily_balance,
+        starting_balance,
+        current_balance,
+        store.app.starting_time,
+        store.app.total_open_trades,
+        store.app.total_open_pl,
+    )
+
+
+def trades_from_records(
+        records: List[dict],
+        daily_balance: list,
+        starting_balance: float,
+        current_balance: float,
+        starting_time: int,
+        total_open_trades: int = 0,
+        open_pl: float = 0,
+) -> dict:
+    """
+    Same as trades() but computed from closed trades in their dict form (ClosedTrade.to_dict)
+    and explicitly passed balances, so it doesn't depend on the state of the store. Used for
+    merging the results of backtests that ran in other processes.
+    """
+    if not records:
         return {'total': 0, 'win_rate': 0, 'net_profit_percentage': 0}
 
-    df = pd.DataFrame.from_records([t.to_dict for t in trades_list])
+    df = pd.DataFrame.from_records(records)
 
     total_completed = len(df)
     winning_trades = df.loc[df['PNL'] > 0]
@@ -311,14 +336,11 @@ def trades(trades_list: List[ClosedTrade], daily_balance: list, final: bool = Tr
     gross_profit = winning_trades['PNL'].sum()
     gross_loss = losing_trades['PNL'].sum()
 
-    start_date = datetime.fromtimestamp(store.app.starting_time / 1000)
+    start_date = datetime.fromtimestamp(starting_time / 1000)
     date_index = pd.date_range(start=start_date, periods=len(daily_balance))
 
     daily_return = pd.DataFrame(daily_balance, index=date_index).pct_change(1)
 
-    total_open_trades = store.app.total_open_trades
-    open_pl = store.app.total_open_pl
-
     # Helper function to safely convert values
     def safe_convert(value, convert_type=float):
         try:
@@ -1,3 +1,4 @@
+import importlib
 import multiprocessing as mp
 import os
 import signal
@@ -9,19 +10,50 @@ from typing import List
 import jesse.helpers as jh
 from jesse.services.env import ENV_VALUES
 from jesse.services.failure import terminate_session
-from jesse.services.redis import sync_publish, sync_redis
+from jesse.services.logger import flush_session_logs
+from jesse.services.redis import flush_published_events, sync_publish, sync_redis
 
 # set multiprocessing process type to spawn
 mp.set_start_method('spawn', force=True)
 
+# Session processes are forked from a forkserver that has already imported the heavy
+# modules below, so they don't pay for importing numpy, pandas, numba, peewee, Ray
+# and the indicators on every start. Falls back to spawn where forkserver doesn't
+# exist (Windows).
+WORKER_PRELOAD_MODULES = [
+    'numpy',
+    'pandas',
+    'numba',
+    'peewee',
+    'ray',
+    'jesse.helpers',
+    'jesse.indicators',
+    'jesse.models',
+    'jesse.store',
+    'jesse.modes.backtest_mode',
+]
 
-class Process(mp.Process):
+if 'forkserver' in mp.get_all_start_methods():
+    _context = mp.get_context('forkserver')
+    _context.set_forkserver_preload(WORKER_PRELOAD_MODULES)
+else:
+    _context = mp.get_context('spawn')
+
+
+def _worker_pool_size() -> int:
+    try:
+        return max(int(ENV_VALUES.get('WORKER_POOL_SIZE', 2)), 0)
+    except Exception:
+        return 2
+
+
+class Process(_context.Process):
     def __init__(self, *args, **kwargs):
-        mp.Process.__init__(self, *args, **kwargs)
+        _context.Process.__init__(self, *args, **kwargs)
 
     def run(self):
         try:
-            mp.Process.run(self)
+            _context.Process.run(self)
         except Exception as e:
             if type(e).__name__ == 'Termination':
                 sync_publish('termination', {})
@@ -39,11 +71,74 @@ class Process(mp.Process):
                 print(traceback.format_exc())
 
                 terminate_session()
+        finally:
+            flush_session_logs()
+            flush_published_events()
+
+
+def _wait_for_task(conn) -> None:
+    """
+    Body of a warm worker: import what the forkserver couldn't preload, then block
+    until a session is dispatched and run it. Jesse keeps session state in module
+    globals (store, config, router) and ends failed sessions with os._exit(), so a
+    worker runs a single session and exits; a fresh fork replaces it.
+    """
+    for module in WORKER_PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+
+    try:
+        function, args = conn.recv()
+    except EOFError:
+        # the manager went away or discarded this worker
+        return
+    finally:
+        conn.close()
+
+    function(*args)
+
+
+class WarmWorker(Process):
+    """
+    A pre-started session process waiting for its task on a pipe.
+    """
+    def __init__(self):
+        receiver, self._sender = _context.Pipe(duplex=False)
+        Process.__init__(self, target=_wait_for_task, args=(receiver,))
+        self._receiver = receiver
+
+    def start(self):
+        Process.start(self)
+        # the child has its own copy now
+        self._receiver.close()
+
+    def dispatch(self, function, args) -> None:
+        try:
+            self._sender.send((function, args))
+        finally:
+            self._sender.close()
+
+    def discard(self) -> None:
+        # closing the pipe makes the worker return without running anything
+        try:
+            self._sender.close()
+        except Exception:
+            pass
 
 
 class ProcessManager:
     def __init__(self):
         self._workers: List[Process] = []
+        # pre-started workers that no session has been dispatched to yet
+        self._warm_workers: List[WarmWorker] = []
+        self._warm_lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+        # the pool is started by the first task, so that importing this module
+        # (e.g. in the forkserver) doesn't start processes
+        self._pool_started = False
+        self._pool_size = _worker_pool_size()
         self._pid_to_client_id_map = {}
         self.client_id_to_pid_to_map = {}
         try:
@@ -73,15 +168,76 @@ class ProcessManager:
     def _add_process(self, client_id):
         sync_redis.sadd(self._active_workers_key, client_id)
 
+    def _take_warm_worker(self):
+        with self._warm_lock:
+            while self._warm_workers:
+                w = self._warm_workers.pop(0)
+                if w.is_alive():
+                    return w
+                self._workers.append(w)  # let the cleanup thread reap it
+        return None
+
+    def _fill_pool(self):
+        """
+        Starts warm workers until the pool is full. Called off the request path,
+        since the very first start also starts the forkserver.
+        """
+        # one filler at a time, or concurrent fills would overshoot the size
+        if not self._fill_lock.acquire(blocking=False):
+            return
+        try:
+            with self._warm_lock:
+                dead = [w for w in self._warm_workers if not w.is_alive()]
+                self._warm_workers = [w for w in self._warm_workers if w not in dead]
+            self._workers.extend(dead)
+
+            while True:
+                with self._warm_lock:
+                    if len(self._warm_workers) >= self._pool_size:
+                        return
+                w = WarmWorker()
+                try:
+                    w.start()
+                except Exception as e:
+                    jh.debug(f"Error while starting a warm worker: {str(e)}")
+                    return
+                with self._warm_lock:
+                    self._warm_workers.append(w)
+        finally:
+            self._fill_lock.release()
+
+    def _refill_pool_async(self):
+        if self._pool_size:
+            threading.Thread(target=self._fill_pool, daemon=True).start()
+
     def add_task(self, function, *args):
         client_id = args[0]
-        w = Process(target=function, args=args)
-        self._workers.append(w)
-        w.start()
+        self._pool_started = True
+
+        w = self._take_warm_worker()
+        if w is not None:
+            # map the pid before the task runs so its first events are routed
+            self._map_pid(w.pid, client_id)
+            self._workers.append(w)
+            try:
+                w.dispatch(function, args)
+            except OSError:
+                # the worker died after it was taken from the pool
+                w = None
+
+        if w is None:
+            # pool is disabled or empty; start a process for this task alone
+            w = Process(target=function, args=args)
+            self._workers.append(w)
+            w.start()
+            self._map_pid(w.pid, client_id)
 
-        self._pid_to_client_id_map[self._prefixed_pid(w.pid)] = self._prefixed_client_id(client_id)
-        self.client_id_to_pid_to_map[self._prefixed_client_id(client_id)] = self._prefixed_pid(w.pid)
         self._add_process(client_id)
+        self._refill_pool_async()
+
+    def _map_pid(self, pid, client_id):
+        self._pid_to_client_id_map[self._prefixed_pid(pid)] = self._prefixed_client_id(client_id)
+        self.client_id_to_pid_to_map[self._prefixed_client_id(client_id)] = self._prefixed_pid(pid)
 
     def get_client_id(self, pid):
         try:
@@ -97,7 +253,12 @@ class ProcessManager:
         sync_redis.srem(self._active_workers_key, client_id)
 
     def flush(self):
-        for w in self._workers:
+        with self._warm_lock:
+            warm_workers, self._warm_workers = self._warm_workers, []
+        for w in warm_workers:
+            w.discard()
+
+        for w in self._workers + warm_workers:
             try:
                 # Try terminate first
                 w.terminate()
@@ -126,6 +287,9 @@ class ProcessManager:
                             self._workers.remove(w)
                         except Exception as e:
                             jh.debug(f"Error during worker cleanup: {str(e)}")
+                # replace warm workers that died while idle (e.g. after a flush)
+                if self._pool_started:
+                    self._fill_pool()
             except Exception as e:
                 jh.debug(f"Error in cleanup thread: {str(e)}")
             time.sleep(5)
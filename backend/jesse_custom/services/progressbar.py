@@ -18,10 +18,10 @@ class Progressbar:
         self.step = step
         self.is_finished = False
 
-    def update(self):
+    def update(self, steps: int = 1):
         if not self.is_finished:
-            self.index += self.step
-            if self.index == self.length:
+            self.index += self.step * steps
+            if self.index >= self.length:
                 self.is_finished = True
         now = time()
         self._execution_times.append(np.array([now - self._time]))
@@ -0,0 +1,207 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import ray
+
+# timeout of each wait for a finished task, which bounds how long the driver loop blocks
+WAIT_TIMEOUT = 0.5
+# share of the machine's memory that is never handed to tasks
+MEMORY_RESERVE_RATIO = 0.1
+
+_EXHAUSTED = object()
+
+
+def _memory() -> Optional[Tuple[int, int]]:
+    """
+    (available, total) bytes of the machine's memory. psutil ships with Ray.
+    """
+    try:
+        import psutil
+    except ImportError:  # pragma: no cover
+        return None
+    m = psutil.virtual_memory()
+    return m.available, m.total
+
+
+def _process_rss() -> Optional[int]:
+    try:
+        import psutil
+    except ImportError:  # pragma: no cover
+        return None
+    return psutil.Process().memory_info().rss
+
+
+@ray.remote
+def _run_task(fn: Callable, submitted_at: float, *args, **kwargs) -> dict:
+    started_at = time.time()
+    result = fn(*args, **kwargs)
+    return {
+        'result': result,
+        'queue_seconds': max(0.0, started_at - submitted_at),
+        'run_seconds': time.time() - started_at,
+        # what a worker running this task holds, which is what every concurrent task costs
+        'rss': _process_rss(),
+    }
+
+
+class ScheduledTask:
+    def __init__(self, index: int, fn: Callable, kwargs: dict) -> None:
+        self.index = index
+        self.fn = fn
+        # the task's own arguments (without the shared ones)
+        self.kwargs = kwargs
+        self.submitted_at = time.time()
+        self.queue_seconds: Optional[float] = None
+        self.run_seconds: Optional[float] = None
+        self.rss: Optional[int] = None
+        self._result = None
+        self._error: Optional[BaseException] = None
+
+    def result(self) -> Any:
+        """
+        The task's return value; raises what ray.get() raised if the task failed.
+        """
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class RayScheduler:
+    """
+    Runs a function over many argument sets on Ray, submitting tasks from a lazy queue
+    only while there's room for them, and yields each task as soon as it finishes.
+
+    Room is bounded by `max_in_flight` and by memory: tasks report the RSS of the worker
+    that ran them, and once one has, the number of tasks in flight is capped to what the
+    memory available when the scheduler was created can hold, and no task is submitted
+    while the memory available at that moment couldn't hold one more.
+
+    Ray doesn't expose per-worker queues to steal from, so tasks stay in the local queue
+    until a slot frees up and whichever worker is idle first takes the next one; a slow
+    task never has others queued behind it.
+    """
+
+    def __init__(self, max_in_flight: int, memory_reserve_ratio: float = MEMORY_RESERVE_RATIO) -> None:
+        self.max_in_flight = max(1, max_in_flight)
+        self.memory_reserve_ratio = memory_reserve_ratio
+        # the largest RSS reported by a finished task
+        self.task_rss: Optional[int] = None
+        # index, queue_seconds, run_seconds and rss of each finished task, in completion order
+        self.records: List[dict] = []
+        self._in_flight: Dict[ray.ObjectRef, ScheduledTask] = {}
+        self._submitted_count = 0
+
+        memory = _memory()
+        self._memory_budget = None if memory is None else memory[0] - memory[1] * memory_reserve_ratio
+
+    @property
+    def in_flight_limit(self) -> int:
+        if self.task_rss is None or self._memory_budget is None:
+            return self.max_in_flight
+        return max(1, min(self.max_in_flight, int(self._memory_budget // self.task_rss)))
+
+    def run(self, fn: Callable, items: Iterable[dict], **shared_kwargs) -> Iterator[ScheduledTask]:
+        """
+        Calls fn(**item, **shared_kwargs) for each item. The shared arguments are put into
+        the object store once (unless they're object refs already) instead of being
+        serialized with every task. Items are only read when they're about to be submitted.
+        """
+        return self.run_calls(((fn, item) for item in items), **shared_kwargs)
+
+    def run_calls(self, calls: Iterable[Optional[Tuple[Callable, dict]]], **shared_kwargs) -> Iterator[ScheduledTask]:
+        """
+        Same as run() for (fn, kwargs) pairs, for mixing different kinds of tasks in one
+        queue. Since calls are read lazily, the iterable may decide what comes next based
+        on the tasks yielded so far; it yields None when nothing can be submitted until
+        more tasks finish, and is asked again after the next one does.
+        """
+        shared_kwargs = {
+            k: v if isinstance(v, ray.ObjectRef) else ray.put(v) for k, v in shared_kwargs.items()
+        }
+        calls = iter(calls)
+        exhausted = False
+
+        while True:
+            while not exhausted and self._has_room():
+                call = next(calls, _EXHAUSTED)
+                if call is _EXHAUSTED:
+                    exhausted = True
+                elif call is None:
+                    break
+                else:
+                    self._submit(call[0], call[1], shared_kwargs)
+
+            if not self._in_flight:
+                return
+
+            refs = list(self._in_flight)
+            done_refs, _ = ray.wait(refs, num_returns=1, timeout=WAIT_TIMEOUT)
+            if done_refs:
+                # along with any other task that has finished in the meantime
+                done_refs, _ = ray.wait(refs, num_returns=len(refs), timeout=0)
+            for ref in done_refs:
+                yield self._finish(ref)
+
+    def _has_room(self) -> bool:
+        if not self._in_flight:
+            return True
+        if len(self._in_flight) >= self.in_flight_limit:
+            return False
+        if self.task_rss is None:
+            return True
+        memory = _memory()
+        return memory is None or memory[0] - memory[1] * self.memory_reserve_ratio >= self.task_rss
+
+    def _submit(self, fn: Callable, item: dict, shared_kwargs: dict) -> None:
+        task = ScheduledTask(self._submitted_count, fn, item)
+        self._submitted_count += 1
+        # Ray only resolves object refs passed as top-level arguments
+        ref = _run_task.options(num_cpus=1).remote(fn, task.submitted_at, **item, **shared_kwargs)
+        self._in_flight[ref] = task
+
+    def _finish(self, ref: ray.ObjectRef) -> ScheduledTask:
+        task = self._in_flight.pop(ref)
+        try:
+            output = ray.get(ref)
+        except Exception as e:
+            task._error = e
+        else:
+            task._result = output['result']
+            task.queue_seconds = output['queue_seconds']
+            task.run_seconds = output['run_seconds']
+            task.rss = output['rss']
+            if task.rss is not None:
+                self.task_rss = max(self.task_rss or 0, task.rss)
+
+        self.records.append({
+            'index': task.index,
+            'queue_seconds': task.queue_seconds,
+            'run_seconds': task.run_seconds,
+            'rss': task.rss,
+        })
+        return task
+
+    def stats(self) -> dict:
+        """
+        Summary of the finished tasks: mean, median, 95th percentile and max of their
+        queue and run times (seconds), the largest task RSS (MB) and the in-flight limit.
+        """
+        def summary(key: str) -> Optional[dict]:
+            values = np.array([r[key] for r in self.records if r[key] is not None], dtype=np.float64)
+            if not len(values):
+                return None
+            return {
+                'mean': float(values.mean()),
+                'median': float(np.median(values)),
+                'p95': float(np.percentile(values, 95)),
+                'max': float(values.max()),
+            }
+
+        return {
+            'tasks': len(self.records),
+            'queue_seconds': summary('queue_seconds'),
+            'run_seconds': summary('run_seconds'),
+            'task_rss_mb': None if self.task_rss is None else round(self.task_rss / 1024 ** 2, 1),
+            'in_flight_limit': self.in_flight_limit,
+        }
@@ -1,6 +1,8 @@
 import asyncio
 import base64
 import os
+import queue
+import threading
 
 import aioredis
 import jesse.helpers as jh
@@ -29,27 +31,139 @@ if jh.is_jesse_project():
         )
 
 
-def sync_publish(event: str, msg, compression: bool = False):
-    if jh.is_unit_testing():
-        raise EnvironmentError('sync_publish() should be NOT called during testing. There must be something wrong')
-
-    if compression:
-        msg = jh.gzip_compress(msg)
-        # Encode the compressed message using Base64
-        msg = base64.b64encode(msg).decode('utf-8')
-
+class _EventPublisher:
+    """
+    Publishes events to Redis from a background thread so that the caller (usually
+    the inner loop of a simulation) never waits on JSON encoding or Redis I/O.
+
+    The queue is bounded: if Redis is slow or unavailable, events are dropped (and
+    counted) instead of piling up or slowing the caller down. Progress events are
+    coalesced: only the latest payload of each is kept until the thread gets to it.
+    """
+    # events for which only the latest payload matters
+    COALESCED_EVENTS = {'progressbar', 'candles_progressbar', 'trades_progressbar', 'general_info'}
+    # events that end a session; these must never be dropped
+    CRITICAL_EVENTS = {'exception', 'termination', 'unexpectedTermination'}
+    # placeholder queued for a coalesced event; the payload is read from _latest
+    _COALESCED = object()
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self._queue = queue.Queue(maxsize)
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.dropped_count = 0
+
+    def _is_running(self) -> bool:
+        # a forked child doesn't inherit the parent's thread
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _ensure_thread(self) -> None:
+        if self._is_running():
+            return
+        with self._lock:
+            if self._is_running():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(self._queue.maxsize)
+                self._latest = {}
+                self._pid = os.getpid()
+            # otherwise the thread died; a new one picks up the events still queued
+            self._thread = threading.Thread(target=self._run, daemon=True, name='redis-publisher')
+            self._thread.start()
+
+    def publish(self, event: str, msg, compression: bool) -> None:
+        self._ensure_thread()
+        mode_event = f'{jh.app_mode()}.{event}'
+
+        if event in self.COALESCED_EVENTS:
+            with self._lock:
+                is_pending = mode_event in self._latest
+                self._latest[mode_event] = msg
+            if is_pending:
+                return
+            item = (mode_event, self._COALESCED, compression)
+        else:
+            item = (mode_event, msg, compression)
+
+        if event in self.CRITICAL_EVENTS:
+            self._queue.put(item)
+            return
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if event in self.COALESCED_EVENTS:
+                with self._lock:
+                    self._latest.pop(mode_event, None)
+            self.dropped_count += 1
+            if self.dropped_count == 1 or self.dropped_count % 1000 == 0:
+                jh.terminal_debug(f"Redis publish queue is full; dropped {self.dropped_count} event(s) so far")
+
+    def flush(self, timeout: float = 5) -> None:
+        """
+        Blocks until all queued events are published (or the timeout passes). Must be
+        called before the process exits, since the publisher thread is a daemon.
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return
+        done = threading.Event()
+        threading.Thread(target=lambda: (self._queue.join(), done.set()), daemon=True).start()
+        done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            mode_event, msg, compression = self._queue.get()
+            try:
+                if msg is self._COALESCED:
+                    with self._lock:
+                        msg = self._latest.pop(mode_event, self._COALESCED)
+                if msg is not self._COALESCED:
+                    _publish(mode_event, msg, compression)
+            except Exception as e:
+                # an event that can't be published must not stop the ones after it
+                jh.terminal_debug(f"Redis publish error ({mode_event}): {e}")
+            finally:
+                self._queue.task_done()
+
+
+def _publish(mode_event: str, msg, compression: bool) -> None:
     try:
+        if compression:
+            msg = jh.gzip_compress(msg)
+            # Encode the compressed message using Base64
+            msg = base64.b64encode(msg).decode('utf-8')
+
         sync_redis.publish(
             f"{ENV_VALUES['APP_PORT']}:channel:1", json.dumps({
                 'id': os.getpid(),
-                'event': f'{jh.app_mode()}.{event}',
+                'event': mode_event,
                 'is_compressed': compression,
                 'data': msg
             }, ignore_nan=True, cls=NpEncoder)
         )
     except Exception as e:
-        # Log publish errors so we can diagnose Redis outages without crashing the worker
-        jh.terminal_debug(f"Redis publish error: {e}")
+        # Log encoding and publish errors so we can diagnose them without crashing the worker
+        jh.terminal_debug(f"Redis publish error ({mode_event}): {e}")
+
+
+_publisher = _EventPublisher()
+
+
+def sync_publish(event: str, msg, compression: bool = False):
+    """
+    Queues the event for publishing and returns immediately. The payload must not be
+    mutated after it is passed in, since it's encoded later on the publisher thread.
+    """
+    if jh.is_unit_testing():
+        raise EnvironmentError('sync_publish() should be NOT called during testing. There must be something wrong')
+
+    _publisher.publish(event, msg, compression)
+
+
+def flush_published_events(timeout: float = 5) -> None:
+    _publisher.flush(timeout)
 
 
 async def async_publish(event: str, msg, compression: bool = False):
@@ -0,0 +1,320 @@
+"""
+Binary storage for the (potentially large) results of a backtest session.
+
+Results are written once at the end of a run into a single compressed NumPy
+archive (`storage/backtest-sessions/{session_id}.npz`) in a columnar layout:
+
+- equity curves: one `time`/`value` array pair per series
+- trades: JSON-encoded rows concatenated into one byte buffer with an offsets
+  array, so a page of trades can be decoded without touching the rest
+- candles chart: one (n, 6) float64 array per route, sorted by timestamp
+- everything else (orders, lines, ...): a small JSON document
+
+Metrics and hyperparameters are small and stay in the `BacktestSession` row.
+
+`np.load` reads archive members lazily, so a request only pays for the
+member(s) it actually asks for.
+"""
+import json
+import os
+from typing import List, Optional
+
+import jesse.helpers as jh
+import numpy as np
+
+ARTIFACTS_DIR = 'storage/backtest-sessions'
+
+
+def artifacts_path(session_id: str) -> str:
+    return f'{ARTIFACTS_DIR}/{session_id}.npz'
+
+
+def has_artifacts(session_id: str) -> bool:
+    return os.path.exists(artifacts_path(session_id))
+
+
+def delete_artifacts(session_id: str) -> None:
+    try:
+        os.remove(artifacts_path(session_id))
+    except FileNotFoundError:
+        pass
+
+
+def _json_to_array(obj) -> np.ndarray:
+    return np.frombuffer(json.dumps(obj).encode('utf-8'), dtype=np.uint8)
+
+
+def _array_to_json(arr: np.ndarray):
+    return json.loads(arr.tobytes().decode('utf-8'))
+
+
+def store_artifacts(
+        session_id: str,
+        equity_curve: list = None,
+        trades: list = None,
+        chart_data: dict = None
+) -> str:
+    """
+    Writes the results of a backtest session into its binary archive. The file is
+    written to a temporary path first and then moved into place, so readers never
+    see a half-written archive.
+    """
+    arrays = {}
+    meta = {
+        'version': 1,
+        'equity_curve': [],
+        'trades_count': 0,
+        'has_chart_data': chart_data is not None,
+        'candles_chart': [],
+    }
+
+    for i, series in enumerate(equity_curve or []):
+        data = series.get('data', [])
+        arrays[f'equity_curve_{i}_time'] = np.array([d['time'] for d in data], dtype=np.float64)
+        arrays[f'equity_curve_{i}_value'] = np.array([d['value'] for d in data], dtype=np.float64)
+        meta['equity_curve'].append({'name': series.get('name'), 'color': series.get('color')})
+
+    if trades:
+        encoded = [json.dumps(t).encode('utf-8') for t in trades]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(e) for e in encoded])
+        arrays['trades_offsets'] = offsets
+        arrays['trades_data'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        meta['trades_count'] = len(trades)
+
+    if chart_data is not None:
+        chart_data = dict(chart_data)
+        for i, route in enumerate(chart_data.pop('candles_chart', None) or []):
+            candles = route['candles']
+            if isinstance(candles, np.ndarray):
+                arr = candles
+            else:
+                arr = np.array(
+                    [[c['time'] * 1000, c['open'], c['close'], c['high'], c['low'], c['volume']] for c in candles],
+                    dtype=np.float64
+                ).reshape(-1, 6)
+            arrays[f'candles_{i}'] = arr
+            meta['candles_chart'].append({
+                'exchange': route['exchange'],
+                'symbol': route['symbol'],
+                'timeframe': route['timeframe'],
+                'count': len(arr),
+            })
+        arrays['chart_data'] = _json_to_array(chart_data)
+
+    arrays['meta'] = _json_to_array(meta)
+
+    jh.make_directory(ARTIFACTS_DIR)
+    path = artifacts_path(session_id)
+    # np.savez_compressed appends ".npz" to paths that don't already end with it
+    tmp_path = f'{path}.tmp.npz'
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+    return path
+
+
+class _Archive:
+    def __init__(self, session_id: str) -> None:
+        self._file = np.load(artifacts_path(session_id), allow_pickle=False)
+        self.meta = _array_to_json(self._file['meta'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._file.close()
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        if name not in self._file.files:
+            return None
+        return self._file[name]
+
+
+def _open(session_id: str) -> Optional[_Archive]:
+    if not has_artifacts(session_id):
+        return None
+    return _Archive(session_id)
+
+
+def thin_indices(left: int, right: int, max_points: int = None) -> np.ndarray:
+    """
+    Indices of [left, right) thinned out to (at most) max_points evenly spaced ones,
+    always keeping the last one.
+    """
+    indices = np.arange(left, right)
+    if max_points is not None and 0 < max_points < len(indices):
+        step = int(np.ceil(len(indices) / max_points))
+        indices = np.unique(np.append(indices[::step][:max_points - 1], indices[-1]))
+    return indices
+
+
+def load_equity_curve(
+        session_id: str,
+        start: float = None,
+        finish: float = None,
+        max_points: int = None
+) -> Optional[list]:
+    """
+    Returns the equity curves of a session, optionally only between two timestamps
+    (in seconds, like the curve's `time`) and thinned out to (at most) `max_points`
+    points per series; the last point of the range is always kept.
+    """
+    archive = _open(session_id)
+    if archive is None:
+        return None
+
+    with archive:
+        result = []
+        for i, series in enumerate(archive.meta['equity_curve']):
+            times = archive.get(f'equity_curve_{i}_time')
+            values = archive.get(f'equity_curve_{i}_value')
+            left = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+            right = len(times) if finish is None else int(np.searchsorted(times, finish, side='right'))
+            indices = thin_indices(left, right, max_points)
+            result.append({
+                'name': series['name'],
+                'color': series['color'],
+                'data': [
+                    {'time': t, 'value': v, 'color': series['color']}
+                    for t, v in zip(times[indices].tolist(), values[indices].tolist())
+                ],
+            })
+        return result
+
+
+def load_trades(session_id: str, page: int = None, per_page: int = 50) -> Optional[dict]:
+    """
+    Returns the trades of a session. If `page` is passed (starting from 1), only
+    that page is decoded.
+    """
+    archive = _open(session_id)
+    if archive is None:
+        return None
+
+    with archive:
+        count = archive.meta['trades_count']
+        if count == 0:
+            return {'trades': [], 'total': 0}
+
+        start, finish = 0, count
+        if page is not None:
+            start = min(max(page - 1, 0) * per_page, count)
+            finish = min(start + per_page, count)
+
+        offsets = archive.get('trades_offsets')
+        buffer = archive.get('trades_data')[offsets[start]:offsets[finish]].tobytes()
+        relative = offsets[start:finish + 1] - offsets[start]
+        trades = [
+            json.loads(buffer[relative[k]:relative[k + 1]])
+            for k in range(finish - start)
+        ]
+        return {'trades': trades, 'total': count}
+
+
+def load_candles(
+        session_id: str,
+        exchange: str = None,
+        symbol: str = None,
+        timeframe: str = None,
+        start: int = None,
+        finish: int = None
+) -> Optional[List[dict]]:
+    """
+    Returns the candles chart of a session, optionally filtered by route and by a
+    [start, finish] timestamp range (in milliseconds). The range is located with a
+    binary search on the timestamp column.
+    """
+    archive = _open(session_id)
+    if archive is None:
+        return None
+
+    with archive:
+        result = []
+        for i, route in enumerate(archive.meta['candles_chart']):
+            if exchange is not None and route['exchange'] != exchange:
+                continue
+            if symbol is not None and route['symbol'] != symbol:
+                continue
+            if timeframe is not None and route['timeframe'] != timeframe:
+                continue
+
+            candles = archive.get(f'candles_{i}')
+            timestamps = candles[:, 0]
+            left = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+            right = len(candles) if finish is None else int(np.searchsorted(timestamps, finish, side='right'))
+            result.append({
+                'exchange': route['exchange'],
+                'symbol': route['symbol'],
+                'timeframe': route['timeframe'],
+                'candles': candles[left:right],
+            })
+        return result
+
+
+def candles_to_dicts(candles: np.ndarray) -> list:
+    return [{
+        'time': int(c[0] / 1000),
+        'open': c[1],
+        'close': c[2],
+        'high': c[3],
+        'low': c[4],
+        'volume': c[5]
+    } for c in candles.tolist()]
+
+
+def candles_to_columns(candles: np.ndarray) -> dict:
+    """
+    Parallel arrays instead of one dict per candle; a lot smaller once JSON-encoded.
+    """
+    return {
+        'time': (candles[:, 0] // 1000).astype(np.int64).tolist(),
+        'open': candles[:, 1].tolist(),
+        'close': candles[:, 2].tolist(),
+        'high': candles[:, 3].tolist(),
+        'low': candles[:, 4].tolist(),
+        'volume': candles[:, 5].tolist(),
+    }
+
+
+def candles_to_bytes(candles: np.ndarray) -> bytes:
+    """
+    Binary transfer encoding: the six columns (timestamp in milliseconds, open, close,
+    high, low, volume) one after another as little-endian float64, which a browser
+    can read directly with a Float64Array.
+    """
+    return np.ascontiguousarray(candles.T, dtype='<f8').tobytes()
+
+
+def load_chart_data(session_id: str) -> Optional[dict]:
+    """
+    Returns the full chart data of a session in the same shape that the dashboard
+    expects from the legacy JSON column.
+    """
+    archive = _open(session_id)
+    if archive is None:
+        return None
+
+    with archive:
+        if not archive.meta['has_chart_data']:
+            return None
+        chart_data = _array_to_json(archive.get('chart_data'))
+
+    candles_chart = load_candles(session_id) or []
+    for route in candles_chart:
+        route['candles'] = candles_to_dicts(route['candles'])
+    chart_data['candles_chart'] = candles_chart
+
+    return chart_data
+
+
+def load_summary(session_id: str) -> Optional[dict]:
+    archive = _open(session_id)
+    if archive is None:
+        return None
+    with archive:
+        return {
+            'trades_count': archive.meta['trades_count'],
+            'has_chart_data': archive.meta['has_chart_data'],
+            'candles_chart': archive.meta['candles_chart'],
+        }
@@ -1,6 +1,7 @@
 import json
 
 import jesse.helpers as jh
+import numpy as np
 from jesse.models.BacktestSession import BacktestSession
 from jesse.models.ExchangeApiKeys import ExchangeApiKeys
 from jesse.models.MonteCarloSession import MonteCarloSession
@@ -169,24 +170,62 @@ def get_backtest_session(session: BacktestSession) -> dict:
     }
 
 
-def get_backtest_session_for_load_more(session: BacktestSession) -> dict:
+def get_backtest_session_for_load_more(
+        session: BacktestSession,
+        trades_page: int = 1,
+        trades_per_page: int = None,
+        equity_curve_start: float = None,
+        equity_curve_finish: float = None,
+        equity_curve_max_points: int = None
+) -> dict:
     """
-    Transform a BacktestSession model instance with full data for detailed view
+    Transform a BacktestSession model instance with full data for detailed view. Only
+    the requested range of the equity curve is decoded, and only one page of trades
+    if `trades_per_page` is passed (all of them otherwise).
     """
+    from jesse.services import session_artifacts
+
     # Parse JSON fields and clean infinite values
     metrics = jh.clean_infinite_values(json.loads(session.metrics)) if session.metrics else None
-    equity_curve = jh.clean_infinite_values(json.loads(session.equity_curve)) if session.equity_curve else []
-    trades = jh.clean_infinite_values(json.loads(session.trades)) if session.trades else []
     hyperparameters = jh.clean_infinite_values(json.loads(session.hyperparameters)) if session.hyperparameters else None
-    
+
+    # sessions stored before binary archives existed keep their results in the JSON columns
+    summary = session_artifacts.load_summary(str(session.id))
+    if summary is not None:
+        equity_curve = jh.clean_infinite_values(session_artifacts.load_equity_curve(
+            str(session.id), equity_curve_start, equity_curve_finish, equity_curve_max_points
+        ))
+        trades_result = session_artifacts.load_trades(
+            str(session.id), None if trades_per_page is None else trades_page, trades_per_page
+        )
+        trades = jh.clean_infinite_values(trades_result['trades'])
+        trades_total = trades_result['total']
+        has_chart_data = summary['has_chart_data']
+    else:
+        equity_curve = json.loads(session.equity_curve) if session.equity_curve else []
+        for series in equity_curve:
+            times = np.array([d['time'] for d in series['data']], dtype=np.float64)
+            left = 0 if equity_curve_start is None else int(np.searchsorted(times, equity_curve_start, side='left'))
+            right = len(times) if equity_curve_finish is None else int(np.searchsorted(times, equity_curve_finish, side='right'))
+            series['data'] = [series['data'][i] for i in session_artifacts.thin_indices(left, right, equity_curve_max_points)]
+        equity_curve = jh.clean_infinite_values(equity_curve)
+        trades = json.loads(session.trades) if session.trades else []
+        trades_total = len(trades)
+        if trades_per_page is not None:
+            start = (trades_page - 1) * trades_per_page
+            trades = trades[start:start + trades_per_page]
+        trades = jh.clean_infinite_values(trades)
+        has_chart_data = bool(session.chart_data)
+
     return {
         'id': str(session.id),
         'status': session.status,
         'metrics': metrics,
         'equity_curve': equity_curve,
         'trades': trades,
+        'trades_total': trades_total,
         'hyperparameters': hyperparameters,
-        'has_chart_data': bool(session.chart_data),
+        'has_chart_data': has_chart_data,
         'created_at': session.created_at,
         'updated_at': session.updated_at,
         'execution_duration': session.execution_duration,
@@ -2,7 +2,7 @@ from typing import Dict, List, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 fastapi_app = FastAPI()
 
@@ -18,6 +18,10 @@ fastapi_app.add_middleware(
     allow_headers=["*"],
 )
 
+# upper bounds of the paging and downsampling parameters of the session endpoints
+MAX_TRADES_PER_PAGE = 1000
+MAX_CHART_POINTS = 10_000
+
 
 class BacktestRequestJson(BaseModel):
     id: str
@@ -52,6 +56,24 @@ class OptimizationRequestJson(BaseModel):
     state: dict
 
 
+class WalkForwardOptimizationRequestJson(BaseModel):
+    id: str
+    exchange: str
+    routes: List[Dict[str, str]]
+    data_routes: List[Dict[str, str]]
+    config: dict
+    start_date: str
+    finish_date: str
+    folds: int = 5
+    training_ratio: float = 3
+    anchored: bool = False
+    trials_per_fold: Optional[int] = None
+    optimal_total: int
+    fast_mode: bool
+    cpu_cores: int
+    state: Optional[dict] = None
+
+
 class ImportCandlesRequestJson(BaseModel):
     id: str
     exchange: str
@@ -225,6 +247,33 @@ class GetBacktestSessionsRequestJson(BaseModel):
     date_filter: Optional[str] = None
 
 
+class GetBacktestSessionRequestJson(BaseModel):
+    # all trades unless a page is requested; the trades endpoint serves the others
+    trades_page: int = Field(1, ge=1)
+    trades_per_page: Optional[int] = Field(None, ge=1, le=MAX_TRADES_PER_PAGE)
+    # timestamps (in seconds) limiting the equity curve
+    equity_curve_start: Optional[float] = None
+    equity_curve_finish: Optional[float] = None
+    equity_curve_max_points: Optional[int] = Field(None, ge=1, le=MAX_CHART_POINTS)
+
+
+class GetBacktestSessionTradesRequestJson(BaseModel):
+    page: int = Field(1, ge=1)
+    per_page: int = Field(50, ge=1, le=MAX_TRADES_PER_PAGE)
+
+
+class GetBacktestSessionCandlesRequestJson(BaseModel):
+    exchange: Optional[str] = None
+    symbol: Optional[str] = None
+    timeframe: Optional[str] = None
+    start: Optional[int] = None
+    finish: Optional[int] = None
+    # downsample to (at most) this many candles, e.g. the chart's width in pixels
+    max_points: Optional[int] = Field(None, ge=1, le=MAX_CHART_POINTS)
+    # 'rows' (one dict per candle), 'columns' (parallel arrays) or 'binary'
+    format: str = 'rows'
+
+
 class UpdateBacktestSessionNotesRequestJson(BaseModel):
     id: str
     title: Optional[str] = None
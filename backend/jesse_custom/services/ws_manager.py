@@ -1,7 +1,8 @@
 import asyncio
 import json
 import time
-from typing import Set
+from collections import deque
+from typing import Dict
 
 import jesse.helpers as jh
 from jesse.services.multiprocessing import process_manager
@@ -9,9 +10,85 @@ from jesse.services.redis import async_redis
 from starlette.websockets import WebSocket
 
 
+class ConnectionWriter:
+    """
+    Sends pre-serialized messages to one websocket from its own task, so a slow
+    browser only delays its own messages instead of every client's and the Redis
+    listener.
+
+    The queue is bounded: once it's full, further events are dropped (and counted).
+    Progress events are coalesced: only the latest payload of each per session is
+    kept until the writer gets to it. Events that end a session are never dropped.
+    """
+    # events for which only the latest payload matters
+    COALESCED_EVENTS = {'progressbar', 'candles_progressbar', 'trades_progressbar', 'general_info'}
+    # events that end a session; these must never be dropped
+    CRITICAL_EVENTS = {'exception', 'termination', 'unexpectedTermination'}
+    # placeholder queued for a coalesced event; the payload is read from _latest
+    _COALESCED = object()
+
+    def __init__(self, websocket: WebSocket, on_error, maxsize: int = 1000) -> None:
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.dropped_count = 0
+        self._queue = deque()
+        self._latest = {}
+        self._ready = asyncio.Event()
+        self._on_error = on_error
+        self._task = asyncio.create_task(self._run())
+
+    def put(self, event: str, session_id, text: str) -> bool:
+        """
+        Queues a serialized message. Returns False if it was dropped.
+        """
+        if event in self.COALESCED_EVENTS:
+            key = (session_id, event)
+            is_pending = key in self._latest
+            self._latest[key] = text
+            if is_pending:
+                return True
+            item = (key, self._COALESCED)
+        else:
+            item = (None, text)
+
+        if len(self._queue) >= self.maxsize and event not in self.CRITICAL_EVENTS:
+            if item[1] is self._COALESCED:
+                self._latest.pop(item[0], None)
+            self.dropped_count += 1
+            return False
+
+        self._queue.append(item)
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        self._task.cancel()
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                while not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+
+                key, text = self._queue.popleft()
+                if text is self._COALESCED:
+                    text = self._latest.pop(key, None)
+                    if text is None:
+                        continue
+                await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            jh.terminal_debug(f"WebSocket send error: {str(e)}")
+            self._on_error(self.websocket)
+
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+        self.active_connections: Dict[WebSocket, ConnectionWriter] = {}
+        # events dropped because a connection's send queue was full
+        self.dropped_count = 0
         self.is_subscribed = False
         self.redis_subscriber = None
         self.reader_task = None
@@ -20,26 +97,31 @@ class ConnectionManager:
         
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.add(websocket)
+        self.active_connections[websocket] = ConnectionWriter(websocket, self.disconnect)
         await self.start_heartbeat()
         
     def disconnect(self, websocket: WebSocket):
-        # Use discard to avoid KeyError if already removed
-        self.active_connections.discard(websocket)
+        # Use pop to avoid KeyError if already removed
+        writer = self.active_connections.pop(websocket, None)
+        if writer is not None:
+            writer.close()
         
     async def broadcast(self, message: dict):
-        # Process id with the manager for each websocket separately
-        # Be resilient to per-connection send failures so a single bad client
-        # does not stop the Redis listener loop.
-        for connection in list(self.active_connections):
-            message_copy = dict(message)
-            message_copy['id'] = process_manager.get_client_id(message_copy['id'])
-            try:
-                await connection.send_json(message_copy)
-            except Exception as e:
-                # Drop the failing connection and continue broadcasting
-                jh.terminal_debug(f"WebSocket send error: {str(e)}")
-                self.disconnect(connection)
+        # Resolve the session id and serialize once (the same way send_json does),
+        # then hand the text to each connection's writer; a failing connection is
+        # dropped by its own writer without stopping the Redis listener loop.
+        message = dict(message)
+        message['id'] = process_manager.get_client_id(message['id'])
+        text = json.dumps(message, separators=(',', ':'), ensure_ascii=False)
+        event = str(message.get('event', '')).rsplit('.', 1)[-1]
+
+        for writer in list(self.active_connections.values()):
+            if not writer.put(event, message['id'], text):
+                self.dropped_count += 1
+                if self.dropped_count == 1 or self.dropped_count % 1000 == 0:
+                    jh.terminal_debug(
+                        f"WebSocket send queue is full; dropped {self.dropped_count} event(s) so far"
+                    )
             
     async def start_redis_listener(self, channel_pattern):
         # Start or restart the listener task if missing or completed
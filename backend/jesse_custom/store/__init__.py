@@ -87,6 +87,8 @@ class StoreClass:
 
     def __init__(self) -> None:
         self.vars = {}
+        # RouteHandle objects by exchange-symbol key, built when a simulation starts
+        self.route_handles = {}
 
     def reset(self, force_install_routes: bool = False) -> None:
         """
@@ -108,6 +110,7 @@ class StoreClass:
         self.tickers = TickersState()
         self.trades = TradesState()
         self.orderbooks = OrderbookState()
+        self.route_handles = {}
 
 
 store = StoreClass()
@@ -0,0 +1,127 @@
+from typing import Dict, List
+
+import jesse.helpers as jh
+import numpy as np
+from jesse.config import config
+from jesse.libs import DynamicNumpyArray
+from jesse.models import Order
+
+
+class RouteHandle:
+    """
+    Direct references to everything the simulation needs for one exchange-symbol pair:
+    its candle storages (one per considering timeframe), its position, its exchange and
+    the key of its order lists.
+
+    The store's getters build string keys and look them up on every call, which adds up
+    in the simulation loop where they are called for every route on every minute. Handles
+    are built once per run (see build_route_handles()), after the store has been reset and
+    the candle storages initiated, and are valid until the next store.reset().
+
+    Order lists are replaced (not mutated) whenever they're filtered, so they're looked up
+    by the precomputed key instead of being referenced directly.
+    """
+
+    def __init__(self, exchange: str, symbol: str, timeframe: str = None) -> None:
+        from jesse.store import store
+
+        self.exchange = exchange
+        self.symbol = symbol
+        # the trading timeframe; None for pairs that only have data routes
+        self.timeframe = timeframe
+        self.key = jh.key(exchange, symbol)
+        # timeframes of all the routes (trading and data) of this pair
+        self.route_timeframes: List[str] = []
+
+        self.candle_storages: Dict[str, DynamicNumpyArray] = {}
+        for tf in config['app']['considering_timeframes']:
+            storage_key = jh.key(exchange, symbol, tf)
+            if storage_key in store.candles.storage:
+                self.candle_storages[tf] = store.candles.storage[storage_key]
+        self.candles_1m = self.candle_storages['1m']
+
+        self.position = store.positions.storage.get(self.key, None)
+        self.exchange_object = store.exchanges.storage.get(exchange, None)
+
+        self._candles_state = store.candles
+        self._orders_state = store.orders
+
+    @property
+    def orders(self) -> List[Order]:
+        return self._orders_state.storage.get(self.key, [])
+
+    @property
+    def active_orders(self) -> List[Order]:
+        return self._orders_state.active_storage.get(self.key, [])
+
+    def update_active_orders(self) -> None:
+        self._orders_state.update_active_orders_by_key(self.key)
+
+    def get_candles(self, timeframe: str = None) -> np.ndarray:
+        if timeframe is None:
+            timeframe = self.timeframe
+        return self._candles_state.candles_from_storage(
+            self.candle_storages[timeframe], self.candles_1m, self.exchange, self.symbol, timeframe
+        )
+
+    def get_current_candle(self, timeframe: str = None) -> np.ndarray:
+        if timeframe is None:
+            timeframe = self.timeframe
+        return self._candles_state.current_candle_from_storage(
+            self.candle_storages[timeframe], self.candles_1m, timeframe
+        )
+
+    def add_candle(self, candle: np.ndarray, timeframe: str = '1m') -> None:
+        """
+        Same as store.candles.add_candle(..., with_execution=False, with_generation=False),
+        which is how the simulators add candles.
+        """
+        self._candles_state.add_candle(
+            candle, self.exchange, self.symbol, timeframe,
+            with_execution=False, with_generation=False, storage=self.candle_storages[timeframe]
+        )
+
+    def add_multiple_1m_candles(self, candles: np.ndarray) -> None:
+        self._candles_state.add_multiple_1m_candles(candles, self.exchange, self.symbol, storage=self.candles_1m)
+
+    def add_multiple_candles(self, candles: np.ndarray, timeframe: str) -> None:
+        """
+        Appends complete candles of a bigger timeframe at once; they must all be newer
+        than the last stored one, except the first one which may replace it. Used for
+        skipping idle bars in the simulator.
+        """
+        storage = self.candle_storages[timeframe]
+        # the forming candle is stored when an order executes in the middle of it
+        if len(candles) and len(storage) and storage[-1][0] == candles[0][0]:
+            storage[-1] = candles[0]
+            candles = candles[1:]
+        if len(candles):
+            storage.append_multiple(candles)
+
+
+def build_route_handles() -> Dict[str, RouteHandle]:
+    """
+    Builds a handle for each exchange-symbol pair of the routes (trading routes first, then
+    data routes), stores them in store.route_handles and attaches them to the trading routes.
+    """
+    from jesse.routes import router
+    from jesse.store import store
+
+    handles = {}
+    for r in router.routes:
+        handle = RouteHandle(r.exchange, r.symbol, r.timeframe)
+        handles[handle.key] = handle
+        r.handle = handle
+
+    for dr in router.data_candles:
+        key = jh.key(dr['exchange'], dr['symbol'])
+        if key not in handles:
+            handles[key] = RouteHandle(dr['exchange'], dr['symbol'])
+
+    for r in router.all_formatted_routes:
+        handle = handles[jh.key(r['exchange'], r['symbol'])]
+        if r['timeframe'] not in handle.route_timeframes:
+            handle.route_timeframes.append(r['timeframe'])
+
+    store.route_handles = handles
+    return handles
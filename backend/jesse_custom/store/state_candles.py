@@ -1,9 +1,11 @@
 from datetime import timedelta
+from typing import Optional
 
 import jesse.helpers as jh
 import jesse.services.selectors as selectors
 import numpy as np
 from jesse.config import config
+from jesse.constants import TIMEFRAME_TO_ONE_MINUTES
 from jesse.enums import timeframes
 from jesse.exceptions import RouteNotFound
 from jesse.libs import DynamicNumpyArray
@@ -13,11 +15,45 @@ from jesse.services.candle import generate_candle_from_one_minutes
 from timeloop import Timeloop
 
 
+class _FormingCandle:
+    """
+    The forming candle of one bigger-timeframe storage, as of the `short_count`-th 1m candle.
+    `prefix` is the candle made of the forming period's 1m candles except the last one, so
+    the last 1m candle can be replaced (as the simulators do with partial candles) without
+    going through the whole period again.
+    """
+    __slots__ = ('short_count', 'prefix', 'last', 'candle', 'long_count')
+
+    def __init__(self, short_count: int, prefix: Optional[np.ndarray], last: np.ndarray, candle: np.ndarray) -> None:
+        self.short_count = short_count
+        self.prefix = prefix
+        self.last = last
+        self.candle = candle
+        # length of the storage once `candle` has been written into it
+        self.long_count = None
+
+
+def _merge_one_minute_candle(candle: Optional[np.ndarray], one_minute_candle: np.ndarray) -> np.ndarray:
+    if candle is None:
+        return one_minute_candle.copy()
+
+    return np.array([
+        candle[0],
+        candle[1],
+        one_minute_candle[2],
+        max(candle[3], one_minute_candle[3]),
+        min(candle[4], one_minute_candle[4]),
+        candle[5] + one_minute_candle[5],
+    ])
+
+
 class CandlesState:
     def __init__(self) -> None:
         self.storage = {}
         self.are_all_initiated = False
         self.initiated_pairs = {}
+        # forming candles of bigger timeframes in backtests, by id() of their storage
+        self._forming_candles = {}
 
     def generate_new_candles_loop(self) -> None:
         """
@@ -105,8 +141,13 @@ class CandlesState:
             timeframe: str,
             with_execution: bool = True,
             with_generation: bool = True,
-            with_skip: bool = True
+            with_skip: bool = True,
+            storage: DynamicNumpyArray = None
     ) -> None:
+        """
+        `storage` may be passed by callers that already hold the route's storage (see
+        RouteHandle) to skip the key lookup.
+        """
         # overwrite with_generation based on the config value for live sessions
         if jh.is_live() and not jh.get_config('env.data.generate_candles_from_1m'):
             with_generation = False
@@ -118,7 +159,7 @@ class CandlesState:
                 )
             return
 
-        arr: DynamicNumpyArray = self.get_storage(exchange, symbol, timeframe)
+        arr: DynamicNumpyArray = storage if storage is not None else self.get_storage(exchange, symbol, timeframe)
 
         if jh.is_live():
             # ignore if candle is still being initially imported
@@ -166,6 +207,7 @@ class CandlesState:
 
         # allow updating of the previous candle.
         elif candle[0] < arr[-1][0]:
+            self._forming_candles.clear()
             # loop through the last 20 items in arr to find it. If so, update it.
             for i in range(max(20, len(arr) - 1)):
                 if arr[-i][0] == candle[0]:
@@ -327,74 +369,150 @@ class CandlesState:
     # # # # # getters
     # # # # # # # # #
     def get_candles(self, exchange: str, symbol: str, timeframe: str) -> np.ndarray:
+        if timeframe == '1m':
+            return self.candles_from_storage(self.get_storage(exchange, symbol, '1m'), None, exchange, symbol, '1m')
+
+        return self.candles_from_storage(
+            self.get_storage(exchange, symbol, timeframe), self.get_storage(exchange, symbol, '1m'),
+            exchange, symbol, timeframe
+        )
+
+    def candles_from_storage(
+            self,
+            arr: DynamicNumpyArray,
+            short_arr: Optional[DynamicNumpyArray],
+            exchange: str,
+            symbol: str,
+            timeframe: str
+    ) -> np.ndarray:
+        """
+        get_candles() for callers that already hold the storages of the route: `arr` is
+        the storage of `timeframe` and `short_arr` the one of its 1m candles.
+        """
         # no need to worry for forming candles when timeframe == 1m
         if timeframe == '1m':
-            arr: DynamicNumpyArray = self.get_storage(exchange, symbol, '1m')
             if len(arr) == 0:
                 return np.zeros((0, 6))
             else:
                 return arr[:]
 
         # other timeframes
-        dif, long_key, short_key = self.forming_estimation(exchange, symbol, timeframe)
-        long_count = len(self.get_storage(exchange, symbol, timeframe))
-        short_count = len(self.get_storage(exchange, symbol, '1m'))
+        long_count = len(arr)
+        short_count = len(short_arr)
+        dif = short_count % TIMEFRAME_TO_ONE_MINUTES[timeframe]
 
         if dif == 0 and long_count == 0:
             return np.zeros((0, 6))
 
         # complete candle
         if dif == 0:
-            return self.storage[long_key][:long_count]
+            return arr[:long_count]
         # generate forming candle only if NOT in live mode
         elif not jh.is_live():
-            forming_candle = generate_candle_from_one_minutes(
-                timeframe,
-                self.storage[short_key][short_count - dif:short_count],
-                True
-            )
-            existing_candles_arr: DynamicNumpyArray = self.storage[long_key]
-            self.add_candle(forming_candle, exchange, symbol, timeframe, with_execution=False, with_generation=False, with_skip=False)
-            return existing_candles_arr[:]
+            forming = self._forming_candle(arr, short_arr, timeframe, short_count, dif)
+            # already written into the storage by a previous call with the same 1m candles
+            if forming.long_count == long_count:
+                return arr[:]
+            self.add_candle(forming.candle, exchange, symbol, timeframe, with_execution=False, with_generation=False,
+                            with_skip=False, storage=arr)
+            forming.long_count = len(arr)
+            return arr[:]
         # in live mode, just return the complete candles
         else:
-            return self.storage[long_key][:long_count]
+            return arr[:long_count]
 
     def get_current_candle(self, exchange: str, symbol: str, timeframe: str) -> np.ndarray:
+        if timeframe == '1m':
+            return self.current_candle_from_storage(self.get_storage(exchange, symbol, '1m'), None, '1m')
+
+        return self.current_candle_from_storage(
+            self.get_storage(exchange, symbol, timeframe), self.get_storage(exchange, symbol, '1m'), timeframe
+        )
+
+    def current_candle_from_storage(
+            self,
+            arr: DynamicNumpyArray,
+            short_arr: Optional[DynamicNumpyArray],
+            timeframe: str
+    ) -> np.ndarray:
+        """
+        get_current_candle() for callers that already hold the storages of the route.
+        """
         # no need to worry for forming candles when timeframe == 1m
         if timeframe == '1m':
-            arr: DynamicNumpyArray = self.get_storage(exchange, symbol, '1m')
             if len(arr) == 0:
                 return np.zeros((0, 6))
             else:
                 return arr[-1]
 
         # other timeframes
-        dif, long_key, short_key = self.forming_estimation(exchange, symbol, timeframe)
-        long_count = len(self.get_storage(exchange, symbol, timeframe))
-        short_count = len(self.get_storage(exchange, symbol, '1m'))
+        long_count = len(arr)
+        short_count = len(short_arr)
+        dif = short_count % TIMEFRAME_TO_ONE_MINUTES[timeframe]
 
         # forming candle
+        if dif != 0 and not jh.is_live():
+            return self._forming_candle(arr, short_arr, timeframe, short_count, dif).candle.copy()
         if dif != 0:
             return generate_candle_from_one_minutes(
-                timeframe, self.storage[short_key][short_count - dif:short_count],
+                timeframe, short_arr[short_count - dif:short_count],
                 True
             )
         if long_count == 0:
             return np.zeros((0, 6))
         else:
-            return self.storage[long_key][-1]
+            return arr[-1]
+
+    def _forming_candle(
+            self,
+            arr: DynamicNumpyArray,
+            short_arr: DynamicNumpyArray,
+            timeframe: str,
+            short_count: int,
+            dif: int
+    ) -> _FormingCandle:
+        """
+        Returns the forming candle of `arr` made of the last `dif` 1m candles. It is cached
+        per storage, so repeated reads at the same 1m candle don't generate it again, and
+        it's updated incrementally as 1m candles are appended: only the newly completed
+        1m candle is merged into it.
+
+        Only used in backtests, where 1m candles are either appended or have their last
+        one replaced; anything else clears the cache.
+        """
+        last = short_arr[short_count - 1]
+        cached = self._forming_candles.get(id(arr))
+
+        if cached is not None and cached.short_count == short_count:
+            if np.array_equal(cached.last, last):
+                return cached
+            # the last 1m candle was replaced
+            prefix = cached.prefix
+        elif cached is not None and cached.short_count == short_count - 1 and dif > 1:
+            # one more 1m candle of the same period; the previous last one is complete now
+            prefix = _merge_one_minute_candle(cached.prefix, short_arr[short_count - 2])
+        elif dif > 1:
+            prefix = generate_candle_from_one_minutes(
+                timeframe, short_arr[short_count - dif:short_count - 1], True
+            )
+        else:
+            prefix = None
+
+        forming = _FormingCandle(short_count, prefix, last.copy(), _merge_one_minute_candle(prefix, last))
+        self._forming_candles[id(arr)] = forming
+        return forming
 
     def add_multiple_1m_candles(
         self,
         candles: np.ndarray,
         exchange: str,
         symbol: str,
+        storage: DynamicNumpyArray = None,
     ) -> None:
         if not (jh.is_backtesting() or jh.is_optimizing()):
             raise Exception('add_multiple_1m_candles() is for backtesting or optimizing only')
 
-        arr: DynamicNumpyArray = self.get_storage(exchange, symbol, '1m')
+        arr: DynamicNumpyArray = storage if storage is not None else self.get_storage(exchange, symbol, '1m')
 
         # initial
         if len(arr) == 0:
@@ -406,6 +524,8 @@ class CandlesState:
 
         # if it's the last candle again, update
         elif candles[0, 0] >= arr[-len(candles)][0] and candles[-1, 0] >= arr[-1][0]:
+            # more than the last 1m candle may change
+            self._forming_candles.clear()
             override_candles = int(
                 len(candles) - ((candles[-1, 0] - arr[-1][0]) / 60000)
             )
@@ -163,10 +163,12 @@ class OrdersState:
         return exit_orders
 
     def update_active_orders(self, exchange: str, symbol: str):
-        key = f'{exchange}-{symbol}'
+        self.update_active_orders_by_key(f'{exchange}-{symbol}')
+
+    def update_active_orders_by_key(self, key: str):
         active_orders = [
             order
-            for order in self.get_active_orders(exchange, symbol)
+            for order in self.active_storage.get(key, [])
             if not order.is_canceled and not order.is_executed
         ]
         self.active_storage[key] = active_orders
@@ -71,6 +71,8 @@ class Strategy(ABC):
 
         self.position: Position = None
         self.broker = None
+        # RouteHandle of the route; only set in backtests (see build_route_handles())
+        self.handle = None
 
         self._cached_methods = {}
         self._cached_metrics = {}
@@ -82,6 +84,21 @@ class Strategy(ABC):
     def candles_pipeline(self) -> Optional[BaseCandlesPipeline]:
         return None
 
+    def precompute_signals(self, candles: np.ndarray) -> Optional[dict]:
+        """
+        Opt-in for the signal precompute mode of fast-mode backtests. `candles` are all the
+        candles of the route's timeframe (warmup candles included) for the whole backtest.
+        Return {'long': ..., 'short': ...} boolean arrays of the same length, where item
+        i is what should_long()/should_short() would return when candles[i] is the last
+        closed candle (typically built from indicators computed with sequential=True).
+
+        The signals must not depend on the position's state: while every route is flat
+        and has no orders, the bars without a signal are simulated in bulk and the
+        strategy is not executed on them (so neither are before() and after()).
+        should_long() and should_short() still decide on the bars with a signal.
+        """
+        return None
+
     def add_line_to_candle_chart(self, title: str, value: float, color=None) -> None:
         # validate value's type
         if not isinstance(value, (int, float)):
@@ -1067,6 +1084,8 @@ class Strategy(ABC):
 
         :return: np.ndarray
         """
+        if self.handle is not None:
+            return self.handle.get_current_candle().copy()
         return store.candles.get_current_candle(self.exchange, self.symbol, self.timeframe).copy()
 
     @property
@@ -1141,6 +1160,8 @@ class Strategy(ABC):
 
         :return: np.ndarray
         """
+        if self.handle is not None:
+            return self.handle.get_candles()
         return store.candles.get_candles(self.exchange, self.symbol, self.timeframe)
 
     def get_candles(self, exchange: str, symbol: str, timeframe: str) -> np.ndarray:
@@ -1425,6 +1446,8 @@ class Strategy(ABC):
         """
         Returns all the orders submitted by for this strategy.
         """
+        if self.handle is not None:
+            return self.handle.orders
         return store.orders.get_orders(self.exchange, self.symbol)
 
     @property
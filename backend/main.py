@@ -26,8 +26,10 @@ from app.api.journal import router as journal_router
 from app.api.payments import router as payments_router
 from app.api.admin import router as admin_router
 from app.core.database import init_db
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import password_hasher, token_cache
 from app.core.middleware import LatencyGuardMiddleware
-from app.jobs.leaderboard import update_leaderboard
+from app.jobs.leaderboard import REFRESH_SECONDS, close_redis, update_leaderboard
 from jesse_custom.engine import get_portfolio_manager
 from jesse_custom.exchange import get_paper_exchange
 from services.market_stream import MarketStreamService
@@ -69,7 +71,13 @@ async def lifespan(app: FastAPI):
     get_portfolio_manager()
     
     # Initialize paper exchange (singleton)
-    get_paper_exchange()
+    paper_exchange = get_paper_exchange()
+
+    # Restore portfolios, positions and resting orders before prices flow
+    try:
+        await paper_exchange.rehydrate()
+    except Exception as e:
+        logger.error(f"Failed to rehydrate trading engine: {e}")
     
     # Initialize market stream service
     market_stream = MarketStreamService()
@@ -92,6 +100,7 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutting down Terminal Zero API...")
     if market_stream:
         await market_stream.stop()
+    await close_redis()
 
 
 async def scheduler_loop():
@@ -102,8 +111,8 @@ async def scheduler_loop():
         except Exception as e:
             logger.error(f"Scheduler error: {e}")
         
-        # Run every hour
-        await asyncio.sleep(3600)
+        # Cheap: the board is kept up to date as trades close (see app.jobs.leaderboard)
+        await asyncio.sleep(REFRESH_SECONDS)
 
 
 async def price_update_forwarder():
@@ -184,6 +193,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include trading routes
@@ -206,8 +216,11 @@ async def health_check():
         "version": "0.2.0",
         "trading_engine": {
             "active_portfolios": stats["active_portfolios"],
-            "current_prices": stats["current_prices"]
-        }
+            "current_prices": stats["current_prices"],
+            "rehydration": get_paper_exchange().rehydration_stats,
+        },
+        "password_hashing": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
     }
 
 
@@ -231,17 +244,15 @@ async def get_historical_klines(
     
     if not market_stream:
         return {"error": "Market stream not initialized"}
+
+    if not market_stream.is_supported(symbol, interval):
+        return {"error": f"Unsupported symbol or interval: {symbol} {interval}"}
     
-    if extended:
-        # Extended mode: fetch up to 1000 candles via pagination
-        candles = await market_stream.get_extended_historical_klines(
-            symbol.upper(), interval, min(limit, 1000)
-        )
-    else:
-        # Normal mode: single API call, max 200
-        candles = await market_stream.get_historical_klines(
-            symbol.upper(), interval, min(limit, 200)
-        )
+    # Extended mode serves up to 1000 candles, normal mode up to 200. Both come from
+    # the market stream's in-memory buffer, backfilled from Bybit when needed
+    candles = await market_stream.get_klines(
+        symbol.upper(), interval, min(limit, 1000 if extended else 200)
+    )
     
     return {
         "symbol": symbol.upper(),
@@ -285,6 +296,10 @@ async def ticker_websocket(websocket: WebSocket, symbol: str, interval: str = "1
         symbol: Trading pair (e.g., BTCUSDT)
         interval: Timeframe - 1, 3, 5, 15, 30, 60, 120, 240, D, W (default: 1)
     """
+    if not market_stream or not market_stream.is_supported(symbol, interval):
+        await websocket.close(code=1008)
+        return
+
     await websocket.accept()
     logger.info(f"📡 Client connected for {symbol} ({interval}m)")
     
@@ -335,7 +350,7 @@ async def portfolio_websocket(websocket: WebSocket, user_id: str = None):
     # Send initial state
     await websocket.send_json({
         "type": "portfolio_snapshot",
-        "data": portfolio.to_dict()
+        "data": portfolio.snapshot()
     })
     
     # Create update queue and subscribe
@@ -5,13 +5,16 @@ Connects to Bybit WebSocket and streams real-time price data
 
 import asyncio
 import json
+from collections import deque
 from datetime import datetime
-from typing import Dict, Set
+from typing import Deque, Dict, Optional, Set, Tuple
 
 import httpx
 import websockets
 from loguru import logger
 
+from app.core.config import SUPPORTED_SYMBOLS
+
 
 class MarketStreamService:
     """
@@ -22,6 +25,9 @@ class MarketStreamService:
     BYBIT_WS_URL = "wss://stream.bybit.com/v5/public/linear"
     BYBIT_REST_URL = "https://api.bybit.com"
     
+    # Bybit symbols of the supported trading pairs (e.g. BTC-USDT -> BTCUSDT)
+    SYMBOLS = frozenset(s.replace("-", "") for s in SUPPORTED_SYMBOLS)
+
     # Supported timeframes mapping to Bybit intervals
     TIMEFRAMES = {
         "1": "1",      # 1 minute
@@ -35,7 +41,24 @@ class MarketStreamService:
         "D": "D",      # 1 day
         "W": "W",      # 1 week
     }
-    
+
+    # Length of each interval in seconds, used to detect gaps in the kline stream
+    INTERVAL_SECONDS = {
+        "1": 60,
+        "3": 180,
+        "5": 300,
+        "15": 900,
+        "30": 1800,
+        "60": 3600,
+        "120": 7200,
+        "240": 14400,
+        "D": 86400,
+        "W": 604800,
+    }
+
+    # Candles kept in memory per symbol:interval (the most /api/market/klines serves)
+    KLINE_BUFFER_SIZE = 1000
+
     def __init__(self):
         self.running = False
         self.ws = None
@@ -47,7 +70,27 @@ class MarketStreamService:
         self.ath_atl_data: Dict[str, dict] = {}
         # Active subscriptions to Bybit
         self.active_bybit_subs: Set[str] = set()
-        
+        # Recent candles per symbol:interval (oldest first), kept current by the stream
+        self.kline_buffers: Dict[str, Deque[dict]] = {}
+        # symbol:interval keys whose buffer has been backfilled from REST
+        self.seeded_klines: Set[str] = set()
+        # Largest limit a backfill asked for and got the whole (shorter) history of the
+        # symbol:interval instead, per symbol:interval; up to it the buffer holds all there is
+        self.kline_history_depth: Dict[str, int] = {}
+        # In-flight backfills per symbol:interval, as (limit, task)
+        self._kline_backfills: Dict[str, Tuple[int, asyncio.Task]] = {}
+        # Shared HTTP client for all REST calls (keeps connections alive)
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._http_client
+
     async def start(self):
         """Start the market stream connection"""
         self.running = True
@@ -68,34 +111,22 @@ class MarketStreamService:
     async def _fetch_ath_atl(self, symbol: str):
         """Fetch All-Time High and All-Time Low from Bybit REST API"""
         try:
-            async with httpx.AsyncClient() as client:
-                # Get weekly klines for ATH/ATL estimation (max history)
-                url = f"{self.BYBIT_REST_URL}/v5/market/kline"
-                params = {
-                    "category": "linear",
-                    "symbol": symbol,
-                    "interval": "W",
-                    "limit": 200  # Get max history
+            # Get weekly klines for ATH/ATL estimation (max history)
+            klines = await self._fetch_klines_page(symbol, "W", 200)
+            if klines:
+                # Format: [time, open, high, low, close, vol, turnover]
+                highs = [float(k[2]) for k in klines]
+                lows = [float(k[3]) for k in klines]
+
+                self.ath_atl_data[symbol] = {
+                    "ath": max(highs),
+                    "atl": min(lows),
+                    "updated": datetime.now().isoformat()
                 }
-                response = await client.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("retCode") == 0:
-                        klines = data.get("result", {}).get("list", [])
-                        if klines:
-                            # Format: [time, open, high, low, close, vol, turnover]
-                            highs = [float(k[2]) for k in klines]
-                            lows = [float(k[3]) for k in klines]
-                            
-                            self.ath_atl_data[symbol] = {
-                                "ath": max(highs),
-                                "atl": min(lows),
-                                "updated": datetime.now().isoformat()
-                            }
-                            logger.info(
-                                f"📊 {symbol} ATH: ${max(highs):,.2f}, "
-                                f"ATL: ${min(lows):,.2f}"
-                            )
+                logger.info(
+                    f"📊 {symbol} ATH: ${max(highs):,.2f}, "
+                    f"ATL: ${min(lows):,.2f}"
+                )
         except Exception as e:
             logger.error(f"Error fetching ATH/ATL for {symbol}: {e}")
 
@@ -104,35 +135,57 @@ class MarketStreamService:
     ):
         """Fetch historical klines from Bybit REST API"""
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{self.BYBIT_REST_URL}/v5/market/kline"
-                params = {
-                    "category": "linear",
-                    "symbol": symbol,
-                    "interval": interval,
-                    "limit": min(limit, 200)  # Bybit max is 200 per request
-                }
-                response = await client.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("retCode") == 0:
-                        klines = data.get("result", {}).get("list", [])
-                        # Convert to chart format and reverse (oldest first)
-                        candles = []
-                        for k in reversed(klines):
-                            candles.append({
-                                "time": int(k[0]) // 1000,
-                                "open": float(k[1]),
-                                "high": float(k[2]),
-                                "low": float(k[3]),
-                                "close": float(k[4]),
-                                "volume": float(k[5])
-                            })
-                        return candles
+            # Bybit max is 200 per request
+            klines = await self._fetch_klines_page(symbol, interval, min(limit, 200))
+            if klines is not None:
+                # Convert to chart format and reverse (oldest first)
+                return [self._format_rest_kline(k) for k in reversed(klines)]
         except Exception as e:
             logger.error(f"Error fetching historical klines: {e}")
         return []
 
+    async def _fetch_klines_page(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int,
+        end_time: Optional[int] = None,
+    ) -> Optional[list]:
+        """
+        Fetch one page of raw klines (newest first) from Bybit REST API.
+        Returns None if the request failed.
+        """
+        params = {
+            "category": "linear",
+            "symbol": symbol,
+            "interval": interval,
+            "limit": limit,
+        }
+        if end_time:
+            params["end"] = end_time
+
+        response = await self._get_http_client().get(
+            f"{self.BYBIT_REST_URL}/v5/market/kline", params=params
+        )
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        if data.get("retCode") != 0:
+            return None
+        return data.get("result", {}).get("list", [])
+
+    @staticmethod
+    def _format_rest_kline(k: list) -> dict:
+        """Convert a Bybit REST kline to chart format"""
+        return {
+            "time": int(k[0]) // 1000,
+            "open": float(k[1]),
+            "high": float(k[2]),
+            "low": float(k[3]),
+            "close": float(k[4]),
+            "volume": float(k[5])
+        }
+
     async def get_extended_historical_klines(
         self, symbol: str, interval: str = "1", limit: int = 1000
     ):
@@ -145,69 +198,173 @@ class MarketStreamService:
             interval: Timeframe - 1, 3, 5, 15, 30, 60, 120, 240, D, W
             limit: Total candles to fetch (multiple requests if > 200)
         """
+        candles, _ = await self._fetch_kline_history(symbol, interval, limit)
+        return candles
+
+    async def _fetch_kline_history(
+        self, symbol: str, interval: str, limit: int
+    ) -> Tuple[list, bool]:
+        """
+        Fetch the last `limit` klines (oldest first) page by page, and whether Bybit
+        ran out of history before `limit` (as opposed to a request failing)
+        """
         all_candles = []
         remaining = limit
         end_time = None  # Start from current time
-        
+        exhausted = False
+
         try:
-            async with httpx.AsyncClient() as client:
-                while remaining > 0:
-                    batch_limit = min(remaining, 200)
-                    url = f"{self.BYBIT_REST_URL}/v5/market/kline"
-                    params = {
-                        "category": "linear",
-                        "symbol": symbol,
-                        "interval": interval,
-                        "limit": batch_limit
-                    }
-                    
-                    # Add end time for pagination (fetch older data)
-                    if end_time:
-                        params["end"] = end_time
-                    
-                    response = await client.get(url, params=params)
-                    if response.status_code != 200:
-                        break
-                        
-                    data = response.json()
-                    if data.get("retCode") != 0:
-                        break
-                        
-                    klines = data.get("result", {}).get("list", [])
-                    if not klines:
-                        break
-                    
-                    # Convert to chart format
-                    batch_candles = []
-                    for k in klines:
-                        batch_candles.append({
-                            "time": int(k[0]) // 1000,
-                            "open": float(k[1]),
-                            "high": float(k[2]),
-                            "low": float(k[3]),
-                            "close": float(k[4]),
-                            "volume": float(k[5])
-                        })
-                    
-                    # Prepend older candles (klines come newest-first from API)
-                    all_candles = batch_candles + all_candles
-                    
-                    # Set end_time for next batch (oldest candle's start time - 1ms)
-                    oldest_candle_time = int(klines[-1][0])
-                    end_time = oldest_candle_time - 1
-                    
-                    remaining -= len(klines)
-                    
-                    # Avoid rate limiting
-                    if remaining > 0:
-                        await asyncio.sleep(0.1)
-                        
+            while remaining > 0:
+                # Add end time for pagination (fetch older data)
+                page_size = min(remaining, 200)
+                klines = await self._fetch_klines_page(
+                    symbol, interval, page_size, end_time
+                )
+                if klines is None:
+                    break
+                if len(klines) < page_size:
+                    exhausted = True
+                if not klines:
+                    break
+
+                # Prepend older candles (klines come newest-first from API)
+                all_candles = [self._format_rest_kline(k) for k in klines] + all_candles
+
+                # Set end_time for next batch (oldest candle's start time - 1ms)
+                oldest_candle_time = int(klines[-1][0])
+                end_time = oldest_candle_time - 1
+
+                remaining -= len(klines)
+                if exhausted:
+                    break
+
+                # Avoid rate limiting
+                if remaining > 0:
+                    await asyncio.sleep(0.1)
+
         except Exception as e:
             logger.error(f"Error fetching extended historical klines: {e}")
-        
+
         # Return in chronological order (oldest first)
         all_candles.sort(key=lambda x: x["time"])
-        return all_candles
+        return all_candles, exhausted
+
+    def is_supported(self, symbol: str, interval: str) -> bool:
+        """Whether a symbol/interval can be streamed and buffered"""
+        return symbol.upper() in self.SYMBOLS and interval in self.TIMEFRAMES
+
+    async def get_klines(self, symbol: str, interval: str = "1", limit: int = 200):
+        """
+        Return the last `limit` candles for a symbol/interval, oldest first.
+
+        Served from the in-memory buffer when it's backfilled and kept current by the
+        WebSocket stream. Otherwise the buffer is backfilled from REST first (once for
+        concurrent requests of the same symbol/interval) and the stream is subscribed
+        so that later requests don't hit Bybit at all.
+
+        Only supported symbols and intervals are served, so buffers and Bybit
+        subscriptions are bounded by SYMBOLS x TIMEFRAMES.
+        """
+        symbol = symbol.upper()
+        if not self.is_supported(symbol, interval):
+            raise ValueError(f"Unsupported symbol/interval: {symbol} {interval}")
+        if limit > self.KLINE_BUFFER_SIZE:
+            return await self.get_extended_historical_klines(symbol, interval, limit)
+
+        sub_key = f"{symbol}:{interval}"
+        if not self._is_kline_buffer_fresh(sub_key, limit):
+            await self._backfill_klines(symbol, interval, limit)
+
+        buffer = self.kline_buffers.get(sub_key)
+        if not buffer:
+            return []
+        return list(buffer)[-limit:]
+
+    def _is_kline_buffer_fresh(self, sub_key: str, limit: int) -> bool:
+        symbol, interval = sub_key.split(":")
+        return (
+            sub_key in self.seeded_klines
+            and f"kline.{interval}.{symbol}" in self.active_bybit_subs
+            and (
+                len(self.kline_buffers.get(sub_key, ())) >= limit
+                or limit <= self.kline_history_depth.get(sub_key, 0)
+            )
+        )
+
+    async def _backfill_klines(self, symbol: str, interval: str, limit: int):
+        """Backfill a kline buffer, sharing the fetch with concurrent callers"""
+        if not self.is_supported(symbol, interval):
+            raise ValueError(f"Unsupported symbol/interval: {symbol} {interval}")
+        sub_key = f"{symbol}:{interval}"
+        in_flight = self._kline_backfills.get(sub_key)
+        if in_flight is None or in_flight[0] < limit:
+            task = asyncio.create_task(self._seed_kline_buffer(symbol, interval, limit))
+            self._kline_backfills[sub_key] = (limit, task)
+
+            def _forget(t: asyncio.Task, key: str = sub_key):
+                if self._kline_backfills.get(key, (None, None))[1] is t:
+                    del self._kline_backfills[key]
+
+            task.add_done_callback(_forget)
+            in_flight = (limit, task)
+
+        # shielded: a client going away must not cancel the fetch for the others
+        await asyncio.shield(in_flight[1])
+
+    async def _seed_kline_buffer(self, symbol: str, interval: str, limit: int):
+        sub_key = f"{symbol}:{interval}"
+
+        # Subscribe first so no update is missed between the REST snapshot and
+        # the stream
+        if self.ws:
+            try:
+                await self._subscribe_to_bybit(symbol, interval)
+            except Exception as e:
+                logger.warning(f"Could not subscribe to {sub_key} klines: {e}")
+
+        candles, exhausted = await self._fetch_kline_history(symbol, interval, limit)
+        if not candles:
+            return
+
+        # Candles streamed while fetching are newer than (or update) the snapshot
+        merged = {c["time"]: c for c in candles}
+        for c in self.kline_buffers.get(sub_key, ()):
+            if c["time"] >= candles[-1]["time"]:
+                merged[c["time"]] = c
+
+        self.kline_buffers[sub_key] = deque(
+            (merged[t] for t in sorted(merged)), maxlen=self.KLINE_BUFFER_SIZE
+        )
+        if exhausted:
+            # Bybit has no older candles (e.g. the few hundred weeks of "W"), so
+            # asking REST again for this many would return the same
+            self.kline_history_depth[sub_key] = max(limit, self.kline_history_depth.get(sub_key, 0))
+        self.seeded_klines.add(sub_key)
+        logger.debug(f"Backfilled {len(merged)} {sub_key} klines")
+
+    def _update_kline_buffer(self, sub_key: str, interval: str, candle: dict):
+        """Apply a streamed candle to the buffer of its symbol:interval"""
+        buffer = self.kline_buffers.get(sub_key)
+        if buffer is None:
+            buffer = self.kline_buffers[sub_key] = deque(maxlen=self.KLINE_BUFFER_SIZE)
+
+        entry = {
+            "time": candle["time"],
+            "open": candle["open"],
+            "high": candle["high"],
+            "low": candle["low"],
+            "close": candle["close"],
+            "volume": candle["volume"],
+        }
+
+        if not buffer or entry["time"] > buffer[-1]["time"]:
+            step = self.INTERVAL_SECONDS.get(interval)
+            if buffer and step and entry["time"] - buffer[-1]["time"] > step:
+                # Missed candles: serve from REST again until backfilled
+                self.seeded_klines.discard(sub_key)
+            buffer.append(entry)
+        elif entry["time"] == buffer[-1]["time"]:
+            buffer[-1] = entry
     
     async def _connect(self):
         """Establish WebSocket connection to Bybit"""
@@ -216,14 +373,26 @@ class MarketStreamService:
         async with websockets.connect(self.BYBIT_WS_URL) as ws:
             self.ws = ws
             logger.info("✅ Connected to Bybit WebSocket")
-            
-            # Subscribe to default symbols with 1-minute interval
-            await self._subscribe_to_bybit("BTCUSDT", "1")
-            await self._subscribe_to_bybit("ETHUSDT", "1")
-            
-            # Process incoming messages
-            async for message in ws:
-                await self._handle_message(message)
+
+            try:
+                # Subscribe to default symbols with 1-minute interval
+                await self._subscribe_to_bybit("BTCUSDT", "1")
+                await self._subscribe_to_bybit("ETHUSDT", "1")
+
+                # Resubscribe intervals whose buffers were in use before a reconnect
+                for sub_key in list(self.kline_buffers):
+                    symbol, interval = sub_key.split(":")
+                    await self._subscribe_to_bybit(symbol, interval)
+
+                # Process incoming messages
+                async for message in ws:
+                    await self._handle_message(message)
+            finally:
+                # Subscriptions die with the connection, and the buffers may miss
+                # candles until the next backfill
+                self.ws = None
+                self.active_bybit_subs.clear()
+                self.seeded_klines.clear()
     
     async def _subscribe_to_bybit(self, symbol: str, interval: str = "1"):
         """Subscribe to a symbol/interval on Bybit"""
@@ -295,6 +464,7 @@ class MarketStreamService:
             # Store current candle with symbol:interval key
             sub_key = f"{symbol}:{interval}"
             self.current_candles[sub_key] = candle
+            self._update_kline_buffer(sub_key, interval, candle)
             
             # Also store for legacy symbol-only subscriptions
             self.current_candles[symbol] = candle
@@ -324,6 +494,8 @@ class MarketStreamService:
     async def subscribe(self, symbol: str, queue: asyncio.Queue, interval: str = "1"):
         """Subscribe a client queue to a symbol with specific interval"""
         symbol = symbol.upper()
+        if not self.is_supported(symbol, interval):
+            raise ValueError(f"Unsupported symbol/interval: {symbol} {interval}")
         sub_key = f"{symbol}:{interval}"
         
         if sub_key not in self.subscribers:
@@ -358,3 +530,5 @@ class MarketStreamService:
         self.running = False
         if self.ws:
             await self.ws.close()
+        if self._http_client is not None:
+            await self._http_client.aclose()
@@ -0,0 +1,250 @@
+"""
+Unit tests for the fixed-point position engine.
+
+Every expected value is computed the way the Decimal engine did before positions
+moved to integer ticks, lots and quote units, at tick-aligned prices and
+lot-aligned quantities, so the integer results must match it to the cent
+(to 8 decimals, the precision of the database columns).
+"""
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import pytest
+
+# the engine reads its settings from app.core, whose package imports the database
+pytest.importorskip("sqlalchemy")
+
+from app.core.config import OrderSide, PositionSide  # noqa: E402
+from jesse_custom.engine import UserPortfolio, UserPosition  # noqa: E402
+from jesse_custom.engine.fixed_point import (  # noqa: E402
+    div_round,
+    quote_decimal,
+    quote_units,
+)
+from jesse_custom.engine.user_position import MAINTENANCE_MARGIN_RATE  # noqa: E402
+
+EIGHT_DECIMALS = Decimal("0.00000001")
+
+
+def q8(value: Decimal) -> Decimal:
+    """Round a Decimal result to the engine's quote precision"""
+    return value.quantize(EIGHT_DECIMALS, rounding=ROUND_HALF_EVEN)
+
+
+def decimal_liquidation_price(side: PositionSide, entry: Decimal, leverage: int) -> Decimal:
+    initial_margin_rate = Decimal("1") / Decimal(leverage)
+    if side == PositionSide.LONG:
+        return entry * (1 - initial_margin_rate + MAINTENANCE_MARGIN_RATE)
+    return entry * (1 + initial_margin_rate - MAINTENANCE_MARGIN_RATE)
+
+
+def open_btc(side: PositionSide, qty: str, price: str, leverage: int = 10) -> UserPosition:
+    position = UserPosition(symbol="BTC-USDT", leverage=leverage)
+    spec = position.spec
+    position.open_position(
+        side, spec.qty_to_lots(Decimal(qty)), spec.price_to_ticks(Decimal(price)), leverage
+    )
+    return position
+
+
+class TestDivRound:
+    """div_round() must round like Decimal's default (half to even)."""
+
+    @pytest.mark.parametrize("numerator, denominator", [
+        (5, 2), (7, 2), (-5, 2), (-7, 2), (1, 3), (2, 3), (-2, 3), (-1, 3),
+        (10, 5), (0, 7), (25, 10), (35, 10), (-25, 10), (123456789, 1000),
+    ])
+    def test_matches_decimal(self, numerator, denominator):
+        expected = (Decimal(numerator) / Decimal(denominator)).quantize(
+            Decimal("1"), rounding=ROUND_HALF_EVEN
+        )
+        assert div_round(numerator, denominator) == int(expected)
+
+
+class TestPositionPnL:
+    """Open, increase, reduce and close against the Decimal formulas."""
+
+    def test_open_long_unrealized(self):
+        position = open_btc(PositionSide.LONG, "0.02", "100000.0")
+        position.update_price(Decimal("100250.5"))
+
+        expected = (Decimal("100250.5") - Decimal("100000.0")) * Decimal("0.02")
+        assert position.unrealized_pnl == q8(expected)
+        assert position.margin_used == q8(Decimal("0.02") * Decimal("100000.0") / 10)
+
+    def test_open_short_unrealized(self):
+        position = open_btc(PositionSide.SHORT, "0.015", "98765.4")
+        position.update_price(Decimal("99000.1"))
+
+        expected = -(Decimal("99000.1") - Decimal("98765.4")) * Decimal("0.015")
+        assert position.unrealized_pnl == q8(expected)
+
+    def test_increase_averages_entry(self):
+        position = open_btc(PositionSide.LONG, "0.01", "100000.0")
+        spec = position.spec
+        position.increase_position(
+            spec.qty_to_lots(Decimal("0.02")), spec.price_to_ticks(Decimal("100300.1"))
+        )
+        position.update_price(Decimal("100100.0"))
+
+        entry = (
+            Decimal("0.01") * Decimal("100000.0") + Decimal("0.02") * Decimal("100300.1")
+        ) / Decimal("0.03")
+        assert position.qty == Decimal("0.03")
+        assert q8(position.entry_price) == q8(entry)
+        assert position.unrealized_pnl == q8((Decimal("100100.0") - entry) * Decimal("0.03"))
+
+    def test_reduce_realizes_closed_portion(self):
+        position = open_btc(PositionSide.LONG, "0.01", "100000.0")
+        spec = position.spec
+        position.increase_position(
+            spec.qty_to_lots(Decimal("0.02")), spec.price_to_ticks(Decimal("100300.1"))
+        )
+        entry = (
+            Decimal("0.01") * Decimal("100000.0") + Decimal("0.02") * Decimal("100300.1")
+        ) / Decimal("0.03")
+
+        realized = position.reduce_position(
+            spec.qty_to_lots(Decimal("0.01")), spec.price_to_ticks(Decimal("100500.0"))
+        )
+
+        expected = (Decimal("100500.0") - entry) * Decimal("0.01")
+        assert quote_decimal(realized) == q8(expected)
+        assert position.realized_pnl == q8(expected)
+        assert position.qty == Decimal("0.02")
+
+    def test_close_short(self):
+        position = open_btc(PositionSide.SHORT, "0.005", "100000.0")
+        realized = position.close_position(position.spec.price_to_ticks(Decimal("97500.3")))
+
+        expected = -(Decimal("97500.3") - Decimal("100000.0")) * Decimal("0.005")
+        assert quote_decimal(realized) == q8(expected)
+        assert position.side == PositionSide.FLAT
+        assert position.qty == 0
+        assert position.liquidation_price is None
+
+
+class TestPortfolioFills:
+    """Balances after fills, fees included, against the Decimal formulas."""
+
+    def test_open_and_close_with_fees(self):
+        portfolio = UserPortfolio(balance=Decimal("10000"), leverage=10)
+        fee_rate = portfolio.fee_rate
+
+        portfolio.open_position("BTC-USDT", OrderSide.BUY, Decimal("0.02"), Decimal("100000.0"))
+        success, _, realized = portfolio.close_position(
+            "BTC-USDT", Decimal("0.02"), Decimal("101234.5")
+        )
+
+        open_fee = Decimal("0.02") * Decimal("100000.0") * fee_rate
+        close_fee = Decimal("0.02") * Decimal("101234.5") * fee_rate
+        pnl = (Decimal("101234.5") - Decimal("100000.0")) * Decimal("0.02")
+        assert success
+        assert realized == q8(pnl)
+        assert portfolio.balance == q8(Decimal("10000") - open_fee + pnl - close_fee)
+        assert portfolio.total_margin_used == 0
+
+    def test_flip_opens_only_the_remaining_quantity(self):
+        portfolio = UserPortfolio(balance=Decimal("10000"), leverage=10)
+        fee_rate = portfolio.fee_rate
+
+        portfolio.open_position("BTC-USDT", OrderSide.BUY, Decimal("0.01"), Decimal("100000.0"))
+        portfolio.open_position("ETH-USDT", OrderSide.SELL, Decimal("0.5"), Decimal("3000.00"))
+        portfolio.open_position("BTC-USDT", OrderSide.SELL, Decimal("0.03"), Decimal("101000.0"))
+
+        position = portfolio.get_position("BTC-USDT")
+        assert position.side == PositionSide.SHORT
+        # the sell closes the 0.01 long; only the other 0.02 opens the short
+        assert position.qty == Decimal("0.02")
+        assert position.entry_price == Decimal("101000.0")
+
+        fees = (
+            Decimal("0.01") * Decimal("100000.0")
+            + Decimal("0.5") * Decimal("3000.00")
+            + Decimal("0.03") * Decimal("101000.0")
+        ) * fee_rate
+        pnl = (Decimal("101000.0") - Decimal("100000.0")) * Decimal("0.01")
+        assert portfolio.balance == q8(Decimal("10000") - fees + pnl)
+        assert portfolio.total_margin_used == q8(
+            Decimal("0.02") * Decimal("101000.0") / 10 + Decimal("0.5") * Decimal("3000.00") / 10
+        )
+
+
+class TestFeeUnits:
+    """_fee_units() rounds half to even like Decimal, for any fee rate."""
+
+    @pytest.mark.parametrize("fee_rate", ["0.0006", "0.00055", "0.000375"])
+    @pytest.mark.parametrize("notional", [
+        "1.0001", "12.3457", "0.00000001", "2000.5", "99999.99999999", "0.00545455",
+    ])
+    def test_matches_decimal(self, fee_rate, notional):
+        portfolio = UserPortfolio(fee_rate=Decimal(fee_rate))
+
+        expected = q8(Decimal(notional) * Decimal(fee_rate))
+        assert quote_decimal(portfolio._fee_units(quote_units(Decimal(notional)))) == expected
+
+
+class TestLiquidationPrice:
+    """The tick threshold gives the same answer as comparing with the exact price."""
+
+    @pytest.mark.parametrize("side, leverage", [
+        (PositionSide.LONG, 3), (PositionSide.LONG, 7), (PositionSide.LONG, 25),
+        (PositionSide.SHORT, 3), (PositionSide.SHORT, 7), (PositionSide.SHORT, 25),
+    ])
+    def test_matches_decimal_comparison(self, side, leverage):
+        position = open_btc(side, "0.01", "100000.0", leverage)
+        exact = decimal_liquidation_price(side, Decimal("100000.0"), leverage)
+        assert position.liquidation_price == exact
+
+        threshold = position.spec.round_price(exact)
+        for offset in range(-3, 4):
+            price = threshold + position.spec.tick_size * offset
+            position.update_price(price)
+            if side == PositionSide.LONG:
+                expected = price <= exact
+            else:
+                expected = price >= exact
+            assert position.check_liquidation() == expected, price
+
+    def test_floor_for_longs_ceiling_for_shorts(self):
+        long = open_btc(PositionSide.LONG, "0.01", "100000.0", 3)
+        short = open_btc(PositionSide.SHORT, "0.01", "100000.0", 3)
+
+        # 67166.666... and 132833.333...
+        assert long._liquidation_ticks == 671666
+        assert short._liquidation_ticks == 1328334
+
+
+class TestLiquidation:
+    """Cached aggregates stay equal to the sums over positions after a liquidation."""
+
+    def test_aggregates_after_liquidation(self):
+        portfolio = UserPortfolio(balance=Decimal("10000"), leverage=25)
+        portfolio.open_position("BTC-USDT", OrderSide.BUY, Decimal("0.5"), Decimal("100000.0"))
+        portfolio.open_position("ETH-USDT", OrderSide.BUY, Decimal("1"), Decimal("3000.00"))
+        position = portfolio.get_position("BTC-USDT")
+        balance_before = portfolio.balance
+
+        price = position.spec.round_price(position.liquidation_price) - position.spec.tick_size
+        position_margin = position.margin_used
+        unrealized = (price - Decimal("100000.0")) * Decimal("0.5")
+        liquidated = portfolio.update_prices({"BTC-USDT": price})
+
+        assert liquidated == ["BTC-USDT"]
+        assert not position.is_open
+        assert portfolio.balance == q8(balance_before - abs(position_margin + unrealized))
+
+        positions = portfolio.positions.values()
+        assert portfolio._unrealized == sum(p.unrealized_units for p in positions if p.is_open)
+        assert portfolio._margin == sum(p.margin_units for p in positions if p.is_open)
+        assert portfolio._realized == sum(p.realized_units for p in positions)
+        assert portfolio.total_margin_used == q8(Decimal("1") * Decimal("3000.00") / 25)
+
+
+class TestUnknownSymbol:
+    def test_raises(self):
+        with pytest.raises(ValueError, match="DOGE-USDT"):
+            UserPosition(symbol="DOGE-USDT")
+
+    def test_empty_symbol_raises(self):
+        with pytest.raises(ValueError):
+            UserPosition()
@@ -0,0 +1,44 @@
+"""
+Backtests with precomputed signals against the regular simulation.
+
+Each case runs a bundled test strategy with fast_mode=False as the reference and
+its precompute_signals() subclass from benchmarks.signal_precompute in fast mode;
+their metrics, trades and equity curve must be identical.
+"""
+import importlib
+
+import pytest
+
+pytest.importorskip("jesse.research")
+
+from benchmarks.signal_precompute import (  # noqa: E402
+    CASES,
+    _backtest,
+    _candles,
+    _same,
+    _with_signals,
+)
+
+# ten cycles of the sawtooth, so the price-based signals fire ten times
+MINUTES = 4000
+
+# one case per kind of signal: at an index, on a price, long and short in one run,
+# and a strategy submitting reduce-only orders
+STRATEGIES = ['Test01', 'Test10', 'Test26', 'Test31', 'TestReduceOnlyMarketOrders']
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return _candles(MINUTES)
+
+
+@pytest.mark.parametrize("name", STRATEGIES)
+def test_matches_regular_simulation(name, candles):
+    strategy_class = getattr(importlib.import_module(f'jesse.strategies.{name}'), name)
+
+    expected = _backtest(strategy_class, candles, fast_mode=False)
+    actual = _backtest(_with_signals(strategy_class, CASES[name]), candles)
+
+    assert expected['trades']
+    for key in ('metrics', 'trades', 'equity_curve'):
+        assert _same(expected.get(key), actual.get(key)), key